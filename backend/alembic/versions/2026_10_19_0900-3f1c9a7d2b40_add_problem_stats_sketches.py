@@ -0,0 +1,42 @@
+"""add_problem_stats_sketches
+
+Revision ID: 3f1c9a7d2b40
+Revises: b0a19678ff7a
+Create Date: 2026-10-19 09:00:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b40'
+down_revision: Union[str, None] = 'b0a19678ff7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('problem_stats_sketches',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('problem_id', sa.String(length=36), nullable=False),
+    sa.Column('language', sa.String(length=20), nullable=False),
+    sa.Column('sample_count', sa.Integer(), nullable=False),
+    sa.Column('runtime_sketch', sa.JSON(), nullable=True),
+    sa.Column('memory_sketch', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('problem_id', 'language')
+    )
+    with op.batch_alter_table('problem_stats_sketches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_problem_stats_sketches_problem_id'), ['problem_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('problem_stats_sketches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_problem_stats_sketches_problem_id'))
+
+    op.drop_table('problem_stats_sketches')
@@ -0,0 +1,29 @@
+"""add_analysis_code_fingerprint
+
+Revision ID: 8a4e61c0f5d2
+Revises: 3f1c9a7d2b40
+Create Date: 2026-10-19 09:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4e61c0f5d2'
+down_revision: Union[str, None] = '3f1c9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('ai_analyses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('code_fingerprint', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_ai_analyses_code_fingerprint'), ['code_fingerprint'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('ai_analyses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ai_analyses_code_fingerprint'))
+        batch_op.drop_column('code_fingerprint')
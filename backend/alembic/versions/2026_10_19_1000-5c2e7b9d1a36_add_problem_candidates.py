@@ -0,0 +1,46 @@
+"""add_problem_candidates
+
+Revision ID: 5c2e7b9d1a36
+Revises: 8a4e61c0f5d2
+Create Date: 2026-10-19 10:00:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e7b9d1a36'
+down_revision: Union[str, None] = '8a4e61c0f5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('problem_candidates',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('slug', sa.String(length=200), nullable=False),
+    sa.Column('difficulty', sa.String(length=10), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('reference_solution', sa.Text(), nullable=True),
+    sa.Column('reference_language', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('validation_error', sa.Text(), nullable=True),
+    sa.Column('reference_runtime_ms', sa.Integer(), nullable=True),
+    sa.Column('installed_problem_id', sa.String(length=36), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['installed_problem_id'], ['problems.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('problem_candidates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_problem_candidates_status'), ['status'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('problem_candidates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_problem_candidates_status'))
+
+    op.drop_table('problem_candidates')
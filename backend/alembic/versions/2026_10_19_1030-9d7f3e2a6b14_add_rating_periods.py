@@ -0,0 +1,36 @@
+"""add_rating_periods
+
+Revision ID: 9d7f3e2a6b14
+Revises: 5c2e7b9d1a36
+Create Date: 2026-10-19 10:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d7f3e2a6b14'
+down_revision: Union[str, None] = '5c2e7b9d1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rating_periods',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('context', sa.String(length=20), nullable=False),
+    sa.Column('starts_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ends_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('users_rated', sa.Integer(), nullable=False),
+    sa.Column('games', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('context', 'ends_at', name='uq_rating_period_context_end')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rating_periods')
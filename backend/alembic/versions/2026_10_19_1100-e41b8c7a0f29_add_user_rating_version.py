@@ -0,0 +1,33 @@
+"""add_user_rating_version
+
+Revision ID: e41b8c7a0f29
+Revises: 9d7f3e2a6b14
+Create Date: 2026-10-19 11:00:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b8c7a0f29'
+down_revision: Union[str, None] = '9d7f3e2a6b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_version', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('rating_history', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_rating_history_submission_id'), ['submission_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('rating_history', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_rating_history_submission_id'))
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('rating_version')
@@ -0,0 +1,35 @@
+"""add_problem_ratings
+
+Revision ID: 7b2d5f9e1c83
+Revises: e41b8c7a0f29
+Create Date: 2026-10-19 11:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d5f9e1c83'
+down_revision: Union[str, None] = 'e41b8c7a0f29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('problems', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('rating_rd', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('rating_volatility', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('rating_attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('rating_fitted_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('problems', schema=None) as batch_op:
+        batch_op.drop_column('rating_fitted_at')
+        batch_op.drop_column('rating_attempts')
+        batch_op.drop_column('rating_volatility')
+        batch_op.drop_column('rating_rd')
+        batch_op.drop_column('rating')
@@ -0,0 +1,35 @@
+"""add_season_close_progress
+
+Revision ID: c6a1e8d4f357
+Revises: 7b2d5f9e1c83
+Create Date: 2026-10-19 12:00:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a1e8d4f357'
+down_revision: Union[str, None] = '7b2d5f9e1c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('seasons', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('close_phase', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('close_cursor', sa.String(length=36), nullable=True))
+
+    with op.batch_alter_table('season_participants', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_season_participant', ['season_id', 'user_id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('season_participants', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_season_participant', type_='unique')
+
+    with op.batch_alter_table('seasons', schema=None) as batch_op:
+        batch_op.drop_column('close_cursor')
+        batch_op.drop_column('close_phase')
@@ -0,0 +1,37 @@
+"""add_rating_epochs
+
+Revision ID: a83f0c5e2d61
+Revises: c6a1e8d4f357
+Create Date: 2026-10-19 12:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a83f0c5e2d61'
+down_revision: Union[str, None] = 'c6a1e8d4f357'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('seasons', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reset_epoch', sa.Integer(), nullable=True))
+        batch_op.create_unique_constraint('uq_seasons_reset_epoch', ['reset_epoch'])
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_epoch', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_users_rating_epoch'), ['rating_epoch'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_rating_epoch'))
+        batch_op.drop_column('rating_epoch')
+
+    with op.batch_alter_table('seasons', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_seasons_reset_epoch', type_='unique')
+        batch_op.drop_column('reset_epoch')
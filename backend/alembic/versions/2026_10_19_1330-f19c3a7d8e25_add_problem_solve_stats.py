@@ -0,0 +1,51 @@
+"""add_problem_solve_stats
+
+Revision ID: f19c3a7d8e25
+Revises: d52b9e7f4a18
+Create Date: 2026-10-19 13:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19c3a7d8e25'
+down_revision: Union[str, None] = 'd52b9e7f4a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('problem_solve_stats',
+    sa.Column('problem_id', sa.String(length=36), nullable=False),
+    sa.Column('accepted_count', sa.Integer(), nullable=False),
+    sa.Column('first_solver_id', sa.String(length=36), nullable=True),
+    sa.Column('first_submission_id', sa.String(length=36), nullable=True),
+    sa.Column('first_solved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['first_solver_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['problem_id'], ['problems.id'], ),
+    sa.PrimaryKeyConstraint('problem_id')
+    )
+
+    # Seed from existing solves: the earliest accepted submission is the first solve
+    op.execute("""
+        INSERT INTO problem_solve_stats (problem_id, accepted_count, first_solver_id, first_submission_id, first_solved_at)
+        SELECT s.problem_id,
+               COUNT(*),
+               (SELECT f.user_id FROM submissions f WHERE f.problem_id = s.problem_id AND f.verdict = 'accepted'
+                ORDER BY f.created_at, f.id LIMIT 1),
+               (SELECT f.id FROM submissions f WHERE f.problem_id = s.problem_id AND f.verdict = 'accepted'
+                ORDER BY f.created_at, f.id LIMIT 1),
+               MIN(s.created_at)
+        FROM submissions s
+        WHERE s.verdict = 'accepted'
+        GROUP BY s.problem_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('problem_solve_stats')
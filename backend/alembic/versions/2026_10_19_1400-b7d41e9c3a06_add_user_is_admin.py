@@ -0,0 +1,25 @@
+"""add_user_is_admin
+
+Revision ID: b7d41e9c3a06
+Revises: f19c3a7d8e25
+Create Date: 2026-10-19 14:00:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d41e9c3a06'
+down_revision: Union[str, None] = 'f19c3a7d8e25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('is_admin', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'is_admin')
@@ -0,0 +1,26 @@
+"""index_ai_analysis_quality_score
+
+Revision ID: e83a5f2c7b19
+Revises: b7d41e9c3a06
+Create Date: 2026-10-19 14:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83a5f2c7b19'
+down_revision: Union[str, None] = 'b7d41e9c3a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('ai_analyses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ai_analyses_quality_score'), ['quality_score'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('ai_analyses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ai_analyses_quality_score'))
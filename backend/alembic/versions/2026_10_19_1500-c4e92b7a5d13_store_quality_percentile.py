@@ -0,0 +1,54 @@
+"""store_quality_percentile
+
+Revision ID: c4e92b7a5d13
+Revises: e83a5f2c7b19
+Create Date: 2026-10-19 15:00:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e92b7a5d13'
+down_revision: Union[str, None] = 'e83a5f2c7b19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('quality_score_counts',
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('score')
+    )
+    with op.batch_alter_table('ai_analyses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quality_percentile', sa.Float(), nullable=True))
+
+    # Seed the histogram and rank existing analyses against all of it
+    op.execute("""
+        INSERT INTO quality_score_counts (score, count)
+        SELECT quality_score, COUNT(*)
+        FROM ai_analyses
+        WHERE quality_score IS NOT NULL
+        GROUP BY quality_score
+    """)
+    op.execute("""
+        UPDATE ai_analyses
+        SET quality_percentile = (
+            SELECT COALESCE(SUM(c.count), 0) FROM quality_score_counts c WHERE c.score < ai_analyses.quality_score
+        ) * 100.0 / (SELECT SUM(c.count) FROM quality_score_counts c)
+        WHERE quality_score IS NOT NULL
+    """)
+
+    # Percentiles no longer count over quality_score
+    with op.batch_alter_table('ai_analyses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ai_analyses_quality_score'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('ai_analyses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ai_analyses_quality_score'), ['quality_score'], unique=False)
+        batch_op.drop_column('quality_percentile')
+    op.drop_table('quality_score_counts')
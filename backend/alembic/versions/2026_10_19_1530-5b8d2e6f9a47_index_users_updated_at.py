@@ -0,0 +1,26 @@
+"""index_users_updated_at
+
+Revision ID: 5b8d2e6f9a47
+Revises: c4e92b7a5d13
+Create Date: 2026-10-19 15:30:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8d2e6f9a47'
+down_revision: Union[str, None] = 'c4e92b7a5d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_updated_at')
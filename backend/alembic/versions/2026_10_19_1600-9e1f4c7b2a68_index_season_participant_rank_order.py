@@ -0,0 +1,28 @@
+"""index_season_participant_rank_order
+
+Revision ID: 9e1f4c7b2a68
+Revises: 5b8d2e6f9a47
+Create Date: 2026-10-19 16:00:00.000000+00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1f4c7b2a68'
+down_revision: Union[str, None] = '5b8d2e6f9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('season_participants', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_season_participants_rank_order', ['season_id', 'final_rating', 'id'], unique=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('season_participants', schema=None) as batch_op:
+        batch_op.drop_index('ix_season_participants_rank_order')
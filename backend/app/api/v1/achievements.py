@@ -2,21 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
-import yaml
-import os
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.models.user import User
 from app.models.achievement import UserAchievement
+from app.engines.achievement_rules import RuleIndex, achievement_rules
 from app.schemas.achievement import AchievementResponse, AchievementCatalogItem
 
 router = APIRouter(prefix="/achievements", tags=["Achievements"])
 
-def load_definitions():
-    path = os.path.join(os.path.dirname(__file__), "..", "..", "engines", "achievement_definitions.yaml")
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+def load_definitions() -> RuleIndex:
+    """Compiled achievement rules, shared with the engine and cached per process."""
+    return achievement_rules.get()
 
 @router.get("/me", response_model=List[AchievementResponse])
 async def list_my_achievements(
@@ -47,12 +45,12 @@ async def get_achievement_catalog(
     earned = {a.achievement_type: a for a in result.scalars().all()}
     
     catalog = []
-    for item in definitions.get("achievements", []):
-        earned_info = earned.get(item["id"])
+    for item in definitions.rules:
+        earned_info = earned.get(item.id)
         catalog.append(AchievementCatalogItem(
-            id=item["id"],
-            name=item["name"],
-            description=item["description"],
+            id=item.id,
+            name=item.name,
+            description=item.description,
             earned=earned_info is not None,
             earned_at=earned_info.created_at if earned_info else None,
             nft_status="minted" if earned_info and earned_info.nft_token_id else ("pending" if earned_info and earned_info.nft_tx_hash else "none")
@@ -1,13 +1,136 @@
 from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
+from datetime import datetime
+from typing import Optional
+
+from app.core.database import get_db, async_session_maker
 from app.services.problem_generator import ProblemGenerator
+from app.services.problem_buffer import ProblemBufferService
+from app.services.export_service import ExportService, EXPORT_FORMATS, EXPORT_TABLES
+from app.services.analysis_queue import analysis_queue
+from app.engines.runtime_distribution import runtime_distributions
+from app.engines.problem_similarity import problem_index
+from app.core.task_supervisor import task_supervisor
+from app.core.circuit_breaker import CircuitOpenError
 from app.schemas.problem import ProblemResponse
-from app.core.deps import get_current_user
+from app.core.deps import get_current_admin
 from app.models.user import User
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.post("/problems/generate", response_model=ProblemResponse)
-# ... line 12-25 unchanged ...
+async def generate_problem(
+    topic: Optional[str] = None,
+    difficulty: str = "easy",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Generate a new problem with the AI problem setter.
+    """
+    generator = ProblemGenerator(db)
+    try:
+        return await generator.generate_daily_problem(topic=topic, difficulty=difficulty)
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Problem generation failed: {e}"
+        )
+
+@router.get("/problem-buffer")
+async def get_problem_buffer(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Count of buffered daily problem candidates by status.
+    """
+    return await ProblemBufferService(db).counts()
+
+@router.post("/problem-buffer/refill")
+async def refill_problem_buffer(
+    target: Optional[int] = None,
+    difficulty: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Generate and validate candidates until the daily problem buffer is full.
+    """
+    service = ProblemBufferService(db)
+    validated = await service.refill(target=target, difficulty=difficulty)
+    return {"validated": validated, **await service.counts()}
+
+@router.post("/problems/{problem_id}/runtime-distribution/rebuild")
+async def rebuild_runtime_distribution(
+    problem_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Reload a problem's cached runtime distribution from accepted submissions.
+    """
+    count = await runtime_distributions.rebuild(db, problem_id)
+    return {"problem_id": problem_id, "runtimes": count}
+
+@router.post("/problem-index/rebuild")
+async def rebuild_problem_index(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Rebuild the near-duplicate problem index from the problems table.
+    """
+    count = await problem_index.rebuild(db)
+    return {"problems": count}
+
+@router.get("/analysis-queue")
+async def get_analysis_queue_stats(current_user: User = Depends(get_current_admin)):
+    """
+    Queue depth, in-flight count and wait times of the AI analysis queue.
+    """
+    return analysis_queue.stats()
+
+@router.get("/tasks")
+async def get_background_task_stats(current_user: User = Depends(get_current_admin)):
+    """
+    Per-category counts, durations and recent failures of supervised background tasks.
+    """
+    return task_supervisor.stats()
+
+@router.get("/export/{table}")
+async def export_table(
+    table: str,
+    format: str = "ndjson",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    problem_id: Optional[str] = None,
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Stream a raw table export (submissions, rating_history, ai_analyses) as NDJSON or CSV.
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown export table '{table}'")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'")
+
+    async def body():
+        # The request-scoped session is closed before the response streams,
+        # so the export owns its own session for the lifetime of the cursor.
+        async with async_session_maker() as export_db:
+            service = ExportService(export_db)
+            async for chunk in service.stream(table, format, since, until, problem_id):
+                yield chunk
 
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List
+
+from app.core.database import get_db
+from app.core.deps import get_current_user
+from app.engines.leaderboard import LeaderboardEntry, leaderboard
+from app.engines.league_engine import TIERS_ORDER
+from app.models.user import User
+from app.schemas.leaderboard import LeaderboardEntryResponse, LeaderboardPage, LeaderboardPosition
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+
+async def _with_profiles(db: AsyncSession, entries: List[LeaderboardEntry]) -> List[LeaderboardEntryResponse]:
+    """Attach usernames and tiers to one page of entries (a primary-key lookup)."""
+    if not entries:
+        return []
+    result = await db.execute(
+        select(User.id, User.username, User.league_tier).where(User.id.in_([e.user_id for e in entries]))
+    )
+    profiles = {row.id: row for row in result.all()}
+    return [
+        LeaderboardEntryResponse(
+            rank=e.rank,
+            user_id=e.user_id,
+            username=profiles[e.user_id].username,
+            rating=e.rating,
+            league_tier=profiles[e.user_id].league_tier,
+        )
+        for e in entries
+        if e.user_id in profiles
+    ]
+
+@router.get("", response_model=LeaderboardPage)
+async def get_leaderboard(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """Global classical-rating leaderboard, best first."""
+    entries = await leaderboard.top(db, limit, offset)
+    return LeaderboardPage(total=await leaderboard.size(db), entries=await _with_profiles(db, entries))
+
+@router.get("/me", response_model=LeaderboardPosition)
+async def get_my_position(
+    radius: int = Query(5, ge=0, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The current user's global rank and the players just above and below."""
+    entry = await leaderboard.rank(db, current_user.id)
+    neighbours = await leaderboard.around(db, current_user.id, radius) if entry else []
+    return LeaderboardPosition(
+        rank=entry.rank if entry else None,
+        total=await leaderboard.size(db),
+        neighbours=await _with_profiles(db, neighbours),
+    )
+
+@router.get("/tiers/{tier}", response_model=LeaderboardPage)
+async def get_tier_leaderboard(
+    tier: str,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    """One league tier's slice of the leaderboard; ranks are global."""
+    if tier not in TIERS_ORDER:
+        raise HTTPException(status_code=404, detail=f"Unknown tier '{tier}'")
+    total, entries = await leaderboard.tier(db, tier, limit, offset)
+    return LeaderboardPage(total=total, entries=await _with_profiles(db, entries))
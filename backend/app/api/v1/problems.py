@@ -3,8 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from app.core.database import get_db
-from app.schemas.problem import ProblemResponse, ProblemListResponse, ProblemCreate
+from app.schemas.problem import ProblemResponse, ProblemListResponse, ProblemCreate, ProblemStatsResponse
 from app.services.problem_service import ProblemService
+from app.services.problem_stats_service import ProblemStatsService
 from app.core.deps import get_current_user
 from app.models.user import User
 
@@ -39,6 +40,14 @@ async def get_problem(slug: str, db: AsyncSession = Depends(get_db)):
     service = ProblemService(db)
     return await service.get_problem_by_slug(slug)
 
+@router.get("/{slug}/stats", response_model=ProblemStatsResponse)
+async def get_problem_stats(slug: str, db: AsyncSession = Depends(get_db)):
+    """
+    Get p50/p90/p99 runtime and memory of accepted solutions, overall and per language.
+    """
+    problem = await ProblemService(db).get_problem_by_slug(slug)
+    return await ProblemStatsService(db).get_stats(problem)
+
 @router.post("", response_model=ProblemResponse, status_code=status.HTTP_201_CREATED)
 async def create_problem(
     data: ProblemCreate,
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import submissions, problems, admin, users, seasons, achievements, websocket
+from app.api.v1 import submissions, problems, admin, users, seasons, achievements, websocket, leaderboard
 
 router = APIRouter()
 
@@ -10,4 +10,5 @@ router.include_router(users.router)
 router.include_router(seasons.router)
 router.include_router(achievements.router)
 router.include_router(websocket.router)
+router.include_router(leaderboard.router)
 
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import List, Optional
+import numpy as np
 
 from app.core.database import get_db
 from app.core.deps import get_current_user, CurrentUser, DbSession
 from app.models.user import User
 from app.models.rating_history import RatingHistory
+from app.engines.downsample import lttb_indices
 from app.schemas.rating import RatingHistoryResponse
 from app.schemas.user import UserResponse, WalletLinkRequest
 from app.services.auth_service import AuthService
@@ -15,16 +18,38 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me/ratings", response_model=List[RatingHistoryResponse])
 async def get_my_rating_history(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    points: int = Query(500, ge=3, le=5000, description="Maximum points returned; longer histories are downsampled"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get the rating history for the current authenticated user.
+    Get the rating history for the current authenticated user, newest first.
+
+    Histories longer than `points` are downsampled with LTTB over
+    (created_at, new_rating), which keeps the chart's peaks and dips.
+    Only (id, time, rating) is read for the full range; full rows are
+    fetched just for the points kept.
     """
+    query = select(RatingHistory.id, RatingHistory.created_at, RatingHistory.new_rating).where(
+        RatingHistory.user_id == current_user.id
+    )
+    if since:
+        query = query.where(RatingHistory.created_at >= since)
+    if until:
+        query = query.where(RatingHistory.created_at < until)
+    series = (await db.execute(query.order_by(RatingHistory.created_at, RatingHistory.id))).all()
+
+    keep = lttb_indices(
+        np.array([row.created_at.timestamp() for row in series]),
+        np.array([row.new_rating for row in series]),
+        points,
+    )
     result = await db.execute(
         select(RatingHistory)
-        .where(RatingHistory.user_id == current_user.id)
-        .order_by(RatingHistory.created_at.desc())
+        .where(RatingHistory.id.in_([series[i].id for i in keep]))
+        .order_by(RatingHistory.created_at.desc(), RatingHistory.id.desc())
     )
     return result.scalars().all()
 
@@ -27,4 +27,20 @@ celery_app.conf.beat_schedule = {
         "task": "app.engines.problem_tasks.generate_daily_problem_task",
         "schedule": crontab(hour=0, minute=0), # Midnight IST every day
     },
+    "refill-problem-buffer": {
+        "task": "app.engines.problem_tasks.refill_problem_buffer_task",
+        "schedule": crontab(hour="*/6", minute=30), # Well clear of the midnight rollover
+    },
+    "close-rating-periods": {
+        "task": "app.engines.rating_tasks.close_rating_periods_task",
+        "schedule": crontab(minute=5), # Hourly; closes whatever hourly/daily periods are due
+    },
+    "fit-problem-ratings": {
+        "task": "app.engines.problem_tasks.fit_problem_ratings_task",
+        "schedule": crontab(hour=3, minute=15), # Daily, off-peak
+    },
+    "sweep-season-resets": {
+        "task": "app.engines.rating_tasks.sweep_season_resets_task",
+        "schedule": crontab(hour=4, minute=0), # Daily; resets are applied lazily anyway
+    },
 }
@@ -0,0 +1,112 @@
+"""
+KamiCode — Circuit Breaker
+
+Tracks the outcome of recent calls to an external dependency. A call that
+fails or is slower than `slow_call_seconds` counts as bad; once the bad
+share of the rolling window reaches `failure_rate`, the breaker opens and
+callers fail fast for `open_seconds`. After that one half-open probe is
+let through at a time: a good probe closes the breaker, a bad one reopens it.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        slow_call_seconds: float = 10.0,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = bad call
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+
+        # Metrics
+        self.times_opened = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_started = None
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; counts a rejection when it may not."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN:
+            now = time.monotonic()
+            # A probe abandoned by its caller (e.g. cancelled) must not wedge the breaker
+            if self._probe_started is None or now - self._probe_started >= self.open_seconds:
+                self._probe_started = now
+                return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, latency: float):
+        if latency >= self.slow_call_seconds:
+            self.record_failure(f"slow call ({latency:.1f}s)")
+            return
+        if self._state == HALF_OPEN:
+            print(f"✅ Circuit '{self.name}' closed after a successful probe")
+            self._reset(CLOSED)
+            return
+        self._outcomes.append(False)
+
+    def record_failure(self, error: str = None):
+        self.last_error = error
+        if self._state == HALF_OPEN:
+            self._open()
+            return
+        self._outcomes.append(True)
+        if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+            if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def snapshot(self) -> dict:
+        state = self.state
+        calls = len(self._outcomes)
+        return {
+            "state": state,
+            "failure_rate": (sum(self._outcomes) / calls) if calls else 0.0,
+            "window_calls": calls,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in_s": max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)) if state == OPEN else 0.0,
+            "last_error": self.last_error,
+        }
+
+    def _open(self):
+        print(f"⚠️ Circuit '{self.name}' opened ({self.last_error}); failing fast for {self.open_seconds:.0f}s")
+        self._reset(OPEN)
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def _reset(self, state: str):
+        self._state = state
+        self._outcomes.clear()
+        self._probe_started = None
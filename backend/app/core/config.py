@@ -48,6 +48,47 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: Optional[str] = None
     GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta/openai/"
     AI_MODEL: str = "gemini-2.5-flash"
+    AI_HTTP2: bool = True  # Used only when the optional `h2` package is installed
+    AI_HTTP_MAX_CONNECTIONS: int = 20
+    AI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    AI_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    AI_REQUESTS_PER_MINUTE: float = 60.0  # Provider RPM budget; 0 disables pacing
+    AI_MAX_RETRIES: int = 3  # Retries on 429/5xx with exponential backoff
+    AI_RETRY_BASE_DELAY: float = 1.0
+    AI_RETRY_MAX_DELAY: float = 30.0
+    AI_BREAKER_FAILURE_RATE: float = 0.5  # Share of bad calls in the window that opens the breaker
+    AI_BREAKER_WINDOW: int = 20
+    AI_BREAKER_MIN_CALLS: int = 5
+    AI_BREAKER_SLOW_CALL_SECONDS: float = 15.0  # Slower successful calls count as bad
+    AI_BREAKER_OPEN_SECONDS: float = 30.0  # Fail fast this long before a half-open probe
+    AI_DEFAULT_DEADLINE: float = 60.0  # Budget of HTTP time per call, retries included, pacing waits not; 0 disables
+    AI_ANALYSIS_DEADLINE: float = 20.0
+    AI_ANALYSIS_CONCURRENCY: int = 4
+    AI_ANALYSIS_QUEUE_SIZE: int = 1000
+    AI_STREAM_ANALYSIS: bool = True  # Stream analyses over SSE and push fields to the submitter's websocket
+    AI_LOCAL_CONFIDENCE_THRESHOLD: float = 0.9  # At this confidence the LLM only reviews quality, not complexity
+    RUNTIME_DISTRIBUTION_TTL: float = 300.0  # Seconds a cached runtime distribution serves percentiles before a reload; 0 never expires
+
+    # ─── Daily Problem Buffer ──────────────────────────────────────
+    PROBLEM_BUFFER_SIZE: int = 7  # Validated daily problems kept ready ahead of rollover
+    PROBLEM_BUFFER_DIFFICULTY: str = "medium"
+    PROBLEM_BUFFER_CONCURRENCY: int = 3  # Candidates generated at once
+    PROBLEM_VALIDATION_CONCURRENCY: int = 8  # Sandbox runs at once while validating
+    PROBLEM_VALIDATION_TIMEOUT: float = 5.0  # Per test case, for the reference solution
+    PROBLEM_DUPLICATE_THRESHOLD: float = 0.6  # Estimated Jaccard similarity that counts as a duplicate
+    PROBLEM_DUPLICATE_RETRIES: int = 2  # Regenerations when the model repeats an existing problem
+    PROBLEM_INDEX_PATH: Optional[str] = None  # JSON file sharing the MinHash/LSH index between processes; None keeps it in memory
+
+    # ─── Ratings ───────────────────────────────────────────────────
+    RATING_PERIOD: str = "submission"  # "submission" rates each submission live; "hourly"/"daily" batch into Glicko-2 periods
+    RATING_CAS_RETRIES: int = 10  # Attempts per live update before giving up on a contended user
+    SEASON_CLOSE_CHUNK_SIZE: int = 10000  # Users per committed chunk when a season closes
+    LEADERBOARD_BACKEND: str = "local"  # "local" (per process) or "redis" (sorted set shared by workers)
+    LEADERBOARD_LOCAL_REFRESH: float = 30.0  # Seconds between a local board's checks for other processes' rating writes; 0 never checks
+    PROBLEM_RATING_MIN_ATTEMPTS: int = 20  # Attempts before a problem's fitted rating replaces its difficulty prior
+
+    # ─── Streaks ───────────────────────────────────────────────────
+    STREAK_TIMEZONE: str = "Asia/Kolkata"  # Day boundary for daily streaks; matches the midnight IST daily rollover
 
     # ─── Blockchain ────────────────────────────────────────────────
     CHAIN_RPC_URL: str = "https://sepolia.base.org"
@@ -65,6 +106,12 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
 
+    # ─── Background Tasks ──────────────────────────────────────────
+    TASK_CONCURRENCY: str = "broadcast=32,achievements=8,rating=4,minting=2,analysis=4"  # Per-category limits
+    TASK_DEFAULT_CONCURRENCY: int = 16
+    TASK_DRAIN_TIMEOUT: float = 10.0  # Seconds shutdown waits for running tasks
+    TASK_JOURNAL_PATH: Optional[str] = None  # JSON-lines file; unfinished tasks replay on startup
+
     @property
     def cors_origins_list(self) -> list[str]:
         """Parse comma-separated CORS origins into a list."""
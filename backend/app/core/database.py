@@ -4,6 +4,11 @@ KamiCode — Database Connection
 Async SQLAlchemy engine and session factory with SQLite support.
 """
 
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -55,3 +60,39 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+# ─── Upsert ───────────────────────────────────────────────────────
+_DIALECT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+async def upsert(
+    db: AsyncSession,
+    model,
+    values: Dict[str, Any],
+    conflict: Iterable[str],
+    update: Optional[Dict[str, Any]] = None,
+    where=None,
+    returning: Iterable = (),
+):
+    """
+    INSERT ... ON CONFLICT (`conflict`) DO UPDATE SET `update` [WHERE `where`]
+    in one atomic statement (DO NOTHING without `update`). In `update`,
+    columns of `model` refer to the existing row.
+
+    Concurrent writers never see an IntegrityError, so the caller's session
+    is never rolled back and its loaded objects stay usable.
+    """
+    statement = _DIALECT_INSERTS[db.get_bind().dialect.name](model).values(**values)
+    if update:
+        update = dict(update)
+        if "updated_at" in model.__table__.c and "updated_at" not in update:
+            # Python-side onupdate defaults do not run for ON CONFLICT DO UPDATE
+            update["updated_at"] = func.now()
+        statement = statement.on_conflict_do_update(index_elements=list(conflict), set_=update, where=where)
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=list(conflict))
+    returning = list(returning)
+    if returning:
+        statement = statement.returning(*returning)
+    return await db.execute(statement)
@@ -16,6 +16,7 @@ from app.core.database import get_db
 from app.core.security import decode_access_token
 from app.models.user import User
 from app.core.config import get_settings
+from app.engines.rating_epoch import current_epoch_query, settle_rating
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
@@ -39,10 +40,11 @@ async def get_current_user(
 
     # Dev environment auto-login fallback
     if not token and settings.ENVIRONMENT in ["dev", "local"]:
-        result = await db.execute(select(User).where(User.username == "devuser"))
-        user = result.scalar_one_or_none()
-        if user:
-            return user
+        result = await db.execute(select(User, current_epoch_query()).where(User.username == "devuser"))
+        row = result.one_or_none()
+        if row:
+            await settle_rating(db, *row)
+            return row[0]
 
     if not token:
         raise credentials_exception
@@ -56,8 +58,10 @@ async def get_current_user(
         raise credentials_exception
 
     # Supabase manages auth.users, but we need a corresponding row in public.users
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # The current season epoch rides along, so a pending soft reset is settled without another query
+    result = await db.execute(select(User, current_epoch_query()).where(User.id == user_id))
+    row = result.one_or_none()
+    user, epoch = row if row else (None, None)
 
     if user is None:
         # First time login/signup -> copy identity into public.users
@@ -85,9 +89,11 @@ async def get_current_user(
             blitz_rating=1200,
             league_tier="bronze",
             is_active=True,
+            rating_epoch=(await db.execute(select(current_epoch_query()))).scalar_one(),
         )
         db.add(user)
         await db.flush()
+        epoch = user.rating_epoch
 
     if not user.is_active:
         raise HTTPException(
@@ -95,9 +101,31 @@ async def get_current_user(
             detail="User account is deactivated",
         )
 
+    await settle_rating(db, user, epoch)
     return user
 
 
+async def get_current_admin(
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> User:
+    """
+    Require the current user to be an administrator.
+
+    The dev auto-login user gets no special treatment: it is an admin only
+    if its row says so.
+
+    Raises:
+        HTTPException 403: If the user is not an admin.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+        )
+    return current_user
+
+
 # Type alias for convenience in route signatures
 CurrentUser = Annotated[User, Depends(get_current_user)]
+AdminUser = Annotated[User, Depends(get_current_admin)]
 DbSession = Annotated[AsyncSession, Depends(get_db)]
@@ -0,0 +1,43 @@
+"""
+KamiCode — Rate Limiting
+
+Async token bucket used to pace outbound calls against a provider's
+requests-per-minute budget.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Refills `rate` tokens per second up to `capacity`; each acquire() takes one.
+    A non-positive rate disables pacing.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float) -> "TokenBucket":
+        # Allow a burst of up to one second's worth of requests (at least one)
+        rate = requests_per_minute / 60.0
+        return cls(rate=rate, capacity=max(1.0, rate))
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
@@ -0,0 +1,248 @@
+"""
+KamiCode — Task Supervisor
+
+In-process supervisor for fire-and-forget background work (websocket
+broadcasts, eager Celery tasks, achievement/rating updates). Every task
+is strongly referenced until it finishes, runs under a per-category
+concurrency limit, and has its duration and any exception recorded.
+Shutdown drains running work within a timeout.
+
+Work submitted by `kind` (with a registered handler and a JSON payload)
+can be journaled to TASK_JOURNAL_PATH; entries that never finished are
+replayed on the next startup.
+"""
+
+import asyncio
+import json
+import os
+import time
+import traceback
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+TaskHandler = Callable[[dict], Awaitable[None]]
+
+# How many recent failures are kept per category for inspection
+_RECENT_ERRORS = 20
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """Parse "broadcast=32,rating=4" into {"broadcast": 32, "rating": 4}."""
+    limits = {}
+    for part in spec.split(","):
+        if "=" in part:
+            name, value = part.split("=", 1)
+            limits[name.strip()] = int(value)
+    return limits
+
+
+class _CategoryStats:
+    def __init__(self):
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.errors: Deque[dict] = deque(maxlen=_RECENT_ERRORS)
+
+    def as_dict(self, limit: int) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "limit": limit,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "avg_duration_ms": (self.duration_total / finished * 1000) if finished else 0.0,
+            "max_duration_ms": self.duration_max * 1000,
+            "recent_errors": list(self.errors),
+        }
+
+
+class TaskSupervisor:
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = None,
+        journal_path: Optional[str] = None,
+    ):
+        self.limits = limits if limits is not None else parse_limits(settings.TASK_CONCURRENCY)
+        self.default_limit = default_limit or settings.TASK_DEFAULT_CONCURRENCY
+        self.journal_path = journal_path
+        self._handlers: Dict[str, Tuple[TaskHandler, str]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._stats: Dict[str, _CategoryStats] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def register(self, kind: str, handler: TaskHandler, category: str = None):
+        """Register a replayable handler; `category` defaults to the kind."""
+        self._handlers[kind] = (handler, category or kind)
+
+    def spawn(self, category: str, coro: Awaitable, name: str = None) -> asyncio.Task:
+        """Run a coroutine in the background under the category's concurrency limit."""
+        return self._schedule(category, coro, name or category, None)
+
+    def submit(self, kind: str, payload: dict) -> asyncio.Task:
+        """
+        Run a registered handler with a JSON-serializable payload. With a
+        journal configured, the work survives a restart until it finishes.
+        """
+        handler, category = self._handlers[kind]
+        entry_id = self._journal({"op": "add", "id": uuid.uuid4().hex, "kind": kind, "payload": payload})
+        return self._schedule(category, handler(payload), kind, entry_id)
+
+    def persist(self, kind: str, payload: dict):
+        """Journal work without running it now (e.g. work still queued at shutdown)."""
+        if self._journal({"op": "add", "id": uuid.uuid4().hex, "kind": kind, "payload": payload}) is None:
+            print(f"⚠️ No task journal configured, dropping pending {kind} work")
+
+    async def replay(self) -> int:
+        """Resubmit journaled work that never finished. Returns how many entries were replayed."""
+        pending = self._read_journal()
+        if self.journal_path and os.path.exists(self.journal_path):
+            open(self.journal_path, "w").close()
+        replayed = 0
+        for entry in pending:
+            if entry["kind"] not in self._handlers:
+                print(f"⚠️ No handler for journaled task kind '{entry['kind']}', skipping")
+                continue
+            self.submit(entry["kind"], entry["payload"])
+            replayed += 1
+        if replayed:
+            print(f"🔁 Replayed {replayed} background task(s) from the journal")
+        return replayed
+
+    async def drain(self, timeout: float = None) -> int:
+        """
+        Wait up to `timeout` seconds for running work, then cancel the rest.
+        Returns how many tasks had to be cancelled.
+        """
+        timeout = settings.TASK_DRAIN_TIMEOUT if timeout is None else timeout
+        # Tasks may spawn follow-up work while draining, so wait until the set is empty
+        deadline = time.monotonic() + timeout
+        while self._tasks:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.wait(set(self._tasks), timeout=remaining)
+
+        leftover = list(self._tasks)
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            print(f"⚠️ Cancelled {len(leftover)} background task(s) still running at shutdown")
+            await asyncio.gather(*leftover, return_exceptions=True)
+        return len(leftover)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._tasks),
+            "journal": self.journal_path,
+            "categories": {
+                category: stats.as_dict(self._limit(category))
+                for category, stats in sorted(self._stats.items())
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _limit(self, category: str) -> int:
+        return self.limits.get(category, self.default_limit)
+
+    def _semaphore(self, category: str) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; tests and workers may run several in turn
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphores = {}
+        if category not in self._semaphores:
+            self._semaphores[category] = asyncio.Semaphore(self._limit(category))
+        return self._semaphores[category]
+
+    def _schedule(self, category: str, coro: Awaitable, name: str, entry_id: Optional[str]) -> asyncio.Task:
+        stats = self._stats.setdefault(category, _CategoryStats())
+        stats.waiting += 1
+        task = asyncio.create_task(self._run(category, coro, name, entry_id, stats), name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, category: str, coro: Awaitable, name: str, entry_id: Optional[str], stats: _CategoryStats):
+        started = None
+        try:
+            async with self._semaphore(category):
+                stats.waiting -= 1
+                stats.running += 1
+                started = time.monotonic()
+                try:
+                    await coro
+                    stats.completed += 1
+                except asyncio.CancelledError:
+                    stats.cancelled += 1
+                    raise
+                except Exception as e:
+                    stats.failed += 1
+                    stats.errors.append({
+                        "task": name,
+                        "error": repr(e),
+                        "at": datetime.now(timezone.utc).isoformat(),
+                    })
+                    print(f"⚠️ Background task {name} failed: {e}")
+                    traceback.print_exc()
+                finally:
+                    stats.running -= 1
+                    duration = time.monotonic() - started
+                    stats.duration_total += duration
+                    stats.duration_max = max(stats.duration_max, duration)
+            # Failed work is not retried forever; only cancelled work stays journaled
+            if entry_id:
+                self._journal({"op": "done", "id": entry_id})
+        finally:
+            if started is None:
+                # Cancelled while waiting for a slot
+                stats.waiting -= 1
+                stats.cancelled += 1
+                if asyncio.iscoroutine(coro):
+                    coro.close()
+
+    def _journal(self, entry: dict) -> Optional[str]:
+        if not self.journal_path:
+            return None
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        return entry["id"]
+
+    def _read_journal(self) -> list:
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return []
+        pending: Dict[str, dict] = {}
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn write from a crash
+                if entry.get("op") == "add":
+                    pending[entry["id"]] = entry
+                elif entry.get("op") == "done":
+                    pending.pop(entry.get("id"), None)
+        return list(pending.values())
+
+
+task_supervisor = TaskSupervisor(journal_path=settings.TASK_JOURNAL_PATH)
@@ -1,17 +1,26 @@
-from typing import List
+from typing import Dict, List, Optional
 from fastapi import WebSocket
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        # Authenticated sockets by user id, for per-user messages
+        self.user_connections: Dict[str, List[WebSocket]] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, user_id: Optional[str] = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        if user_id:
+            self.user_connections.setdefault(user_id, []).append(websocket)
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        for user_id, sockets in list(self.user_connections.items()):
+            if websocket in sockets:
+                sockets.remove(websocket)
+                if not sockets:
+                    del self.user_connections[user_id]
 
     async def broadcast(self, message: dict):
         for connection in self.active_connections:
@@ -21,4 +30,11 @@ class ConnectionManager:
                 # Handle potentially closed connections
                 pass
 
+    async def send_to_user(self, user_id: str, message: dict):
+        for connection in list(self.user_connections.get(user_id, [])):
+            try:
+                await connection.send_json(message)
+            except Exception:
+                pass
+
 manager = ConnectionManager()
@@ -2,118 +2,267 @@
 KamiCode — Achievement Engine
 
 Evaluates events and awards achievements based on defined rules.
+
+Events about one user carry a `user_id` and are evaluated rule by rule.
+Bulk events (season.ended) carry a `season_id` and `user_ranges`, a list
+of [lower, upper] bounds on participant user ids (exclusive lower,
+inclusive upper, None for open); each matching rule is then evaluated
+for all of those users with one INSERT ... SELECT.
 """
 
-import yaml
-import os
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, or_, exists, insert, literal, true
 from datetime import datetime, timedelta
 
 from app.models.achievement import UserAchievement
+from app.models.base import sql_uuid
+from app.models.season import SeasonParticipant
+from app.models.problem_stats import ProblemSolveStats
+from app.models.user_streak import UserStreak
 from app.models.submission import Submission
 from app.models.user import User
-from app.models.rush import RushSession
 from app.models.problem import Problem
 from app.models.ai_analysis import AIAnalysis
+from app.engines.achievement_rules import AchievementRule, achievement_rules
+
+@dataclass
+class EventSnapshot:
+    """What the rules of one event are evaluated against, prefetched in one query."""
+    tier: str
+    earned: Set[str]
+    quality_percentile: Optional[float] = None  # Of the analysis' quality score, not its runtime
+    first_solver_id: Optional[str] = None
+    current_streak: Optional[int] = None
+
 
 class AchievementEngine:
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.definitions = self._load_definitions()
-
-    def _load_definitions(self) -> Dict[str, Any]:
-        path = os.path.join(os.path.dirname(__file__), "achievement_definitions.yaml")
-        with open(path, "r") as f:
-            return yaml.safe_load(f)
+        # Compiled once per process; reloaded only when the YAML changes
+        self.rules = achievement_rules.get()
 
     async def process_event(self, event_type: str, event_data: dict):
         """
         Main entry point for evaluating achievements after an event.
         """
+        if event_data.get("user_ranges") is not None:
+            await self.process_bulk_event(event_type, event_data)
+            return
+
         user_id = event_data.get("user_id")
         if not user_id:
             return
 
-        # Find rules matching the trigger
-        matching_rules = [
-            rule for rule in self.definitions.get("achievements", [])
-            if rule.get("trigger") == event_type
+        rules = self.rules.for_trigger(event_type)
+        if not rules:
+            return
+
+        snapshot = await self._prefetch(user_id, rules, event_data)
+        if snapshot is None:
+            return
+
+        # Evaluate conditions against the snapshot; no queries per rule
+        awarded = [
+            rule.id for rule in rules
+            if rule.id not in snapshot.earned and self._evaluate_rule(rule, event_data, snapshot)
         ]
+        if awarded:
+            await self._award_achievements(user_id, awarded, event_data)
 
-        for rule in matching_rules:
-            achievement_id = rule["id"]
-            
-            # Check if user already has this achievement
-            exists = await self.db.execute(
-                select(UserAchievement).where(
-                    UserAchievement.user_id == user_id,
-                    UserAchievement.achievement_type == achievement_id
-                )
+    async def _prefetch(self, user_id: str, rules: List[AchievementRule], data: dict) -> Optional["EventSnapshot"]:
+        """
+        Everything the rules for one event can look at, in one query: the
+        user's tier, which of these achievements they already hold, and the
+        analysis / problem / streak figures only when some condition needs them.
+        None when the user does not exist.
+        """
+        needed = {condition.type for rule in rules for condition in rule.conditions}
+
+        percentile = literal(None)
+        if "quality_percentile" in needed and data.get("analysis_id"):
+            # Ranked when the score was written; one primary-key lookup
+            # (percentile_rank is the runtime percentile, not this)
+            percentile = (
+                select(AIAnalysis.quality_percentile)
+                .where(AIAnalysis.id == data["analysis_id"])
+                .scalar_subquery()
             )
-            if exists.scalar_one_or_none():
-                continue
+        first_solver = literal(None)
+        if "first_accepted_for_problem" in needed:
+            # Claimed atomically by ProblemStatsService.record_solve; one primary-key lookup
+            first_solver = (
+                select(ProblemSolveStats.first_solver_id)
+                .where(ProblemSolveStats.problem_id == data.get("problem_id"))
+                .scalar_subquery()
+            )
+        streak = literal(None)
+        if "streak_reaches" in needed:
+            streak = select(UserStreak.current_streak).where(UserStreak.user_id == User.id).scalar_subquery()
 
-            # Evaluate conditions
-            if await self._evaluate_rule(rule, event_data):
-                await self._award_achievement(user_id, achievement_id, event_data)
+        result = await self.db.execute(
+            select(
+                User.league_tier,
+                percentile.label("percentile"),
+                first_solver.label("first_solver"),
+                streak.label("streak"),
+                UserAchievement.achievement_type,
+            )
+            .outerjoin(
+                UserAchievement,
+                and_(
+                    UserAchievement.user_id == User.id,
+                    UserAchievement.achievement_type.in_([rule.id for rule in rules]),
+                ),
+            )
+            .where(User.id == user_id)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        return EventSnapshot(
+            tier=(rows[0].league_tier or "").lower(),
+            earned={row.achievement_type for row in rows if row.achievement_type},
+            quality_percentile=rows[0].percentile,
+            first_solver_id=rows[0].first_solver,
+            current_streak=rows[0].streak,
+        )
 
-    async def _evaluate_rule(self, rule: dict, data: dict) -> bool:
-        conditions = rule.get("conditions", [])
-        for condition in conditions:
-            c_type = condition["type"]
-            val = condition.get("value")
+    def _evaluate_rule(self, rule: AchievementRule, data: dict, snapshot: "EventSnapshot") -> bool:
+        for condition in rule.conditions:
+            c_type = condition.type
+            val = condition.value
             
             if c_type == "first_accepted_for_problem":
-                # Check if this is the first accepted submission for the problem
-                problem_id = data.get("problem_id")
-                result = await self.db.execute(
-                    select(func.count(Submission.id))
-                    .where(Submission.problem_id == problem_id, Submission.verdict == "accepted")
-                )
-                if result.scalar() != 1: # Counting the one just created
+                # Check if this user made the first accepted submission for the problem
+                if snapshot.first_solver_id != data.get("user_id"):
                     return False
 
             elif c_type == "tier_reaches":
                 # User model should already be updated by RatingService/LeagueEngine
-                user_id = data.get("user_id")
-                result = await self.db.execute(select(User).where(User.id == user_id))
-                user = result.scalar_one_or_none()
-                if not user or user.league_tier.lower() != val.lower():
+                if snapshot.tier != val:
                     return False
 
             elif c_type == "rush_streak_reaches":
                 # From rush session data
                 streak = data.get("streak", 0)
-                if streak < int(val):
+                if streak < val:
                     return False
 
             elif c_type == "quality_percentile":
-                # Check AI analysis percentile
-                analysis_id = data.get("analysis_id")
-                result = await self.db.execute(select(AIAnalysis).where(AIAnalysis.id == analysis_id))
-                analysis = result.scalar_one_or_none()
-                if not analysis or (analysis.quality_score_percentile or 0) < int(val):
+                # Quality-score percentile of the analysis among all scored solutions
+                if (snapshot.quality_percentile or 0) < val:
+                    return False
+
+            elif c_type == "season_participation":
+                slug = condition.params.get("season_slug")
+                if slug and data.get("season_slug") != slug:
                     return False
 
             elif c_type == "streak_reaches":
-                # Check daily streak (pseudo-logic for now)
-                # In a real app, we'd query the Submissions table for unique days
-                pass # TODO: Implement real streak check
+                # Maintained incrementally by StreakService as daily solves arrive
+                if (snapshot.current_streak or 0) < val:
+                    return False
 
         return True
 
-    async def _award_achievement(self, user_id: str, achievement_type: str, data: dict):
-        achievement = UserAchievement(
-            user_id=user_id,
-            achievement_type=achievement_type,
-            trigger_id=data.get("trigger_id") or data.get("submission_id") or data.get("session_id"),
-            season_id=data.get("season_id")
-        )
-        self.db.add(achievement)
+    async def process_bulk_event(self, event_type: str, event_data: dict) -> int:
+        """
+        Award a season-wide event to every participant in `user_ranges` at
+        once: one INSERT ... SELECT per matching rule, skipping users who
+        already hold the achievement. Returns achievements awarded.
+        """
+        season_id = event_data["season_id"]
+        in_ranges = or_(*(
+            and_(
+                SeasonParticipant.user_id > lower if lower is not None else true(),
+                SeasonParticipant.user_id <= upper if upper is not None else true(),
+            )
+            for lower, upper in event_data["user_ranges"]
+        ))
+
+        awarded_ids = set()
+        awarded_types = []
+        for rule in self.rules.for_trigger(event_type):
+            conditions = self._bulk_conditions(rule, event_data)
+            if conditions is None:
+                continue
+
+            achievement_id = rule.id
+            candidates = (
+                select(sql_uuid(), SeasonParticipant.user_id, literal(achievement_id), literal(season_id))
+                .join(User, User.id == SeasonParticipant.user_id)
+                .where(
+                    SeasonParticipant.season_id == season_id,
+                    in_ranges,
+                    *conditions,
+                    ~exists().where(
+                        UserAchievement.user_id == SeasonParticipant.user_id,
+                        UserAchievement.achievement_type == achievement_id,
+                    ),
+                )
+            )
+            result = await self.db.execute(
+                insert(UserAchievement)
+                .from_select(["id", "user_id", "achievement_type", "season_id"], candidates)
+                .returning(UserAchievement.id)
+            )
+            inserted = result.scalars().all()
+            if inserted:
+                awarded_ids.update(inserted)
+                awarded_types.append(achievement_id)
+                print(f"🏆 Achievement Unlocked: {achievement_id} for {len(inserted)} user(s)")
         await self.db.commit()
-        print(f"🏆 Achievement Unlocked: {achievement_type} for User {user_id}")
-        
+
+        if awarded_ids:
+            # Only holders of a wallet get a mint task
+            result = await self.db.execute(
+                select(UserAchievement.id)
+                .join(User, User.id == UserAchievement.user_id)
+                .where(
+                    UserAchievement.season_id == season_id,
+                    UserAchievement.achievement_type.in_(awarded_types),
+                    User.wallet_address.is_not(None),
+                )
+            )
+            from app.engines.achievement_tasks import mint_achievement_nft_task
+            for achievement_id in result.scalars():
+                if achievement_id in awarded_ids:
+                    mint_achievement_nft_task.delay(achievement_id)
+        return len(awarded_ids)
+
+    def _bulk_conditions(self, rule: AchievementRule, data: dict) -> Optional[list]:
+        """A rule's conditions as SQL over participants/users; None if the rule cannot match."""
+        conditions = []
+        for condition in rule.conditions:
+            c_type = condition.type
+            if c_type == "season_participation":
+                slug = condition.params.get("season_slug")
+                if slug and data.get("season_slug") != slug:
+                    return None
+            elif c_type == "tier_reaches":
+                conditions.append(func.lower(User.league_tier) == condition.value)
+            else:
+                print(f"⚠️ Condition {c_type} of {rule.id} needs per-user event data; skipped for bulk event")
+                return None
+        return conditions
+
+    async def _award_achievements(self, user_id: str, achievement_types: List[str], data: dict):
+        """Insert every achievement one event earned in a single batch."""
+        achievements = [
+            UserAchievement(
+                user_id=user_id,
+                achievement_type=achievement_type,
+                trigger_id=data.get("trigger_id") or data.get("submission_id") or data.get("session_id"),
+                season_id=data.get("season_id")
+            )
+            for achievement_type in achievement_types
+        ]
+        self.db.add_all(achievements)
+        await self.db.commit()
+
         from app.engines.achievement_tasks import mint_achievement_nft_task
-        mint_achievement_nft_task.delay(achievement.id)
+        for achievement in achievements:
+            print(f"🏆 Achievement Unlocked: {achievement.achievement_type} for User {user_id}")
+            mint_achievement_nft_task.delay(achievement.id)
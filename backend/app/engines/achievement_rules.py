@@ -0,0 +1,132 @@
+"""
+KamiCode — Achievement Rules
+
+Compiled form of achievement_definitions.yaml. The file is parsed once into
+AchievementRule objects whose conditions are validated and typed up front,
+indexed by trigger, and shared by the whole process. `achievement_rules.get()`
+costs one stat() call: the file is re-read only when its mtime changes, and
+a broken edit keeps the last good rules in place.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+DEFINITIONS_PATH = os.path.join(os.path.dirname(__file__), "achievement_definitions.yaml")
+
+# Condition type -> how its `value` is parsed (None: takes no value)
+CONDITION_VALUES = {
+    "first_accepted_for_problem": None,
+    "highest_quality_score": None,
+    "streak_reaches": int,
+    "tier_reaches": lambda value: str(value).lower(),
+    "rush_streak_reaches": int,
+    "quality_percentile": int,
+    "season_participation": None,
+}
+
+
+class AchievementDefinitionError(ValueError):
+    """Raised when achievement_definitions.yaml does not describe valid rules."""
+
+
+@dataclass(frozen=True)
+class Condition:
+    type: str
+    value: Any = None
+    params: Dict[str, Any] = field(default_factory=dict)  # Extra keys, e.g. season_slug
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    id: str
+    name: str
+    description: str
+    trigger: str
+    conditions: Tuple[Condition, ...] = ()
+
+
+class RuleIndex:
+    def __init__(self, rules: List[AchievementRule]):
+        self.rules = rules
+        self._by_trigger: Dict[str, List[AchievementRule]] = {}
+        for rule in rules:
+            self._by_trigger.setdefault(rule.trigger, []).append(rule)
+
+    def for_trigger(self, trigger: str) -> List[AchievementRule]:
+        return self._by_trigger.get(trigger, [])
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+def _compile_condition(rule_id: str, raw: dict) -> Condition:
+    raw = dict(raw)
+    c_type = raw.pop("type", None)
+    if c_type not in CONDITION_VALUES:
+        raise AchievementDefinitionError(f"{rule_id}: unknown condition type {c_type!r}")
+    parse = CONDITION_VALUES[c_type]
+    value = raw.pop("value", None)
+    if parse is not None:
+        if value is None:
+            raise AchievementDefinitionError(f"{rule_id}: condition {c_type} needs a value")
+        try:
+            value = parse(value)
+        except (TypeError, ValueError):
+            raise AchievementDefinitionError(f"{rule_id}: bad value {value!r} for condition {c_type}")
+    return Condition(type=c_type, value=value, params=raw)
+
+
+def compile_rules(data: Optional[dict]) -> RuleIndex:
+    """Validate parsed YAML and build the trigger index."""
+    rules = []
+    seen = set()
+    for raw in (data or {}).get("achievements", []):
+        missing = [key for key in ("id", "name", "description", "trigger") if not raw.get(key)]
+        if missing:
+            raise AchievementDefinitionError(f"{raw.get('id', raw)}: missing {', '.join(missing)}")
+        if raw["id"] in seen:
+            raise AchievementDefinitionError(f"{raw['id']}: defined twice")
+        seen.add(raw["id"])
+        rules.append(AchievementRule(
+            id=raw["id"],
+            name=raw["name"],
+            description=raw["description"],
+            trigger=raw["trigger"],
+            conditions=tuple(_compile_condition(raw["id"], c) for c in raw.get("conditions") or []),
+        ))
+    return RuleIndex(rules)
+
+
+class AchievementRuleCache:
+    def __init__(self, path: str):
+        self.path = path
+        self._index: Optional[RuleIndex] = None
+        self._mtime: Optional[float] = None
+
+    def get(self) -> RuleIndex:
+        """The compiled rules, reloaded first if the file changed on disk."""
+        mtime = os.path.getmtime(self.path)
+        if self._index is None or mtime != self._mtime:
+            self._reload(mtime)
+        return self._index
+
+    def _reload(self, mtime: float):
+        try:
+            with open(self.path, "r") as f:
+                index = compile_rules(yaml.safe_load(f))
+        except (OSError, yaml.YAMLError, AchievementDefinitionError) as e:
+            if self._index is None:
+                raise
+            # Keep serving the last good rules; retried on the next change
+            print(f"⚠️ Ignoring invalid achievement definitions: {e}")
+            self._mtime = mtime
+            return
+        self._index = index
+        self._mtime = mtime
+        print(f"🏆 Loaded {len(index)} achievement rule(s)")
+
+
+achievement_rules = AchievementRuleCache(DEFINITIONS_PATH)
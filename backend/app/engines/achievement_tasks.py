@@ -8,27 +8,32 @@ import asyncio
 from sqlalchemy import select
 from app.core.celery_app import celery_app
 from app.core.database import async_session_maker
+from app.core.task_supervisor import task_supervisor
 from app.engines.achievement_engine import AchievementEngine
 from app.models.achievement import UserAchievement
 from app.models.user import User
 from app.services.ipfs_service import IPFSService
 from app.services.nft_minting_service import NFTMintingService
 
+async def _process_event(payload: dict):
+    async with async_session_maker() as db:
+        engine = AchievementEngine(db)
+        await engine.process_event(payload["event_type"], payload["event_data"])
+
+task_supervisor.register("achievement.event", _process_event, category="achievements")
+
 @celery_app.task(name="app.engines.achievement_tasks.process_achievement_event_task")
 def process_achievement_event_task(event_type: str, event_data: dict):
     """
     Background task to process achievement events.
     """
-    async def run_process():
-        async with async_session_maker() as db:
-            engine = AchievementEngine(db)
-            await engine.process_event(event_type, event_data)
+    payload = {"event_type": event_type, "event_data": event_data}
 
     loop = asyncio.get_event_loop()
     if loop.is_running():
-        asyncio.create_task(run_process())
+        task_supervisor.submit("achievement.event", payload)
     else:
-        loop.run_until_complete(run_process())
+        loop.run_until_complete(_process_event(payload))
 
 @celery_app.task(name="app.engines.achievement_tasks.mint_achievement_nft_task")
 def mint_achievement_nft_task(user_achievement_id: str):
@@ -85,6 +90,7 @@ def mint_achievement_nft_task(user_achievement_id: str):
 
     loop = asyncio.get_event_loop()
     if loop.is_running():
-        asyncio.create_task(run_mint())
+        # Not journaled: replaying a half-finished mint could mint twice
+        task_supervisor.spawn("minting", run_mint(), name=f"mint-{user_achievement_id}")
     else:
         loop.run_until_complete(run_mint())
@@ -1,6 +1,7 @@
 import asyncio
 from app.core.celery_app import celery_app
 from app.core.database import async_session_maker
+from app.core.task_supervisor import task_supervisor
 from app.services.ai_analysis_service import AIAnalysisService
 
 @celery_app.task(name="app.engines.analysis_tasks.analyze_submission_task")
@@ -17,6 +18,6 @@ def analyze_submission_task(submission_id: str):
     loop = asyncio.get_event_loop()
     if loop.is_running():
         # This shouldn't happen in a standard Celery worker, but good to handle
-        asyncio.create_task(run_analysis())
+        task_supervisor.spawn("analysis", run_analysis(), name=f"analysis-{submission_id}")
     else:
         loop.run_until_complete(run_analysis())
@@ -0,0 +1,50 @@
+"""
+KamiCode — Series Downsampling
+
+Largest-Triangle-Three-Buckets (Steinarsson, 2013) for line charts. The
+series is split into equal-count buckets and from each bucket the point
+forming the largest triangle with the previously kept point and the
+average of the next bucket is kept. Peaks and dips survive, so a chart
+of a few hundred points looks like the full series.
+"""
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points to keep, ascending. `x` must be sorted; the first
+    and last points are always kept. Series at or under `threshold` points
+    are returned whole.
+    """
+    n = len(x)
+    if threshold >= n or n <= 2:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1])
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket edges over the interior points 1..n-2
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_stop = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        keep[bucket + 1] = previous
+    return keep
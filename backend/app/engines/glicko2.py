@@ -6,8 +6,9 @@ class Glicko2:
     Simplified Glicko-2 implementation for competitive programming.
     Based on Mark Glickman's paper.
     """
-    def __init__(self, tau: float = 0.5):
+    def __init__(self, tau: float = 0.5, epsilon: float = 1e-6):
         self.tau = tau  # Volatility constraint (standard is 0.5)
+        self.epsilon = epsilon  # Convergence tolerance of the volatility iteration
 
     def _to_glicko2(self, rating: float, rd: float) -> Tuple[float, float]:
         # Rating is centered at 1500, scale is 173.7178
@@ -46,10 +47,8 @@ class Glicko2:
         # Estimated improvement delta
         delta = v * g_phi_opp * (actual_score - expected_score)
         
-        # New Volatility sigma' (using simplified version of Illinois algorithm)
-        # Note: Glickman's full iterative algorithm is complex. 
-        # For our use case, we keep volatility relatively stable for now.
-        new_volatility = volatility 
+        # New Volatility sigma' (Glickman's Illinois iteration, step 5)
+        new_volatility = self._new_volatility(phi, v, delta, volatility)
         
         # New Deviation phi'
         phi_star = math.sqrt(phi**2 + new_volatility**2)
@@ -61,3 +60,33 @@ class Glicko2:
         new_rating, new_rd = self._from_glicko2(new_mu, new_phi)
         
         return new_rating, new_rd, new_volatility
+
+    def _new_volatility(self, phi: float, v: float, delta: float, volatility: float) -> float:
+        """Solve f(x) = 0 for x = ln(sigma'^2) with the Illinois variant of regula falsi."""
+        a = math.log(volatility**2)
+        tau2 = self.tau**2
+
+        def f(x: float) -> float:
+            ex = math.exp(x)
+            return ex * (delta**2 - phi**2 - v - ex) / (2 * (phi**2 + v + ex)**2) - (x - a) / tau2
+
+        A = a
+        if delta**2 > phi**2 + v:
+            B = math.log(delta**2 - phi**2 - v)
+        else:
+            k = 1
+            while f(a - k * self.tau) < 0:
+                k += 1
+            B = a - k * self.tau
+
+        f_A, f_B = f(A), f(B)
+        while abs(B - A) > self.epsilon:
+            C = A + (A - B) * f_A / (f_B - f_A)
+            f_C = f(C)
+            if f_C * f_B <= 0:
+                A, f_A = B, f_B
+            else:
+                f_A = f_A / 2
+            B, f_B = C, f_C
+
+        return math.exp(A / 2)
@@ -0,0 +1,462 @@
+"""
+KamiCode — Leaderboard
+
+Classical-rating leaderboard with logarithmic rank queries. Two backends
+share one interface:
+
+- LocalLeaderboard keeps (-rating, user_id) keys in an indexable skip
+  list, so insert, delete, "rank of key" and "key at rank" are all
+  O(log n). It is per process and loads itself from `users` on first use.
+- RedisLeaderboard keeps a sorted set (ZADD / ZREVRANK / ZREVRANGE), which
+  is shared by every worker.
+
+The `leaderboard` singleton uses Redis when LEADERBOARD_BACKEND is "redis"
+and falls back to the local board if Redis is unreachable. Rating writers
+call `update()` after committing, so a board loaded later from the
+database already includes the write.
+
+A local board only sees the writes of its own process. Rating periods,
+the season reset sweeper and replays run in Celery workers, so every
+LEADERBOARD_LOCAL_REFRESH seconds a local board reads the newest
+users.updated_at (an index lookup) and the season epoch. When users
+changed it applies just the rows updated since its last look; when the
+epoch moved it reloads in the background and keeps serving the old
+board until the new one is ready. Use the Redis backend where those
+writes must show up at once.
+"""
+
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import redis.asyncio as redis
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.task_supervisor import task_supervisor
+from app.engines.league_engine import TIER_THRESHOLDS, TIERS_ORDER
+from app.engines.rating_epoch import current_epoch_query, effective_rating
+from app.models.user import User
+
+settings = get_settings()
+
+_MAX_LEVEL = 32
+_HIGHEST = "\U0010ffff"  # Sorts after every user id, for score-only bounds
+# How far before its last look a local board re-reads updated users
+DELTA_OVERLAP_SECONDS = 60
+
+
+@dataclass
+class LeaderboardEntry:
+    rank: int  # 1-based
+    user_id: str
+    rating: float
+
+
+def tier_bounds(tier: str) -> Tuple[float, Optional[float]]:
+    """[floor, ceiling) of a tier's ratings; ceiling is None for the top tier."""
+    position = TIERS_ORDER.index(tier)
+    ceiling = TIER_THRESHOLDS[TIERS_ORDER[position + 1]] if position + 1 < len(TIERS_ORDER) else None
+    return TIER_THRESHOLDS[tier], ceiling
+
+
+# ──────────────────────────────────────────────────────────────────
+# Indexable skip list
+# ──────────────────────────────────────────────────────────────────
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, level: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        self.width: List[int] = [1] * level  # level-0 steps to next[level]
+
+
+class RankedSet:
+    """
+    Sorted set of comparable keys with O(log n) expected insert, remove,
+    rank (number of smaller keys) and positional access.
+    """
+
+    def __init__(self, keys: Iterable = (), seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self._head = _Node(None, _MAX_LEVEL)
+        self._size = 0
+        self._build(sorted(keys))
+
+    def _build(self, keys: List):
+        """Link already sorted keys in one O(n) pass instead of n inserts."""
+        last = [self._head] * _MAX_LEVEL
+        last_position = [0] * _MAX_LEVEL
+        for position, key in enumerate(keys, 1):
+            node = _Node(key, self._random_level())
+            for level in range(len(node.next)):
+                last[level].next[level] = node
+                last[level].width[level] = position - last_position[level]
+                last[level] = node
+                last_position[level] = position
+        # Trailing links point past the end, at position n + 1
+        for level in range(_MAX_LEVEL):
+            last[level].width[level] = len(keys) + 1 - last_position[level]
+        self._size = len(keys)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < _MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def add(self, key):
+        chain: List[_Node] = [self._head] * _MAX_LEVEL
+        steps_at_level = [0] * _MAX_LEVEL
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        new_level = self._random_level()
+        new = _Node(key, new_level)
+        steps = 0
+        for level in range(new_level):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(new_level, _MAX_LEVEL):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        chain: List[_Node] = [self._head] * _MAX_LEVEL
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), _MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key) -> int:
+        """Number of keys strictly smaller than `key`."""
+        position = 0
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def slice(self, start: int, stop: int) -> List:
+        """Keys at positions [start, stop), walked from one O(log n) descent."""
+        start, stop = max(start, 0), min(stop, self._size)
+        if start >= stop:
+            return []
+        position = 0
+        node = self._head
+        for level in reversed(range(_MAX_LEVEL)):
+            while node.next[level] is not None and position + node.width[level] <= start + 1:
+                position += node.width[level]
+                node = node.next[level]
+        keys = []
+        while node is not None and len(keys) < stop - start:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+# ──────────────────────────────────────────────────────────────────
+# Backends
+# ──────────────────────────────────────────────────────────────────
+
+class BaseLeaderboard(ABC):
+    @abstractmethod
+    async def load(self, entries: Iterable[Tuple[str, float]]):
+        """Replace the board with (user_id, rating) pairs."""
+
+    @abstractmethod
+    async def update(self, entries: Iterable[Tuple[str, float]]):
+        """Insert or move users."""
+
+    @abstractmethod
+    async def remove(self, user_id: str):
+        pass
+
+    @abstractmethod
+    async def size(self) -> int:
+        pass
+
+    @abstractmethod
+    async def rank(self, user_id: str) -> Optional[LeaderboardEntry]:
+        pass
+
+    @abstractmethod
+    async def range(self, start: int, stop: int) -> List[LeaderboardEntry]:
+        """Entries at 0-based positions [start, stop), best first."""
+
+    @abstractmethod
+    async def count_at_least(self, rating: float) -> int:
+        """Number of users rated `rating` or higher."""
+
+
+class LocalLeaderboard(BaseLeaderboard):
+    def __init__(self, entries: Iterable[Tuple[str, float]] = ()):
+        self._ratings: Dict[str, float] = {user_id: rating for user_id, rating in entries}
+        self._ranked = RankedSet((-rating, user_id) for user_id, rating in self._ratings.items())
+
+    async def load(self, entries):
+        fresh = LocalLeaderboard(entries)
+        self._ratings, self._ranked = fresh._ratings, fresh._ranked
+
+    async def update(self, entries):
+        for user_id, rating in entries:
+            old = self._ratings.get(user_id)
+            if old == rating:
+                continue
+            if old is not None:
+                self._ranked.remove((-old, user_id))
+            self._ratings[user_id] = rating
+            self._ranked.add((-rating, user_id))
+
+    async def remove(self, user_id):
+        old = self._ratings.pop(user_id, None)
+        if old is not None:
+            self._ranked.remove((-old, user_id))
+
+    async def size(self):
+        return len(self._ranked)
+
+    async def rank(self, user_id):
+        rating = self._ratings.get(user_id)
+        if rating is None:
+            return None
+        return LeaderboardEntry(self._ranked.rank((-rating, user_id)) + 1, user_id, rating)
+
+    async def range(self, start, stop):
+        start = max(start, 0)
+        return [
+            LeaderboardEntry(start + i + 1, user_id, -negative)
+            for i, (negative, user_id) in enumerate(self._ranked.slice(start, stop))
+        ]
+
+    async def count_at_least(self, rating):
+        return self._ranked.rank((-rating, _HIGHEST))
+
+
+class RedisLeaderboard(BaseLeaderboard):
+    def __init__(self, url: str, key: str = "leaderboard:classical"):
+        self._redis = redis.from_url(url, decode_responses=True)
+        self.key = key
+
+    async def load(self, entries):
+        entries = list(entries)
+        if not entries:
+            await self._redis.delete(self.key)
+            return
+        staging = f"{self.key}:loading"
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.delete(staging)
+        for i in range(0, len(entries), 10_000):
+            pipe.zadd(staging, dict(entries[i:i + 10_000]))
+        # Swap in one step so readers never see a half-loaded board
+        pipe.rename(staging, self.key)
+        await pipe.execute()
+
+    async def update(self, entries):
+        mapping = dict(entries)
+        if mapping:
+            await self._redis.zadd(self.key, mapping)
+
+    async def remove(self, user_id):
+        await self._redis.zrem(self.key, user_id)
+
+    async def size(self):
+        return await self._redis.zcard(self.key)
+
+    async def rank(self, user_id):
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zrevrank(self.key, user_id)
+        pipe.zscore(self.key, user_id)
+        position, rating = await pipe.execute()
+        if position is None:
+            return None
+        return LeaderboardEntry(position + 1, user_id, float(rating))
+
+    async def range(self, start, stop):
+        start = max(start, 0)
+        if stop <= start:
+            return []
+        rows = await self._redis.zrevrange(self.key, start, stop - 1, withscores=True)
+        return [LeaderboardEntry(start + i + 1, user_id, float(rating)) for i, (user_id, rating) in enumerate(rows)]
+
+    async def count_at_least(self, rating):
+        return await self._redis.zcount(self.key, rating, "+inf")
+
+
+# ──────────────────────────────────────────────────────────────────
+# Facade
+# ──────────────────────────────────────────────────────────────────
+
+class Leaderboard:
+    """Queries and updates against the configured backend, loading it on first use."""
+
+    def __init__(self, backend: BaseLeaderboard, refresh_seconds: float = None):
+        self.backend = backend
+        self.refresh_seconds = settings.LEADERBOARD_LOCAL_REFRESH if refresh_seconds is None else refresh_seconds
+        self._loaded = False
+        # Newest users.updated_at and the season epoch the board reflects
+        self._changed_at = None
+        self._epoch = None
+        self._checked_at = 0.0
+        self._reload: Optional[asyncio.Task] = None
+
+    @property
+    def is_local(self) -> bool:
+        return isinstance(self.backend, LocalLeaderboard)
+
+    async def ensure_loaded(self, db: AsyncSession):
+        if not self._loaded:
+            await self.rebuild(db)
+        elif self.is_local and self.refresh_seconds and time.monotonic() - self._checked_at >= self.refresh_seconds:
+            # Another process may have written ratings this board never saw
+            self._checked_at = time.monotonic()
+            await self._catch_up(db)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        # Taken before the read, so a write racing the load is applied as a delta later
+        changed_at, epoch = await self._data_version(db)
+        # Ratings with a pending season reset are ranked as they will read once settled
+        result = await db.execute(
+            select(User.id, effective_rating(current_epoch_query())).where(User.is_active.is_(True))
+        )
+        entries = result.all()
+        if self.is_local:
+            # Build the skip list off the event loop, then swap it in
+            self.backend = await asyncio.to_thread(LocalLeaderboard, entries)
+        else:
+            await self.backend.load(entries)
+        self._loaded = True
+        self._changed_at, self._epoch = changed_at, epoch
+        self._checked_at = time.monotonic()
+        print(f"🏅 Leaderboard loaded ({len(entries)} users, {'local' if self.is_local else 'redis'})")
+        return len(entries)
+
+    async def update(self, user_id: str, rating: float):
+        await self.update_many([(user_id, rating)])
+
+    async def update_many(self, entries: Iterable[Tuple[str, float]]):
+        # An unloaded board picks these up from the database when it loads
+        if not self._loaded:
+            return
+        entries = [(user_id, float(rating)) for user_id, rating in entries]
+        try:
+            await self.backend.update(entries)
+        except Exception as e:
+            self._fall_back(e)
+
+    async def size(self, db: AsyncSession) -> int:
+        return await self._query(db, lambda board: board.size())
+
+    async def top(self, db: AsyncSession, limit: int, offset: int = 0) -> List[LeaderboardEntry]:
+        return await self._query(db, lambda board: board.range(offset, offset + limit))
+
+    async def rank(self, db: AsyncSession, user_id: str) -> Optional[LeaderboardEntry]:
+        return await self._query(db, lambda board: board.rank(user_id))
+
+    async def around(self, db: AsyncSession, user_id: str, radius: int) -> List[LeaderboardEntry]:
+        """The user and up to `radius` neighbours on each side."""
+        async def query(board: BaseLeaderboard):
+            entry = await board.rank(user_id)
+            if entry is None:
+                return []
+            return await board.range(entry.rank - 1 - radius, entry.rank + radius)
+
+        return await self._query(db, query)
+
+    async def tier(self, db: AsyncSession, tier: str, limit: int, offset: int = 0) -> Tuple[int, List[LeaderboardEntry]]:
+        """(users in the tier, one page of them best first); ranks stay global."""
+        floor, ceiling = tier_bounds(tier)
+
+        async def query(board: BaseLeaderboard):
+            above = await board.count_at_least(ceiling) if ceiling is not None else 0
+            through = await board.count_at_least(floor)
+            start = above + max(offset, 0)
+            return through - above, await board.range(start, min(start + limit, through))
+
+        return await self._query(db, query)
+
+    async def _query(self, db: AsyncSession, query: Callable[[BaseLeaderboard], Awaitable]):
+        try:
+            await self.ensure_loaded(db)
+            return await query(self.backend)
+        except Exception as e:
+            self._fall_back(e)
+            await self.ensure_loaded(db)
+            return await query(self.backend)
+
+    async def _data_version(self, db: AsyncSession) -> tuple:
+        """(newest users.updated_at, season epoch); both are index lookups."""
+        result = await db.execute(select(func.max(User.updated_at), current_epoch_query()))
+        return tuple(result.one())
+
+    async def _catch_up(self, db: AsyncSession):
+        changed_at, epoch = await self._data_version(db)
+        if epoch != self._epoch:
+            # A season reset moves every rating: reload off the request path
+            if self._reload is None or self._reload.done():
+                self._reload = task_supervisor.spawn("leaderboard", self._rebuild_in_background(db.bind))
+            return
+        if changed_at is None or changed_at == self._changed_at:
+            return
+
+        # Rows stamped shortly before the last look may have committed after it
+        query = select(User.id, User.is_active, effective_rating(epoch))
+        if self._changed_at is not None:
+            query = query.where(User.updated_at >= self._changed_at - timedelta(seconds=DELTA_OVERLAP_SECONDS))
+        rows = (await db.execute(query)).all()
+        for user_id, is_active, _ in rows:
+            if not is_active:
+                await self.backend.remove(user_id)
+        await self.backend.update([(user_id, float(rating)) for user_id, is_active, rating in rows if is_active])
+        self._changed_at = changed_at
+
+    async def _rebuild_in_background(self, bind):
+        async with AsyncSession(bind, expire_on_commit=False) as db:
+            await self.rebuild(db)
+
+    def _fall_back(self, error: Exception):
+        if self.is_local:
+            raise error
+        print(f"⚠️ Redis leaderboard unavailable ({error}); falling back to the in-process board")
+        self.backend = LocalLeaderboard()
+        self._loaded = False
+
+
+def create_leaderboard() -> Leaderboard:
+    if settings.LEADERBOARD_BACKEND == "redis":
+        return Leaderboard(RedisLeaderboard(settings.REDIS_URL))
+    return Leaderboard(LocalLeaderboard())
+
+
+leaderboard = create_leaderboard()
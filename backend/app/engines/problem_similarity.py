@@ -0,0 +1,330 @@
+"""
+KamiCode — Problem Similarity Index
+
+MinHash signatures with LSH banding for near-duplicate problem detection.
+A problem's features are word 3-shingles of its title and description plus
+one token per test case; two problems' MinHash agreement estimates the
+Jaccard similarity of those feature sets. Signatures are split into bands
+and bucketed, so a lookup only compares against problems sharing a bucket
+instead of the whole catalog.
+
+The index lives in memory and, when PROBLEM_INDEX_PATH is set, is shared
+between processes as a JSON file; it is rebuilt from the problems table
+when the file is missing or stale. Hashing, (de)serialising and file I/O
+run in a worker thread so a rebuild never stalls the event loop. Saves
+write a temp file and rename it, under a file lock; a save that finds the
+file was rewritten by another process since it was loaded keeps that
+process's problems too.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.problem import Problem
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves stay atomic, but are not serialised across processes
+    fcntl = None
+
+settings = get_settings()
+
+NUM_PERM = 128
+BANDS = 32  # 32 bands x 4 rows: candidates from roughly 0.4 Jaccard upwards
+SHINGLE_SIZE = 3
+
+_MERSENNE = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+
+Signature = List[int]
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def problem_features(title: str, description: str, test_cases: Optional[dict]) -> Set[str]:
+    """Word shingles of the statement plus a signature token per test case."""
+    words = _WORD.findall(f"{title} {description}".lower())
+    if len(words) < SHINGLE_SIZE:
+        features = {" ".join(words)} if words else set()
+    else:
+        features = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+    for group in ("sample", "hidden"):
+        for case in (test_cases or {}).get(group, []):
+            given = " ".join(str(case.get("input", "")).split())
+            expected = " ".join(str(case.get("expected", "")).split())
+            features.add(f"tc:{given}\0{expected}")
+    return features
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Iterable[str]) -> Signature:
+        hashes = [_hash64(f) for f in features]
+        if not hashes:
+            return [_MERSENNE] * self.num_perm
+        return [min((a * h + b) % _MERSENNE for h in hashes) for a, b in self._params]
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of the feature sets behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class ProblemSimilarityIndex:
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, path: Optional[str] = None):
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.path = path
+        self._loaded = False
+        self._loaded_mtime: Optional[float] = None
+        self._version = 0  # File version this index was loaded from or last saved as
+        self._save_lock = threading.Lock()
+        self._rebuild_logs: List[List[Tuple[str, Signature, str]]] = []
+        self._clear()
+
+    def _clear(self):
+        self._signatures: Dict[str, Signature] = {}
+        self._labels: Dict[str, str] = {}  # problem id -> slug, for messages
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [defaultdict(set) for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def signature_for(self, title: str, description: str, test_cases: Optional[dict]) -> Signature:
+        return self.hasher.signature(problem_features(title, description, test_cases))
+
+    def add(self, key: str, signature: Signature, label: str = None):
+        # A rebuild in flight replaces the structures below; it replays this afterwards
+        for log in self._rebuild_logs:
+            log.append((key, signature, label))
+        self.remove(key)
+        self._signatures[key] = signature
+        self._labels[key] = label or key
+        for band, bucket in enumerate(self._band_keys(signature)):
+            self._buckets[band][bucket].add(key)
+
+    def add_problem(self, problem: Problem):
+        self.add(
+            problem.id,
+            self.signature_for(problem.title, problem.description, problem.test_cases),
+            problem.slug,
+        )
+
+    def remove(self, key: str):
+        signature = self._signatures.pop(key, None)
+        self._labels.pop(key, None)
+        if signature is None:
+            return
+        for band, bucket in enumerate(self._band_keys(signature)):
+            members = self._buckets[band].get(bucket)
+            if members:
+                members.discard(key)
+                if not members:
+                    del self._buckets[band][bucket]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(self, signature: Signature, threshold: float = None) -> List[Tuple[str, str, float]]:
+        """
+        (key, label, similarity) of indexed problems at or above `threshold`,
+        most similar first. Only LSH bucket-mates are compared.
+        """
+        threshold = settings.PROBLEM_DUPLICATE_THRESHOLD if threshold is None else threshold
+        candidates: Set[str] = set()
+        for band, bucket in enumerate(self._band_keys(signature)):
+            candidates |= self._buckets[band].get(bucket, set())
+
+        matches = []
+        for key in candidates:
+            score = similarity(signature, self._signatures[key])
+            if score >= threshold:
+                matches.append((key, self._labels[key], score))
+        matches.sort(key=lambda match: match[2], reverse=True)
+        return matches
+
+    def find_duplicate(self, signature: Signature, threshold: float = None) -> Optional[Tuple[str, str, float]]:
+        matches = self.query(signature, threshold)
+        return matches[0] if matches else None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """Load from disk (or rebuild from the database) if another process changed it."""
+        mtime = self._file_mtime()
+        if self._loaded and mtime == self._loaded_mtime:
+            return
+        if mtime is not None:
+            data = await asyncio.to_thread(self._read)
+            if data is not None:
+                self._adopt(await asyncio.to_thread(self._build, data["problems"].items()), data)
+                return
+        await self.rebuild(db)
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        result = await db.execute(select(Problem.id, Problem.slug, Problem.title, Problem.description, Problem.test_cases))
+        rows = result.all()
+        log: List[Tuple[str, Signature, str]] = []
+        self._rebuild_logs.append(log)
+        try:
+            built = await asyncio.to_thread(self._build_from_rows, rows)
+        finally:
+            self._rebuild_logs.remove(log)
+        self._adopt(built)
+        for key, signature, label in log:
+            self.add(key, signature, label)
+        await self.save_async()
+        print(f"🔎 Rebuilt problem similarity index ({len(self)} problems)")
+        return len(self)
+
+    def save(self):
+        if self.path:
+            self._saved(self._write(self._snapshot()))
+
+    async def save_async(self):
+        """save() with the file work in a worker thread."""
+        if self.path:
+            self._saved(await asyncio.to_thread(self._write, self._snapshot()))
+
+    def load(self) -> bool:
+        """Load the persisted index; False if it was written with other parameters."""
+        data = self._read()
+        if data is None:
+            return False
+        self._adopt(self._build(data["problems"].items()), data)
+        return True
+
+    def _build_from_rows(self, rows) -> "ProblemSimilarityIndex":
+        """A fresh index over problem rows; touches nothing shared, so it can run in a thread."""
+        return self._build(
+            (problem_id, {"label": slug, "signature": self.signature_for(title, description, test_cases)})
+            for problem_id, slug, title, description, test_cases in rows
+        )
+
+    def _build(self, entries) -> "ProblemSimilarityIndex":
+        built = ProblemSimilarityIndex(self.hasher.num_perm, self.bands)
+        for key, entry in entries:
+            built.add(key, entry["signature"], entry["label"])
+        return built
+
+    def _adopt(self, built: "ProblemSimilarityIndex", data: Optional[dict] = None):
+        """Swap in a fully built index in one step, so readers never see a partial one."""
+        self._signatures, self._labels, self._buckets = built._signatures, built._labels, built._buckets
+        self._loaded = True
+        if data is not None:
+            self._version = data.get("version", 0)
+            self._loaded_mtime = data["mtime"]
+
+    def _snapshot(self) -> dict:
+        return {
+            "num_perm": self.hasher.num_perm,
+            "bands": self.bands,
+            "problems": {
+                key: {"label": self._labels[key], "signature": signature}
+                for key, signature in self._signatures.items()
+            },
+        }
+
+    def _read(self) -> Optional[dict]:
+        """The persisted index (with its mtime), or None if missing or written with other parameters."""
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data.get("num_perm") != self.hasher.num_perm or data.get("bands") != self.bands:
+            return None
+        data["mtime"] = mtime
+        return data
+
+    def _write(self, data: dict) -> Tuple[int, Optional[float]]:
+        """
+        Write the index under the file lock. If another process saved since
+        this one loaded, its problems are kept as well and the returned mtime
+        is None, so the next ensure_loaded picks up the merged file.
+        """
+        with self._locked():
+            on_disk = self._read()
+            merged = on_disk is not None and on_disk.get("version", 0) != self._version
+            if merged:
+                data["problems"] = {**on_disk["problems"], **data["problems"]}
+            data["version"] = (on_disk or {}).get("version", 0) + 1
+
+            # Write then rename so a concurrent reader never sees a torn file
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".problem_index.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return data["version"], None if merged else os.path.getmtime(self.path)
+
+    def _saved(self, written: Tuple[int, Optional[float]]):
+        version, mtime = written
+        # After a merge this index still lacks the other process's problems:
+        # keep the old version and mtime so the next save merges again and
+        # the next ensure_loaded reloads
+        if mtime is not None:
+            self._version, self._loaded_mtime = version, mtime
+
+    @contextmanager
+    def _locked(self):
+        with self._save_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.path}.lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _band_keys(self, signature: Signature) -> List[Tuple[int, ...]]:
+        return [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _file_mtime(self) -> Optional[float]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        return os.path.getmtime(self.path)
+
+
+problem_index = ProblemSimilarityIndex(path=settings.PROBLEM_INDEX_PATH)
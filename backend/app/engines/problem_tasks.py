@@ -4,12 +4,21 @@ from datetime import date
 from app.core.celery_app import celery_app
 from app.core.database import async_session_maker
 from app.services.problem_generator import ProblemGenerator
+from app.services.problem_buffer import ProblemBufferService
+from app.services.problem_rating_service import ProblemRatingService
 
 logger = logging.getLogger(__name__)
 
 async def _run_generate_daily_problem():
     logger.info("Starting automated daily problem generation...")
     async with async_session_maker() as db:
+        # Prefer a pre-validated problem from the buffer: no model call at rollover
+        problem = await ProblemBufferService(db).install_next(date.today())
+        if problem:
+            logger.info(f"✅ Installed buffered daily problem: '{problem.title}' for {problem.daily_date}")
+            return
+
+        logger.warning("Problem buffer is empty, generating the daily problem live...")
         generator = ProblemGenerator(db)
         
         # We'll use "medium" difficulty for standard daily challenges.
@@ -44,3 +53,41 @@ def generate_daily_problem_task():
         asyncio.set_event_loop(loop)
     
     loop.run_until_complete(_run_generate_daily_problem())
+
+
+async def _run_refill_problem_buffer():
+    async with async_session_maker() as db:
+        validated = await ProblemBufferService(db).refill()
+        logger.info(f"Problem buffer refill added {validated} validated problem(s)")
+
+@celery_app.task(name="app.engines.problem_tasks.refill_problem_buffer_task")
+def refill_problem_buffer_task():
+    """
+    Celery task that tops up the buffer of pre-generated, validated daily problems.
+    """
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    loop.run_until_complete(_run_refill_problem_buffer())
+
+
+async def _run_fit_problem_ratings():
+    async with async_session_maker() as db:
+        fitted = await ProblemRatingService(db).fit()
+        logger.info(f"Problem rating fit updated {fitted} problem(s)")
+
+@celery_app.task(name="app.engines.problem_tasks.fit_problem_ratings_task")
+def fit_problem_ratings_task():
+    """
+    Celery task that refits per-problem Glicko-2 ratings from recent attempts.
+    """
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    loop.run_until_complete(_run_fit_problem_ratings())
@@ -0,0 +1,126 @@
+"""
+KamiCode — Quantile Sketch
+
+A compact, mergeable KLL sketch (Karnin, Lang & Liberty) for streaming
+p50/p90/p99 estimates of runtime and memory. The sketch keeps a stack of
+compactors; level h holds items of weight 2**h. When the sketch is full,
+the lowest full compactor is sorted and every other item is promoted to
+the next level, so the size stays O(k log(n/k)) for n updates.
+"""
+
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_K = 200
+
+# Capacity decay between levels (lower levels get geometrically smaller buffers)
+_C = 2.0 / 3.0
+
+
+class KLLSketch:
+    def __init__(self, k: int = DEFAULT_K, rng: Optional[random.Random] = None):
+        self.k = k
+        self.n = 0  # Total number of items ever added (sum of weights)
+        self.compactors: List[List[float]] = [[]]
+        self._rng = rng or random.Random()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, value: float):
+        self.compactors[0].append(value)
+        self.n += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def extend(self, values: Iterable[float]):
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Merge another sketch into this one in place and return self."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        while self.size >= self.max_size:
+            self._compress()
+        return self
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        return sum(len(c) for c in self.compactors)
+
+    @property
+    def max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (0..1), or None for an empty sketch."""
+        weighted = self._weighted_items()
+        if not weighted:
+            return None
+        total = sum(w for _, w in weighted)
+        target = q * total
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+    def quantiles(self, qs: Iterable[float]) -> Dict[float, Optional[float]]:
+        return {q: self.quantile(q) for q in qs}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "n": self.n, "c": self.compactors}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict], rng: Optional[random.Random] = None) -> "KLLSketch":
+        if not data:
+            return cls(rng=rng)
+        sketch = cls(k=data.get("k", DEFAULT_K), rng=rng)
+        sketch.n = data.get("n", 0)
+        sketch.compactors = [list(items) for items in data.get("c", [[]])] or [[]]
+        return sketch
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _capacity(self, level: int) -> int:
+        height = len(self.compactors) - level - 1
+        return int(math.ceil((_C ** height) * self.k)) + 1
+
+    def _compress(self):
+        for level, items in enumerate(self.compactors):
+            if len(items) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self.compactors.append([])
+                items.sort()
+                # With an odd count the smallest item stays behind at this level
+                start = len(items) % 2
+                offset = self._rng.randint(0, 1)
+                self.compactors[level + 1].extend(items[start + offset::2])
+                self.compactors[level] = items[:start]
+                return
+
+    def _weighted_items(self) -> List[Tuple[float, int]]:
+        weighted = [
+            (value, 1 << level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        ]
+        weighted.sort(key=lambda item: item[0])
+        return weighted
@@ -0,0 +1,92 @@
+"""
+KamiCode — Rating Epochs
+
+Season soft resets are applied lazily. Each closed season takes the next
+reset epoch, and every user records the epoch their rating belongs to.
+A rating from an older epoch is reset when it is next read or written:
+for every season it missed it moves 40% of the way down to its tier
+floor, and RD goes back to 350. Ending a season is then a single row
+update instead of a rewrite of every user.
+
+Writers fold the reset into their own compare-and-swap update, readers of
+a loaded user call `settle_rating`, and `effective_rating` /
+`effective_rd` give the same values as SQL
+expressions for set-based readers (leaderboard load, season snapshot,
+the background sweeper).
+"""
+
+from typing import Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import ColumnElement
+
+from app.engines.league_engine import TIER_THRESHOLDS
+from app.models.season import Season
+from app.models.user import User
+
+SOFT_RESET_FACTOR = 0.6  # Share of the distance above the tier floor a rating keeps
+RESET_RD = 350.0  # Resetting to default for fresh assessment
+
+# Beyond this many missed seasons the remaining factor (0.6^24 < 1e-5) is treated as 0
+_MAX_GAPS = 24
+
+
+def current_epoch_query():
+    """Scalar subquery for the current reset epoch (0 before any season closed)."""
+    return select(func.coalesce(func.max(Season.reset_epoch), 0)).scalar_subquery()
+
+
+def soft_reset(rating: float, rd: float, tier: str, epochs_behind: int) -> Tuple[float, float]:
+    """Apply `epochs_behind` soft resets: new_rating = floor + (old - floor) * 0.6 per season."""
+    if epochs_behind <= 0:
+        return rating, rd
+    floor = TIER_THRESHOLDS.get((tier or "").lower(), 0.0)
+    return floor + (rating - floor) * SOFT_RESET_FACTOR ** epochs_behind, RESET_RD
+
+
+def effective_rating(epoch) -> ColumnElement:
+    floor = case(TIER_THRESHOLDS, value=func.lower(User.league_tier), else_=0.0)
+    factor = case(
+        {gap: SOFT_RESET_FACTOR ** gap for gap in range(1, _MAX_GAPS + 1)},
+        value=epoch - User.rating_epoch,
+        else_=0.0,
+    )
+    return case(
+        (User.rating_epoch >= epoch, User.classical_rating),
+        else_=floor + (User.classical_rating - floor) * factor,
+    )
+
+
+def effective_rd(epoch) -> ColumnElement:
+    return case((User.rating_epoch >= epoch, User.classical_rd), else_=RESET_RD)
+
+
+async def settle_rating(db: AsyncSession, user: User, epoch: int) -> bool:
+    """
+    Write any pending soft reset onto a loaded user (the caller commits).
+    Guarded by rating_version like every other rating write; on a lost race
+    the user is refreshed, since the winner already applied the reset.
+    """
+    if user.rating_epoch >= epoch:
+        return False
+    rating, rd = soft_reset(user.classical_rating, user.classical_rd, user.league_tier, epoch - user.rating_epoch)
+    values = {
+        "classical_rating": rating,
+        "classical_rd": rd,
+        "rating_epoch": epoch,
+        "rating_version": user.rating_version + 1,
+    }
+    result = await db.execute(
+        update(User)
+        .where(User.id == user.id, User.rating_version == user.rating_version)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        await db.refresh(user)
+        return False
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+    return True
@@ -1,20 +1,65 @@
 import asyncio
 from app.core.celery_app import celery_app
 from app.core.database import async_session_maker
+from app.core.task_supervisor import task_supervisor
 from app.services.rating_service import RatingEngine
+from app.services.rating_period import RatingPeriodService
+from app.engines.season_engine import SeasonEngine
+
+async def _update_rating(payload: dict):
+    async with async_session_maker() as db:
+        service = RatingEngine(db)
+        await service.update_user_rating(payload["user_id"], payload["submission_id"])
+
+task_supervisor.register("rating.update", _update_rating, category="rating")
 
 @celery_app.task(name="app.engines.rating_tasks.update_user_rating_task")
 def update_user_rating_task(user_id: str, submission_id: str):
     """
     Background task to update user rating.
     """
-    async def run_update():
-        async with async_session_maker() as db:
-            service = RatingEngine(db)
-            await service.update_user_rating(user_id, submission_id)
+    payload = {"user_id": user_id, "submission_id": submission_id}
 
     loop = asyncio.get_event_loop()
     if loop.is_running():
-        asyncio.create_task(run_update())
+        task_supervisor.submit("rating.update", payload)
     else:
-        loop.run_until_complete(run_update())
+        loop.run_until_complete(_update_rating(payload))
+
+
+async def _close_rating_periods():
+    async with async_session_maker() as db:
+        await RatingPeriodService(db).close_due_periods()
+
+@celery_app.task(name="app.engines.rating_tasks.close_rating_periods_task")
+def close_rating_periods_task():
+    """
+    Scheduled task that batch-rates every complete rating period (no-op in per-submission mode).
+    """
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    loop.run_until_complete(_close_rating_periods())
+
+
+async def _sweep_season_resets():
+    async with async_session_maker() as db:
+        swept = await SeasonEngine(db).sweep_pending_resets()
+        if swept:
+            print(f"🧹 Applied pending season resets to {swept} user(s)")
+
+@celery_app.task(name="app.engines.rating_tasks.sweep_season_resets_task")
+def sweep_season_resets_task():
+    """
+    Scheduled task that writes out season soft resets still pending on idle users.
+    """
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    loop.run_until_complete(_sweep_season_resets())
@@ -0,0 +1,156 @@
+"""
+KamiCode — Runtime Distribution
+
+Per-problem (and per-language) sorted runtimes of accepted submissions,
+kept in memory so runtime percentiles are a binary search instead of two
+COUNT(*) scans over the submissions table.
+"""
+
+import time
+from bisect import bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.submission import Submission
+
+settings = get_settings()
+
+# Key for a problem's distribution; language=None covers every language
+DistributionKey = Tuple[str, Optional[str]]
+
+
+class RuntimeDistribution:
+    """Sorted runtimes for one problem/language pair."""
+
+    def __init__(self, runtimes: Optional[List[int]] = None):
+        self._runtimes = sorted(runtimes or [])
+
+    def __len__(self) -> int:
+        return len(self._runtimes)
+
+    def add(self, runtime_ms: int):
+        insort(self._runtimes, runtime_ms)
+
+    def count_slower(self, runtime_ms: int) -> int:
+        """Number of recorded runtimes strictly greater than runtime_ms."""
+        return len(self._runtimes) - bisect_right(self._runtimes, runtime_ms)
+
+    def percentile(self, runtime_ms: int) -> float:
+        """
+        Share of recorded solutions slower than runtime_ms, as 0-100.
+        A lone solution is reported as top 100%.
+        """
+        total = len(self._runtimes)
+        if total <= 1:
+            return 100.0
+        return (self.count_slower(runtime_ms) / total) * 100.0
+
+
+class RuntimeDistributionRegistry:
+    """
+    Process-wide cache of runtime distributions.
+
+    Distributions are loaded from the database the first time a key is
+    queried and then kept current by `record()` on every accepted verdict
+    in this process. Verdicts from other processes (other API workers,
+    Celery) only arrive through a reload, so a distribution older than
+    `ttl` seconds is reloaded on its next query. A verdict recorded while a
+    load is in flight is applied to the loaded distribution, unless the
+    load already read that submission.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = settings.RUNTIME_DISTRIBUTION_TTL if ttl is None else ttl
+        self._distributions: Dict[DistributionKey, RuntimeDistribution] = {}
+        self._loaded_at: Dict[DistributionKey, float] = {}
+        # Per key, one log of (submission id, runtime) per load in flight
+        self._in_flight: Dict[DistributionKey, List[List[Tuple[str, int]]]] = {}
+
+    def record(self, problem_id: str, language: str, submission_id: str, runtime_ms: Optional[int]):
+        """
+        Add an accepted runtime to the problem's all-language and
+        per-language distributions. Keys that were never loaded are skipped;
+        their first load reads the row from the DB.
+        """
+        if runtime_ms is None:
+            return
+        for key in ((problem_id, None), (problem_id, language)):
+            distribution = self._distributions.get(key)
+            if distribution is not None:
+                distribution.add(runtime_ms)
+            for log in self._in_flight.get(key, ()):
+                log.append((submission_id, runtime_ms))
+
+    async def get(
+        self, db: AsyncSession, problem_id: str, language: Optional[str] = None
+    ) -> RuntimeDistribution:
+        key = (problem_id, language)
+        distribution = self._distributions.get(key)
+        if distribution is not None and not self._expired(key):
+            return distribution
+
+        log: List[Tuple[str, int]] = []
+        self._in_flight.setdefault(key, []).append(log)
+        try:
+            rows = await self._load(db, problem_id, language)
+        finally:
+            logs = self._in_flight[key]
+            logs.remove(log)
+            if not logs:
+                del self._in_flight[key]
+
+        runtimes = [runtime for _, runtime in rows]
+        if log:
+            seen = {submission_id for submission_id, _ in rows}
+            runtimes.extend(runtime for submission_id, runtime in log if submission_id not in seen)
+        distribution = RuntimeDistribution(runtimes)
+        self._distributions[key] = distribution
+        self._loaded_at[key] = time.monotonic()
+        return distribution
+
+    async def percentile(
+        self, db: AsyncSession, problem_id: str, runtime_ms: int, language: Optional[str] = None
+    ) -> float:
+        distribution = await self.get(db, problem_id, language)
+        return distribution.percentile(runtime_ms)
+
+    async def rebuild(self, db: AsyncSession, problem_id: str) -> int:
+        """
+        Drop every cached distribution for a problem and reload the
+        all-language one from the DB. Returns the number of runtimes loaded.
+        """
+        self.invalidate(problem_id)
+        distribution = await self.get(db, problem_id)
+        return len(distribution)
+
+    def invalidate(self, problem_id: Optional[str] = None):
+        if problem_id is None:
+            self._distributions.clear()
+            self._loaded_at.clear()
+            return
+        for key in [k for k in self._distributions if k[0] == problem_id]:
+            del self._distributions[key]
+            self._loaded_at.pop(key, None)
+
+    def _expired(self, key: DistributionKey) -> bool:
+        return bool(self.ttl) and time.monotonic() - self._loaded_at[key] > self.ttl
+
+    async def _load(
+        self, db: AsyncSession, problem_id: str, language: Optional[str]
+    ) -> List[Tuple[str, int]]:
+        query = select(Submission.id, Submission.runtime_ms).where(
+            Submission.problem_id == problem_id,
+            Submission.verdict == "accepted",
+            Submission.runtime_ms.isnot(None),
+        )
+        if language:
+            query = query.where(Submission.language == language)
+
+        result = await db.execute(query)
+        return [tuple(row) for row in result.all()]
+
+
+runtime_distributions = RuntimeDistributionRegistry()
@@ -4,15 +4,21 @@ KamiCode — Season Engine
 Manages competition cycles, seasonal rating resets, and archiving performance.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func
+from sqlalchemy import and_, exists, func, insert, literal, or_, select, update
+from app.core.config import get_settings
+from app.models.base import sql_uuid
 from app.models.season import Season, SeasonParticipant
 from app.models.user import User
 from app.engines.league_engine import TIER_THRESHOLDS
+from app.engines.rating_epoch import current_epoch_query, effective_rating, effective_rd
+from app.engines.leaderboard import leaderboard
 from app.engines.achievement_tasks import process_achievement_event_task
 
+settings = get_settings()
+
 class SeasonEngine:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -50,53 +56,225 @@ class SeasonEngine:
     async def end_season(self, season_id: str):
         """
         Completes a season, archives participants, and resets ratings.
+
+        Runs as phases of set-based statements, each chunk over a users.id
+        range committed together with the season's progress cursor, so a
+        crashed close picks up where it stopped when called again:
+
+        1. participants  INSERT ... SELECT a snapshot of each active user
+        2. rank          walk the snapshot best first in keyed chunks, filling
+                         final_rank with RANK() semantics (ties share a rank)
+        3. reset         give the season the next reset epoch (O(1); users are
+                         soft-reset lazily, see app.engines.rating_epoch)
+        4. notify        one bulk season.ended achievement event
         """
         # 1. Fetch the season
         result = await self.db.execute(select(Season).where(Season.id == season_id))
         season = result.scalar_one_or_none()
-        if not season:
+        if not season or season.status == "completed":
             return
 
-        # 2. Mark season as completed
-        season.status = "completed"
-        season.is_active = False
+        # 2. Mark season as closing
+        if season.status != "closing":
+            season.status = "closing"
+            season.is_active = False
+            season.close_phase = "participants"
+            season.close_cursor = None
+            await self.db.commit()
+
+        chunk_size = settings.SEASON_CLOSE_CHUNK_SIZE
 
         # 3. Archive all active users as participants
-        users_result = await self.db.execute(select(User).where(User.is_active == True))
-        users = users_result.scalars().all()
-
-        for user in users:
-            participant = SeasonParticipant(
-                season_id=season_id,
-                user_id=user.id,
-                final_rating=user.classical_rating,
-                final_rd=user.classical_rd,
-                final_tier=user.league_tier,
-                # Initial rank can be calculated later or set here if desired
+        if season.close_phase == "participants":
+            while await self._advance(season, chunk_size, self._archive_chunk):
+                pass
+            await self._next_phase(season, "rank")
+
+        # 4. Final ranks over the frozen snapshot
+        if season.close_phase == "rank":
+            last = await self._last_ranked(season)
+            while last is not None:
+                last = await self._rank_chunk(season, chunk_size, last)
+            await self._next_phase(season, "reset")
+
+        # 5. Soft Reset Ratings: every rating from before this epoch is now reset on access
+        if season.close_phase == "reset":
+            season.reset_epoch = (await self.db.execute(select(current_epoch_query()))).scalar_one() + 1
+            await self._next_phase(season, "notify")
+            await leaderboard.rebuild(self.db)
+
+        # 6. Trigger Achievement: season.ended for all participants
+        if season.close_phase == "notify":
+            await self._notify_participants(season, chunk_size)
+            season.status = "completed"
+            season.close_phase = None
+            season.close_cursor = None
+            await self.db.commit()
+
+    async def _advance(self, season: Season, chunk_size: int, apply) -> bool:
+        """Apply one chunk after the cursor and commit it with the new cursor; False when done."""
+        upper = await self._chunk_end(season.close_cursor, chunk_size)
+        await apply(season, season.close_cursor, upper)
+        season.close_cursor = upper
+        await self.db.commit()
+        return upper is not None
+
+    async def _chunk_end(self, cursor: Optional[str], chunk_size: int) -> Optional[str]:
+        """Last users.id of the next chunk, or None when the rest fits in one chunk."""
+        query = select(User.id).where(User.is_active == True)
+        if cursor is not None:
+            query = query.where(User.id > cursor)
+        result = await self.db.execute(query.order_by(User.id).offset(chunk_size - 1).limit(1))
+        return result.scalar_one_or_none()
+
+    def _in_chunk(self, column, lower: Optional[str], upper: Optional[str]):
+        conditions = []
+        if lower is not None:
+            conditions.append(column > lower)
+        if upper is not None:
+            conditions.append(column <= upper)
+        return conditions
+
+    async def _archive_chunk(self, season: Season, lower: Optional[str], upper: Optional[str]):
+        snapshot = select(
+            sql_uuid(),
+            literal(season.id),
+            User.id,
+            # Users who sat out earlier seasons still carry a pending reset
+            effective_rating(current_epoch_query()),
+            effective_rd(current_epoch_query()),
+            User.league_tier,
+        ).where(
+            User.is_active == True,
+            *self._in_chunk(User.id, lower, upper),
+            # A chunk retried after a crash between its insert and commit is not archived twice
+            ~exists().where(SeasonParticipant.season_id == season.id, SeasonParticipant.user_id == User.id),
+        )
+        await self.db.execute(
+            insert(SeasonParticipant).from_select(
+                ["id", "season_id", "user_id", "final_rating", "final_rd", "final_tier"], snapshot
             )
-            self.db.add(participant)
+        )
 
-            # 4. Soft Reset Ratings
-            # new_rating = floor + (old - floor) * 0.6
-            floor = TIER_THRESHOLDS.get(user.league_tier.lower(), 0.0)
-            new_rating = floor + (user.classical_rating - floor) * 0.6
-            
-            user.classical_rating = new_rating
-            # Rating deviation (RD) is reset to a higher value for the new season
-            user.classical_rd = 350.0  # Resetting to default for fresh assessment
+    async def _last_ranked(self, season: Season) -> Tuple[Optional[float], int, int]:
+        """
+        (rating, rank, position) of the last participant ranked, from the
+        rank phase's cursor; (None, 0, 0) before the first chunk.
+        """
+        if season.close_cursor is None:
+            return None, 0, 0
+        result = await self.db.execute(
+            select(SeasonParticipant.final_rating, SeasonParticipant.final_rank)
+            .where(SeasonParticipant.id == season.close_cursor)
+        )
+        rating, rank = result.one()
+        # Everyone ahead of the cursor: those rated higher, plus its ties up to it
+        tied = await self.db.execute(
+            select(func.count()).where(
+                SeasonParticipant.season_id == season.id,
+                SeasonParticipant.final_rating == rating,
+                SeasonParticipant.id <= season.close_cursor,
+            )
+        )
+        return rating, rank, rank - 1 + tied.scalar_one()
+
+    async def _rank_chunk(
+        self, season: Season, chunk_size: int, last: Tuple[Optional[float], int, int]
+    ) -> Optional[Tuple[Optional[float], int, int]]:
+        """
+        Rank the next chunk in (final_rating desc, id) order and commit it
+        with the cursor; returns the new (rating, rank, position), or None
+        when done.
+        """
+        rating, rank, position = last
+        query = select(SeasonParticipant.id, SeasonParticipant.final_rating).where(
+            SeasonParticipant.season_id == season.id
+        )
+        if season.close_cursor is not None:
+            query = query.where(or_(
+                SeasonParticipant.final_rating < rating,
+                and_(SeasonParticipant.final_rating == rating, SeasonParticipant.id > season.close_cursor),
+            ))
+        result = await self.db.execute(
+            query.order_by(SeasonParticipant.final_rating.desc(), SeasonParticipant.id).limit(chunk_size)
+        )
+        rows = result.all()
+        if not rows:
+            return None
 
+        ranks = []
+        for participant_id, participant_rating in rows:
+            position += 1
+            if participant_rating != rating:
+                rating, rank = participant_rating, position
+            ranks.append({"id": participant_id, "final_rank": rank})
+        await self.db.execute(update(SeasonParticipant), ranks)
+        season.close_cursor = rows[-1].id
         await self.db.commit()
+        return (rating, rank, position) if len(rows) == chunk_size else None
 
-        # 5. Trigger Achievement: season.ended for all participants
-        for user in users:
-            try:
-                process_achievement_event_task.delay("season.ended", {
-                    "user_id": user.id,
-                    "season_id": season_id,
-                    "season_slug": season.slug
-                })
-            except Exception as e:
-                print(f"⚠️ Failed to enqueue season achievement for user {user.id}: {e}")
+    async def _next_phase(self, season: Season, phase: str):
+        season.close_phase = phase
+        season.close_cursor = None
+        await self.db.commit()
+
+    async def _notify_participants(self, season: Season, chunk_size: int):
+        """One bulk season.ended event covering every participant, as user id ranges."""
+        ranges = []
+        lower = None
+        while True:
+            query = select(SeasonParticipant.user_id).where(SeasonParticipant.season_id == season.id)
+            if lower is not None:
+                query = query.where(SeasonParticipant.user_id > lower)
+            result = await self.db.execute(query.order_by(SeasonParticipant.user_id).offset(chunk_size - 1).limit(1))
+            upper = result.scalar_one_or_none()
+            ranges.append([lower, upper])
+            if upper is None:
+                break
+            lower = upper
+
+        try:
+            process_achievement_event_task.delay("season.ended", {
+                "season_id": season.id,
+                "season_slug": season.slug,
+                "user_ranges": ranges,
+            })
+        except Exception as e:
+            print(f"⚠️ Failed to enqueue season achievements for season {season.id}: {e}")
+
+    async def sweep_pending_resets(self, chunk_size: int = None) -> int:
+        """
+        Background sweeper: write pending soft resets of users who have not
+        been read or rated since a season closed, one committed chunk at a
+        time. Optional; lazy resets give the same values. Returns users swept.
+        """
+        chunk_size = chunk_size or settings.SEASON_CLOSE_CHUNK_SIZE
+        epoch = (await self.db.execute(select(current_epoch_query()))).scalar_one()
+        swept = 0
+        while True:
+            chunk = (
+                select(User.id)
+                .where(User.rating_epoch < epoch)
+                .order_by(User.id)
+                .limit(chunk_size)
+                .scalar_subquery()
+            )
+            result = await self.db.execute(
+                update(User)
+                .where(User.id.in_(chunk))
+                .values(
+                    classical_rating=effective_rating(epoch),
+                    # Rating deviation (RD) is reset to a higher value for the new season
+                    classical_rd=effective_rd(epoch),
+                    rating_epoch=epoch,
+                    rating_version=User.rating_version + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+            swept += result.rowcount
+            if result.rowcount < chunk_size:
+                return swept
 
     def get_tier_floor(self, tier: str) -> float:
         return TIER_THRESHOLDS.get(tier.lower(), 0.0)
@@ -5,13 +5,21 @@ Main application factory with middleware, routes, and health check.
 """
 
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from jose import JWTError
 
 from app.api.v1.router import router as v1_router
 from app.core.config import get_settings
+from app.core.database import async_session_maker
+from app.core.security import decode_access_token
 from app.core.websocket import manager
+from app.core.task_supervisor import task_supervisor
+from app.engines.leaderboard import leaderboard
+from app.services.ai_client import ai_breaker, close_http_client
+from app.services.analysis_queue import analysis_queue
 
 settings = get_settings()
 
@@ -21,9 +29,21 @@ async def lifespan(app: FastAPI):
     """Application lifecycle: startup and shutdown hooks."""
     # ─── Startup ───────────────────────────────────────────────────
     print(f"KamiCode API starting in {settings.ENVIRONMENT} mode")
+    analysis_queue.start()
+    await task_supervisor.replay()
+    try:
+        async with async_session_maker() as db:
+            await leaderboard.ensure_loaded(db)
+    except Exception as e:
+        # Queries retry the load, so a cold database must not block startup
+        print(f"⚠️ Leaderboard not loaded at startup: {e}")
     yield
     # ─── Shutdown ──────────────────────────────────────────────────
     print("KamiCode API shutting down")
+    await analysis_queue.stop()
+    # Analyses emit achievement events, so drain background tasks after the queue
+    await task_supervisor.drain()
+    await close_http_client()
 
 
 def create_app() -> FastAPI:
@@ -59,15 +79,25 @@ def create_app() -> FastAPI:
         description="Returns the current health status of the API.",
     )
     async def health_check():
+        ai_provider = ai_breaker.snapshot()
         return {
-            "status": "ok",
+            # The API keeps serving local fallbacks while the AI provider is down
+            "status": "degraded" if ai_provider["state"] == "open" else "ok",
             "version": settings.APP_VERSION,
             "environment": settings.ENVIRONMENT,
+            "ai_provider": ai_provider,
         }
 
     @application.websocket("/ws")
-    async def websocket_endpoint(websocket: WebSocket):
-        await manager.connect(websocket)
+    async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
+        # A valid ?token= subscribes the socket to the user's own events (e.g. streamed analyses)
+        user_id = None
+        if token:
+            try:
+                user_id = decode_access_token(token).get("sub")
+            except JWTError:
+                pass
+        await manager.connect(websocket, user_id)
         try:
             while True:
                 await websocket.receive_text()
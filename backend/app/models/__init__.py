@@ -2,9 +2,13 @@ from app.models.base import Base
 from app.models.user import User
 from app.models.problem import Problem
 from app.models.submission import Submission
-from app.models.ai_analysis import AIAnalysis
+from app.models.ai_analysis import AIAnalysis, QualityScoreCount
 from app.models.rating_history import RatingHistory
 from app.models.season import Season, SeasonParticipant
 from app.models.achievement import UserAchievement
+from app.models.problem_stats import ProblemStatsSketch, ProblemSolveStats
+from app.models.problem_candidate import ProblemCandidate
+from app.models.rating_period import RatingPeriod
+from app.models.user_streak import UserStreak
 
 __all__ = ["Base", "User", "Problem", "Submission", "AIAnalysis", "RatingHistory"]
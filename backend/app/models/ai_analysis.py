@@ -26,7 +26,24 @@ class AIAnalysis(TimestampMixin, Base):
     time_complexity: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     space_complexity: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     approach_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-    quality_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 0-100
+    quality_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Share of scored analyses with a lower quality score when this one was scored, 0-100
+    quality_percentile: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     feedback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     percentile_rank: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     model_used: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+
+    # Normalized code hash; set only for real model output so the cache never replays fallbacks
+    code_fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+
+
+class QualityScoreCount(Base):
+    """
+    Number of analyses per quality score. At most 101 rows (scores are
+    0-100), so a quality percentile is a sum over this table rather than
+    a count over every analysis.
+    """
+    __tablename__ = "quality_score_counts"
+
+    score: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -6,8 +6,10 @@ All ORM models inherit from this base.
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.sql.expression import FunctionElement
 
 
 class Base(DeclarativeBase):
@@ -31,3 +33,23 @@ class TimestampMixin:
         onupdate=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
+
+
+class sql_uuid(FunctionElement):
+    """A UUID4 string generated by the database, for set-based INSERT ... SELECT."""
+
+    type = String(36)
+    inherit_cache = True
+
+
+@compiles(sql_uuid, "postgresql")
+def _sql_uuid_postgresql(element, compiler, **kw):
+    return "gen_random_uuid()::text"
+
+
+@compiles(sql_uuid, "sqlite")
+def _sql_uuid_sqlite(element, compiler, **kw):
+    return (
+        "lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || substr(hex(randomblob(2)), 2) || '-' || "
+        "substr('89ab', 1 + (abs(random()) % 4), 1) || substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6)))"
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import String, Text, Date, JSON
+from sqlalchemy import String, Text, Date, DateTime, Float, Integer, JSON
 from sqlalchemy.orm import Mapped, mapped_column
 from typing import Optional, List
+from datetime import datetime
 import uuid
 
 from app.models.base import Base, TimestampMixin
@@ -31,3 +32,11 @@ class Problem(TimestampMixin, Base):
     
     generated_by: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     daily_date: Mapped[Optional[str]] = mapped_column(Date, nullable=True, unique=True)
+
+    # Glicko-2 rating of the problem as an opponent, fitted in batch from its
+    # solve/fail history; unset until fitted (the difficulty prior is used)
+    rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rating_rd: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rating_volatility: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rating_attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    rating_fitted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
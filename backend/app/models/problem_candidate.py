@@ -0,0 +1,41 @@
+from sqlalchemy import String, Text, Integer, ForeignKey, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+import uuid
+
+from app.models.base import Base, TimestampMixin
+
+def generate_uuid() -> str:
+    return str(uuid.uuid4())
+
+class ProblemCandidate(TimestampMixin, Base):
+    """
+    A pre-generated daily problem waiting in the buffer. Candidates are
+    validated by running the reference solution against every test case;
+    the oldest validated one is installed as the next daily problem.
+    """
+    __tablename__ = "problem_candidates"
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=generate_uuid,
+    )
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    slug: Mapped[str] = mapped_column(String(200), nullable=False)
+    difficulty: Mapped[str] = mapped_column(String(10), nullable=False)
+
+    # ProblemCreate fields as generated (title, slug, description, test_cases, ...)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    reference_solution: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    reference_language: Mapped[str] = mapped_column(String(20), default="python")
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False, index=True)  # validated, rejected, installed
+    validation_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    reference_runtime_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    installed_problem_id: Mapped[Optional[str]] = mapped_column(
+        String(36),
+        ForeignKey("problems.id"),
+        nullable=True
+    )
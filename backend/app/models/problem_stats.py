@@ -0,0 +1,50 @@
+from sqlalchemy import String, Integer, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from datetime import datetime
+import uuid
+
+from app.models.base import Base, TimestampMixin
+
+def generate_uuid() -> str:
+    return str(uuid.uuid4())
+
+class ProblemStatsSketch(TimestampMixin, Base):
+    """
+    Serialized KLL quantile sketches of accepted runtimes and memory
+    for one problem/language pair.
+    """
+    __tablename__ = "problem_stats_sketches"
+    __table_args__ = (UniqueConstraint("problem_id", "language"),)
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=generate_uuid,
+    )
+    problem_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("problems.id"),
+        nullable=False,
+        index=True
+    )
+    language: Mapped[str] = mapped_column(String(20), nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # { "k": 200, "n": <items seen>, "c": [[level-0 items], [level-1 items], ...] }
+    runtime_sketch: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    memory_sketch: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+
+
+class ProblemSolveStats(TimestampMixin, Base):
+    """
+    Running solve counters for one problem. The first solver is claimed by
+    the first accepted submission's conditional update and never changes.
+    """
+    __tablename__ = "problem_solve_stats"
+
+    problem_id: Mapped[str] = mapped_column(String(36), ForeignKey("problems.id"), primary_key=True)
+    accepted_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    first_solver_id: Mapped[Optional[str]] = mapped_column(String(36), ForeignKey("users.id"), nullable=True)
+    first_submission_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+    first_solved_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
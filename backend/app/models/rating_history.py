@@ -27,7 +27,8 @@ class RatingHistory(TimestampMixin, Base):
     submission_id: Mapped[Optional[str]] = mapped_column(
         String(36),
         ForeignKey("submissions.id"),
-        nullable=True
+        nullable=True,
+        index=True
     )
     
     old_rating: Mapped[float] = mapped_column(Float, nullable=False)
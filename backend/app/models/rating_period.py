@@ -0,0 +1,31 @@
+from sqlalchemy import String, Integer, DateTime, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime
+import uuid
+
+from app.models.base import Base, TimestampMixin
+
+def generate_uuid() -> str:
+    return str(uuid.uuid4())
+
+class RatingPeriod(TimestampMixin, Base):
+    """
+    A closed Glicko-2 rating period. Every submission made in
+    [starts_at, ends_at) was rated in one batch update when it closed.
+    """
+    __tablename__ = "rating_periods"
+    __table_args__ = (
+        UniqueConstraint("context", "ends_at", name="uq_rating_period_context_end"),
+    )
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=generate_uuid,
+    )
+    context: Mapped[str] = mapped_column(String(20), default="classical")
+    starts_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    ends_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    users_rated: Mapped[int] = mapped_column(Integer, default=0)
+    games: Mapped[int] = mapped_column(Integer, default=0)
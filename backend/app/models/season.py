@@ -1,4 +1,4 @@
-from sqlalchemy import String, DateTime, Boolean, Float, ForeignKey, Integer
+from sqlalchemy import String, DateTime, Boolean, Float, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, List
 from datetime import datetime
@@ -25,7 +25,14 @@ class Season(TimestampMixin, Base):
     end_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     
     is_active: Mapped[bool] = mapped_column(Boolean, default=False)
-    status: Mapped[str] = mapped_column(String(20), default="upcoming")  # upcoming, active, completed
+    status: Mapped[str] = mapped_column(String(20), default="upcoming")  # upcoming, active, closing, completed
+
+    # Set when the season closes; users on an older epoch are soft-reset lazily
+    reset_epoch: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, unique=True)
+
+    # Progress of a chunked season close, so a crashed close resumes where it stopped
+    close_phase: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    close_cursor: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)  # last users.id (participant id when ranking) done
     
     # Relationships
     participants: Mapped[List["SeasonParticipant"]] = relationship(back_populates="season")
@@ -35,6 +42,11 @@ class SeasonParticipant(TimestampMixin, Base):
     Archived performance of a user at the end of a season.
     """
     __tablename__ = "season_participants"
+    __table_args__ = (
+        UniqueConstraint("season_id", "user_id", name="uq_season_participant"),
+        # The close's rank phase walks a season best first
+        Index("ix_season_participants_rank_order", "season_id", "final_rating", "id"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36),
@@ -6,10 +6,11 @@ Core user entity with ratings, league tier, and wallet support.
 
 import uuid
 
-from sqlalchemy import Boolean, Integer, String, Float
+from sqlalchemy import Boolean, Index, Integer, String, Float, func, select, false as sa_false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
+from app.models.season import Season
 
 
 def generate_uuid() -> str:
@@ -21,6 +22,8 @@ class User(TimestampMixin, Base):
     """Represents a registered KamiCode user."""
 
     __tablename__ = "users"
+    # Local leaderboards poll max(updated_at) for rating writes from other processes
+    __table_args__ = (Index("ix_users_updated_at", "updated_at"),)
 
     id: Mapped[str] = mapped_column(
         String(36),
@@ -50,8 +53,21 @@ class User(TimestampMixin, Base):
     
     league_tier: Mapped[str] = mapped_column(String(20), default="bronze")
 
+    # Bumped on every rating write; updates compare-and-swap on it
+    rating_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # Season reset epoch the rating belongs to; new users start in the current one
+    rating_epoch: Mapped[int] = mapped_column(
+        Integer,
+        default=select(func.coalesce(func.max(Season.reset_epoch), 0)).scalar_subquery(),
+        server_default="0",
+        nullable=False,
+        index=True,
+    )
+
     # ─── Account Status ────────────────────────────────────────────
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Grants the /admin routes; set by hand, never through the API
+    is_admin: Mapped[bool] = mapped_column(Boolean, default=False, server_default=sa_false(), nullable=False)
 
     # ─── Relationships (populated in later phases) ─────────────────
     # submissions = relationship("Submission", back_populates="user", lazy="selectin")
@@ -0,0 +1,18 @@
+from sqlalchemy import String, Integer, Date, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date
+from typing import Optional
+
+from app.models.base import Base, TimestampMixin
+
+class UserStreak(TimestampMixin, Base):
+    """
+    Daily challenge streak of one user, kept up to date as accepted daily
+    submissions arrive. Days are calendar days in STREAK_TIMEZONE.
+    """
+    __tablename__ = "user_streaks"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), primary_key=True)
+    current_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    longest_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_active_day: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
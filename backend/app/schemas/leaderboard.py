@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class LeaderboardEntryResponse(BaseModel):
+    rank: int
+    user_id: str
+    username: str
+    rating: float
+    league_tier: str
+
+class LeaderboardPage(BaseModel):
+    total: int
+    entries: List[LeaderboardEntryResponse]
+
+class LeaderboardPosition(BaseModel):
+    rank: Optional[int] = None  # None until the user is on the board
+    total: int
+    neighbours: List[LeaderboardEntryResponse]
@@ -71,3 +71,20 @@ class ProblemListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class QuantileSummary(BaseModel):
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+
+class LanguageStats(BaseModel):
+    language: str  # "all" for the merged view across languages
+    sample_count: int
+    runtime_ms: QuantileSummary
+    memory_kb: QuantileSummary
+
+class ProblemStatsResponse(BaseModel):
+    problem_id: str
+    slug: str
+    overall: LanguageStats
+    languages: List[LanguageStats]
@@ -1,14 +1,30 @@
 import json
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import Optional
+from sqlalchemy import case, func, select
+from typing import Optional, Tuple
 
-from app.models.ai_analysis import AIAnalysis
+from app.models.ai_analysis import AIAnalysis, QualityScoreCount
 from app.models.submission import Submission
 from app.models.problem import Problem
 from app.services.ai_client import AIClient
+from app.services.code_fingerprint import fingerprint_code
+from app.services.complexity_estimator import ComplexityEstimate, estimate_complexity
+from app.core.config import get_settings
+from app.core.database import upsert
+from app.core.websocket import manager
+from app.engines.runtime_distribution import runtime_distributions
 from app.engines.achievement_tasks import process_achievement_event_task
 
+settings = get_settings()
+
+# Analysis fields that depend only on the code, not on the individual run
+_CACHED_FIELDS = ("time_complexity", "space_complexity", "approach_name", "quality_score", "feedback")
+
+# model_used value for analyses produced by the local static estimator
+LOCAL_MODEL = "local-static"
+# model_used when the complexity is the local estimate and the review came from the model
+REVIEW_MODEL = "local-static+gpt-4o-mini"
+
 class AIAnalysisService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -34,12 +50,151 @@ class AIAnalysisService:
             print(f"⏩ Skipping analysis for non-accepted submission {submission_id}")
             return None
 
-        # 2. Prepare AI Prompt
-        system_prompt = (
-            "You are a Senior Software Engineer and Competitive Programmer. "
-            "Analyze the provided code for time/space complexity and code quality. "
-            "Return a JSON object with: time_complexity, space_complexity, approach_name, quality_score (0-100), and feedback."
+        # A model (or cached) analysis is final; a local estimate may be refined
+        analysis = await self.get_analysis_by_submission(submission_id)
+        if analysis and analysis.model_used != LOCAL_MODEL:
+            return analysis
+
+        # 2. Reuse the analysis of an equivalent earlier solution, else ask the
+        # model; a confident local estimate settles the complexity, so the model
+        # is only asked to review quality
+        estimate = estimate_complexity(submission.code, submission.language)
+        code_fingerprint = fingerprint_code(submission.code, submission.language)
+        cached = await self.find_cached_analysis(problem.id, code_fingerprint)
+        if cached:
+            print(f"♻️ Reusing cached analysis for submission {submission_id}")
+            analysis_data = {field: getattr(cached, field) for field in _CACHED_FIELDS}
+            model_used = cached.model_used
+            from_model = True
+        elif estimate and not self.ai_client.client:
+            if analysis:
+                return analysis  # Without a model the stored local estimate is final
+            analysis_data = estimate.as_analysis()
+            model_used = LOCAL_MODEL
+            from_model = False
+        else:
+            review_only = bool(estimate) and self._trusts_estimate(estimate)
+            analysis_data, from_model = await self._request_analysis(submission, problem, estimate, review_only)
+            if from_model:
+                model_used = REVIEW_MODEL if review_only else "gpt-4o-mini"
+            else:
+                model_used = LOCAL_MODEL if estimate else "Mock"
+
+        # 3. Calculate Percentile Rank among accepted solutions
+        percentile = await self.calculate_percentile(problem.id, submission.runtime_ms, submission.language)
+
+        # 4. Save to DB (refining the local estimate row if there is one)
+        if analysis is None:
+            analysis = AIAnalysis(submission_id=submission_id)
+            self.db.add(analysis)
+        for field in _CACHED_FIELDS:
+            setattr(analysis, field, analysis_data.get(field))
+        analysis.percentile_rank = percentile
+        analysis.model_used = model_used
+        # Ranked once, against every score recorded before it
+        if analysis.quality_score is not None:
+            analysis.quality_percentile = await self.record_quality_score(analysis.quality_score)
+        # Only real model output is fingerprinted, so estimates/fallbacks are never replayed
+        analysis.code_fingerprint = code_fingerprint if from_model else None
+
+        # Link submission to analysis (flush first so the id is assigned)
+        await self.db.flush()
+        submission.ai_analysis_id = analysis.id
+        
+        await self.db.commit()
+        await self.db.refresh(analysis)
+
+        await self._notify(submission, "ANALYSIS_COMPLETE", {
+            **{field: getattr(analysis, field) for field in _CACHED_FIELDS},
+            "percentile_rank": analysis.percentile_rank,
+            "model_used": analysis.model_used,
+        })
+        
+        # 5. Trigger Achievement: submission.analyzed
+        self._emit_analyzed(submission, analysis)
+        
+        return analysis
+
+    async def record_local_estimate(self, submission: Submission) -> bool:
+        """
+        Store a static-analysis estimate for a freshly accepted submission so
+        an analysis is available within milliseconds. Returns True when the
+        model should still be asked for it: the quality score and feedback
+        only come from the model, so that is whenever one is configured.
+        """
+        estimate = estimate_complexity(submission.code, submission.language)
+        if estimate is None:
+            return True
+
+        percentile = await self.calculate_percentile(
+            submission.problem_id, submission.runtime_ms, submission.language
         )
+        analysis = AIAnalysis(
+            submission_id=submission.id,
+            percentile_rank=percentile,
+            model_used=LOCAL_MODEL,
+            **{field: value for field, value in estimate.as_analysis().items()},
+        )
+        async with self.db.begin_nested():
+            self.db.add(analysis)
+            await self.db.flush()
+            submission.ai_analysis_id = analysis.id
+        await self.db.commit()
+
+        if self.ai_client.client:
+            return True
+        self._emit_analyzed(submission, analysis)
+        return False
+
+    def _trusts_estimate(self, estimate: ComplexityEstimate) -> bool:
+        return estimate.confidence >= settings.AI_LOCAL_CONFIDENCE_THRESHOLD
+
+    async def _notify(self, submission: Submission, message_type: str, data: dict):
+        """Push an analysis update to the submitter's websocket(s), if connected."""
+        await manager.send_to_user(submission.user_id, {
+            "type": message_type,
+            "data": {"submission_id": submission.id, **data},
+        })
+
+    def _emit_analyzed(self, submission: Submission, analysis: AIAnalysis):
+        try:
+            process_achievement_event_task.delay("submission.analyzed", {
+                "user_id": submission.user_id,
+                "submission_id": submission.id,
+                "analysis_id": analysis.id,
+                "quality_score": analysis.quality_score,
+                "percentile": analysis.percentile_rank
+            })
+        except Exception as e:
+            print(f"⚠️ Failed to enqueue analysis achievement: {e}")
+
+    async def _request_analysis(
+        self,
+        submission: Submission,
+        problem: Problem,
+        estimate: Optional[ComplexityEstimate] = None,
+        review_only: bool = False,
+    ) -> Tuple[dict, bool]:
+        """
+        Ask the model for an analysis. Returns (analysis_data, from_model);
+        from_model is False when the local estimate or mock data was used instead.
+        With review_only the complexity is taken from the estimate and the
+        model only reviews the code (approach, quality score, feedback).
+        """
+        # Prepare AI Prompt
+        if review_only:
+            system_prompt = (
+                "You are a Senior Software Engineer and Competitive Programmer. "
+                f"The provided code runs in {estimate.time_complexity} time and {estimate.space_complexity} space. "
+                "Review its code quality. "
+                "Return a JSON object with: approach_name, quality_score (0-100), and feedback."
+            )
+        else:
+            system_prompt = (
+                "You are a Senior Software Engineer and Competitive Programmer. "
+                "Analyze the provided code for time/space complexity and code quality. "
+                "Return a JSON object with: time_complexity, space_complexity, approach_name, quality_score (0-100), and feedback."
+            )
         
         user_prompt = f"""
 Problem: {problem.title}
@@ -53,10 +208,13 @@ Execution Context:
 Runtime: {submission.runtime_ms}ms
 """
 
-        # 3. Call AI (with fallback handled in AIClient)
-        print(f"🤖 Analyzing submission {submission_id}...")
+        # Call AI (with fallback handled in AIClient)
+        print(f"🤖 Analyzing submission {submission.id}...")
         
-        # We manually handle the mock logic here if we want more specific mock data for analysis
+        # Without the model, the local estimate is the best answer we have
+        if not self.ai_client.client and estimate:
+            print("⚠️ Using local static estimate (no API key)...")
+            return estimate.as_analysis(), False
         if not self.ai_client.client:
             print("⚠️ Using mock analysis result (no API key)...")
             analysis_data = {
@@ -68,9 +226,30 @@ Runtime: {submission.runtime_ms}ms
             }
         else:
             try:
-                json_str = await self.ai_client.generate_json(system_prompt, user_prompt)
+                if settings.AI_STREAM_ANALYSIS:
+                    # Forward each field to the submitter as soon as the model finishes it
+                    async def forward(key, value):
+                        await self._notify(submission, "ANALYSIS_PARTIAL", {"field": key, "value": value})
+
+                    json_str = await self.ai_client.generate_json_stream(
+                        system_prompt, user_prompt, forward, deadline=settings.AI_ANALYSIS_DEADLINE
+                    )
+                else:
+                    json_str = await self.ai_client.generate_json(
+                        system_prompt, user_prompt, deadline=settings.AI_ANALYSIS_DEADLINE
+                    )
                 analysis_data = json.loads(json_str)
+                if review_only:
+                    analysis_data = {
+                        **analysis_data,
+                        "time_complexity": estimate.time_complexity,
+                        "space_complexity": estimate.space_complexity,
+                    }
+                return analysis_data, True
             except Exception as e:
+                if estimate:
+                    print(f"⚠️ AI analysis failed ({e}), keeping local static estimate...")
+                    return estimate.as_analysis(), False
                 print(f"⚠️ AI analysis failed ({e}), using mock fallback...")
                 analysis_data = {
                     "time_complexity": "O(n)",
@@ -80,72 +259,54 @@ Runtime: {submission.runtime_ms}ms
                     "feedback": "Code executed successfully. AI review is temporarily unavailable."
                 }
 
-        # 4. Calculate Percentile Rank (Simple mock logic for now, or real if we have enough data)
-        # For now, let's just use a random rank or 0.5 to keep it simple, 
-        # but the plan mentions calculating it among accepted solutions.
-        percentile = await self.calculate_percentile(problem.id, submission.runtime_ms)
+        return analysis_data, False
 
-        # 5. Save to DB
-        analysis = AIAnalysis(
-            submission_id=submission_id,
-            time_complexity=analysis_data.get("time_complexity"),
-            space_complexity=analysis_data.get("space_complexity"),
-            approach_name=analysis_data.get("approach_name"),
-            quality_score=analysis_data.get("quality_score"),
-            feedback=analysis_data.get("feedback"),
-            percentile_rank=percentile,
-            model_used="Mock" if not self.ai_client.client else "gpt-4o-mini"
+    async def find_cached_analysis(self, problem_id: str, code_fingerprint: str) -> Optional[AIAnalysis]:
+        """
+        Find an earlier model analysis of equivalent code for the same problem.
+        """
+        result = await self.db.execute(
+            select(AIAnalysis)
+            .join(Submission, AIAnalysis.submission_id == Submission.id)
+            .where(
+                AIAnalysis.code_fingerprint == code_fingerprint,
+                Submission.problem_id == problem_id
+            )
+            .limit(1)
         )
-        
-        self.db.add(analysis)
-        
-        # Link submission to analysis
-        submission.ai_analysis_id = analysis.id
-        
-        await self.db.commit()
-        await self.db.refresh(analysis)
-        
-        # 6. Trigger Achievement: submission.analyzed
-        try:
-            process_achievement_event_task.delay("submission.analyzed", {
-                "user_id": submission.user_id,
-                "submission_id": submission_id,
-                "analysis_id": analysis.id,
-                "quality_score": analysis.quality_score,
-                "percentile": analysis.percentile_rank
-            })
-        except Exception as e:
-            print(f"⚠️ Failed to enqueue analysis achievement: {e}")
-        
-        return analysis
+        return result.scalar_one_or_none()
+
+    async def calculate_percentile(
+        self, problem_id: str, runtime_ms: int, language: Optional[str] = None
+    ) -> float:
+        """
+        Calculate the runtime percentile for an accepted solution among
+        solutions in the same language (all languages if none is given).
+        Served from the in-memory runtime distribution (binary search).
+        """
+        return await runtime_distributions.percentile(self.db, problem_id, runtime_ms, language)
 
-    async def calculate_percentile(self, problem_id: str, runtime_ms: int) -> float:
+    async def record_quality_score(self, score: int) -> float:
         """
-        Calculate the runtime percentile for an accepted solution.
+        Count a quality score into the score histogram and return its
+        percentile: the share of all scored analyses (this one included)
+        with a strictly lower score, as 0-100.
         """
-        # Count total accepted submissions for this problem
-        total_result = await self.db.execute(
-            select(func.count(Submission.id))
-            .where(Submission.problem_id == problem_id, Submission.verdict == "accepted")
+        await upsert(
+            self.db,
+            QualityScoreCount,
+            {"score": score, "count": 1},
+            conflict=["score"],
+            update={"count": QualityScoreCount.count + 1},
         )
-        total_count = total_result.scalar() or 0
-        
-        if total_count <= 1:
-            return 100.0  # Top 100% if only one submission
-            
-        # Count submissions with strictly greater runtime
-        slower_result = await self.db.execute(
-            select(func.count(Submission.id))
-            .where(
-                Submission.problem_id == problem_id, 
-                Submission.verdict == "accepted",
-                Submission.runtime_ms > runtime_ms
+        result = await self.db.execute(
+            select(
+                func.sum(case((QualityScoreCount.score < score, QualityScoreCount.count), else_=0)),
+                func.sum(QualityScoreCount.count),
             )
         )
-        slower_count = slower_result.scalar() or 0
-        
-        # Percentile = (slower_count / (total_count - 1)) * 100
-        return (slower_count / total_count) * 100.0
+        lower, total = result.one()
+        return (lower / total) * 100.0
 
     async def get_analysis_by_submission(self, submission_id: str) -> Optional[AIAnalysis]:
         result = await self.db.execute(select(AIAnalysis).where(AIAnalysis.submission_id == submission_id))
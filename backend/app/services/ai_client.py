@@ -2,15 +2,33 @@
 AIClient – wraps the Gemini API using a direct httpx call so we can apply
 strict per-phase timeouts (connect / read / write / pool) that actually fire
 even when the remote host is unreachable.
+
+All calls share one pooled keep-alive client (HTTP/2 when `h2` is installed),
+so the TCP+TLS handshake is paid once per connection instead of per call.
+Live calls are paced by a token bucket against AI_REQUESTS_PER_MINUTE and
+retried with exponential backoff on 429/5xx. generate_json_stream uses the
+SSE streaming mode and reports each top-level field as soon as it is complete.
+
+Every live call goes through a circuit breaker (ai_breaker) and a
+per-caller deadline; while the breaker is open calls raise CircuitOpenError
+at once so callers can serve their local fallback instead of waiting. The
+deadline and the breaker's latency only count time spent on HTTP attempts:
+pacing waits (token bucket, Retry-After/backoff sleeps) run off the clock.
 """
 
+import asyncio
 import json
+import random
 import re
 import time
+from typing import Any, Awaitable, Callable, Optional
 
 import httpx
 
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
 from app.core.config import get_settings
+from app.core.rate_limit import TokenBucket
+from app.services.incremental_json import IncrementalJSONParser
 
 settings = get_settings()
 
@@ -19,6 +37,102 @@ _TIMEOUT = httpx.Timeout(connect=5.0, read=25.0, write=10.0, pool=5.0)
 
 _PLACEHOLDER_PREFIXES = ("sk-your-", "your-", "YOUR_")
 
+# Statuses worth retrying: rate limited or a transient provider failure
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Every live call (analysis and problem generation) shares the provider's RPM budget
+ai_rate_limiter = TokenBucket.per_minute(settings.AI_REQUESTS_PER_MINUTE)
+
+# Shared by all AIClient instances; its state is reported by /health
+ai_breaker = CircuitBreaker(
+    "ai-provider",
+    failure_rate=settings.AI_BREAKER_FAILURE_RATE,
+    window=settings.AI_BREAKER_WINDOW,
+    min_calls=settings.AI_BREAKER_MIN_CALLS,
+    slow_call_seconds=settings.AI_BREAKER_SLOW_CALL_SECONDS,
+    open_seconds=settings.AI_BREAKER_OPEN_SECONDS,
+)
+
+# Called with (key, value) for each top-level field of a streamed JSON response
+FieldCallback = Callable[[str, Any], Awaitable[None]]
+
+# Shared pooled client and the event loop it is bound to
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        timeout=_TIMEOUT,
+        limits=limits,
+        http2=settings.AI_HTTP2 and _http2_available(),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide pooled client, creating it on first use.
+
+    Connections are bound to the event loop that opened them, so code that
+    runs on a different loop (e.g. a Celery task's run_until_complete) gets
+    its own client instead of reusing sockets from another loop.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = _build_http_client()
+        _http_client_loop = loop
+    return _http_client
+
+
+class _RetryLater(Exception):
+    """A retryable provider response, with the back-off to wait before the next attempt."""
+
+    def __init__(self, status_code: int, delay: float):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.delay = delay
+
+
+def _retry_delay(attempt: int, response: httpx.Response) -> float:
+    """Honour Retry-After when the provider sends it, else exponential backoff with jitter."""
+    retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(float(retry_after), settings.AI_RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+    delay = settings.AI_RETRY_BASE_DELAY * (2 ** attempt)
+    return min(delay, settings.AI_RETRY_MAX_DELAY) * random.uniform(0.5, 1.0)
+
+
+async def close_http_client():
+    """Close the shared client (called from the FastAPI lifespan shutdown)."""
+    global _http_client, _http_client_loop
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+
+
+def _check_retry(attempt: int, response: httpx.Response):
+    """Raise _RetryLater for a 429/5xx while attempts remain; the last attempt's error is final."""
+    if response.status_code in _RETRYABLE_STATUS and attempt < settings.AI_MAX_RETRIES:
+        raise _RetryLater(response.status_code, _retry_delay(attempt, response))
+
 
 def _is_placeholder(key: str) -> bool:
     return not key or any(key.startswith(p) for p in _PLACEHOLDER_PREFIXES)
@@ -74,7 +188,13 @@ class AIClient:
     # Public API
     # ------------------------------------------------------------------
 
-    async def generate_json(self, system_prompt: str, user_prompt: str, model: str = None) -> str:
+    async def generate_json(
+        self, system_prompt: str, user_prompt: str, model: str = None, deadline: float = None
+    ) -> str:
+        """
+        Return the model's JSON answer as a string. `deadline` caps the whole
+        call in seconds, retries included (default AI_DEFAULT_DEADLINE).
+        """
         model = model or settings.AI_MODEL
 
         # ── Mock path ──────────────────────────────────────────────────
@@ -83,12 +203,122 @@ class AIClient:
             return self._mock_response(system_prompt, user_prompt)
 
         # ── Live Gemini call via httpx (enforced timeouts) ─────────────
+        payload = self._build_payload(system_prompt, user_prompt, model)
+        return await self._call_provider(lambda attempt: self._post_json(payload, attempt), deadline)
+
+    async def generate_json_stream(
+        self, system_prompt: str, user_prompt: str, on_field: FieldCallback,
+        model: str = None, deadline: float = None
+    ) -> str:
+        """
+        Like generate_json, but streams the completion over SSE and awaits
+        on_field(key, value) for each top-level JSON field as soon as it is
+        complete. Returns the full JSON string once the stream ends.
+        """
+        model = model or settings.AI_MODEL
+
+        if not self.client:
+            print(f"⚠️  GEMINI_API_KEY not configured. Returning mock for: {user_prompt[:50]}...")
+            return self._mock_response(system_prompt, user_prompt)
+
+        payload = self._build_payload(system_prompt, user_prompt, model)
+        payload["stream"] = True
+        return await self._call_provider(lambda attempt: self._post_stream(payload, on_field, attempt), deadline)
+
+    # ------------------------------------------------------------------
+    # Live calls
+    # ------------------------------------------------------------------
+
+    async def _call_provider(self, send: Callable[[int], Awaitable[str]], deadline: Optional[float]) -> str:
+        """
+        Run a live call, with retries, under the circuit breaker and the
+        caller's deadline. `send(attempt)` makes one HTTP attempt. Only the
+        attempts are timed: the deadline is a budget of time spent waiting on
+        the provider, and the breaker's slow-call check sees the same figure.
+        """
+        if not ai_breaker.allow():
+            raise CircuitOpenError(f"AI provider circuit is open (last error: {ai_breaker.last_error})")
+
+        deadline = settings.AI_DEFAULT_DEADLINE if deadline is None else deadline
+        elapsed = 0.0
+        for attempt in range(settings.AI_MAX_RETRIES + 1):
+            # Pacing, off the clock: our share of the provider's RPM budget
+            await ai_rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                if deadline and elapsed >= deadline:
+                    raise asyncio.TimeoutError()
+                call = send(attempt)
+                result = await asyncio.wait_for(call, deadline - elapsed) if deadline else await call
+            except _RetryLater as retry:
+                elapsed += time.monotonic() - started
+                print(f"⚠️  AI provider returned {retry.status_code}, retrying in {retry.delay:.1f}s...")
+                # Pacing, off the clock: the provider asked us to back off
+                await asyncio.sleep(retry.delay)
+                continue
+            except asyncio.TimeoutError:
+                ai_breaker.record_failure(f"deadline of {deadline:.1f}s exceeded")
+                raise
+            except httpx.TransportError as e:
+                ai_breaker.record_failure(f"{type(e).__name__}: {e}")
+                raise
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in _RETRYABLE_STATUS:
+                    ai_breaker.record_failure(f"HTTP {e.response.status_code}")
+                else:
+                    # The provider answered; a bad request is not an outage
+                    ai_breaker.record_success(elapsed + time.monotonic() - started)
+                raise
+            except Exception:
+                # Unparseable output still means the provider is up
+                ai_breaker.record_success(elapsed + time.monotonic() - started)
+                raise
+            ai_breaker.record_success(elapsed + time.monotonic() - started)
+            return result
+
+    async def _post_json(self, payload: dict, attempt: int) -> str:
+        response = await get_http_client().post(self._url, headers=self._headers, json=payload)
+        _check_retry(attempt, response)
+        response.raise_for_status()
+
+        data = response.json()
+        raw = data["choices"][0]["message"]["content"] or ""
+        return self._extract_json(raw)
+
+    async def _post_stream(self, payload: dict, on_field: FieldCallback, attempt: int) -> str:
+        async with get_http_client().stream("POST", self._url, headers=self._headers, json=payload) as response:
+            _check_retry(attempt, response)
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            raw = await self._read_stream(response, on_field)
+            return self._extract_json(raw)
+
+    async def _read_stream(self, response: httpx.Response, on_field: FieldCallback) -> str:
+        """Collect the text deltas of an OpenAI-style SSE stream, reporting fields as they close."""
+        parser = IncrementalJSONParser()
+        parts = []
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue  # Blank separators, comments and keep-alives
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or []
+            delta = (choices[0].get("delta") or {}).get("content") if choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            for key, value in parser.feed(delta):
+                await on_field(key, value)
+        return "".join(parts)
+
+    def _build_payload(self, system_prompt: str, user_prompt: str, model: str) -> dict:
         augmented_system = (
             system_prompt.rstrip()
             + "\n\nIMPORTANT: Respond with a valid JSON object ONLY — no markdown fences, no extra commentary."
         )
-
-        payload = {
+        return {
             "model": model,
             "messages": [
                 {"role": "system", "content": augmented_system},
@@ -97,14 +327,6 @@ class AIClient:
             "temperature": 0.7,
         }
 
-        async with httpx.AsyncClient(timeout=_TIMEOUT) as http:
-            response = await http.post(self._url, headers=self._headers, json=payload)
-            response.raise_for_status()
-
-        data = response.json()
-        raw = data["choices"][0]["message"]["content"] or ""
-        return self._extract_json(raw)
-
     # ------------------------------------------------------------------
     # Mock helpers
     # ------------------------------------------------------------------
@@ -148,4 +370,9 @@ class AIClient:
             },
             "constraints": "1 <= n <= 100",
             "tags": ["array", "basic"],
+            "reference_solution": (
+                "import sys\n"
+                "lines = sys.stdin.read().strip().split(\"\\n\")\n"
+                "print(\"\\n\".join(\" \".join(line.split()[::-1]) for line in lines[::-1]))\n"
+            ),
         })
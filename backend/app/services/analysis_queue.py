@@ -0,0 +1,147 @@
+"""
+KamiCode — AI Analysis Queue
+
+Bounded in-process work queue for submission analyses. A fixed pool of
+workers caps how many analyses (and therefore LLM calls) run at once;
+duplicate submission ids are coalesced while queued or in flight.
+Provider pacing and 429/5xx retries live in AIClient.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Set
+
+from app.core.config import get_settings
+from app.core.task_supervisor import task_supervisor
+
+settings = get_settings()
+
+AnalysisHandler = Callable[[str], Awaitable[None]]
+
+
+async def _analyze(submission_id: str):
+    from app.core.database import async_session_maker
+    from app.services.ai_analysis_service import AIAnalysisService
+
+    async with async_session_maker() as db:
+        await AIAnalysisService(db).analyze_submission(submission_id)
+
+
+class AnalysisQueue:
+    def __init__(
+        self,
+        concurrency: int = None,
+        maxsize: int = None,
+        handler: Optional[AnalysisHandler] = None,
+    ):
+        self.concurrency = concurrency or settings.AI_ANALYSIS_CONCURRENCY
+        self.maxsize = maxsize or settings.AI_ANALYSIS_QUEUE_SIZE
+        self._handler = handler or _analyze
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Set[str] = set()  # Queued or in flight
+
+        # Metrics
+        self.in_flight = 0
+        self.enqueued = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"analysis-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self, timeout: float = 10.0):
+        """Give queued work up to `timeout` seconds to finish, then cancel workers."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Analysis queue stopped with {self.depth} item(s) still queued")
+            # Hand unstarted work to the task journal so it is re-queued on restart
+            while not self._queue.empty():
+                submission_id, _ = self._queue.get_nowait()
+                task_supervisor.persist("analysis.enqueue", {"submission_id": submission_id})
+                self._queue.task_done()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._pending.clear()
+
+    def enqueue(self, submission_id: str) -> bool:
+        """
+        Queue a submission for analysis. Returns False if the queue is full
+        and the work was dropped; duplicates count as accepted.
+        """
+        self.start()
+        if submission_id in self._pending:
+            self.coalesced += 1
+            return True
+        try:
+            self._queue.put_nowait((submission_id, time.monotonic()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"⚠️ Analysis queue full ({self.maxsize}), dropping submission {submission_id}")
+            return False
+        self._pending.add(submission_id)
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> dict:
+        started = self.completed + self.failed + self.in_flight
+        return {
+            "depth": self.depth,
+            "in_flight": self.in_flight,
+            "concurrency": self.concurrency,
+            "capacity": self.maxsize,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": (self._wait_total / started * 1000) if started else 0.0,
+            "max_wait_ms": self._wait_max * 1000,
+        }
+
+    async def _worker(self):
+        while True:
+            submission_id, enqueued_at = await self._queue.get()
+            waited = time.monotonic() - enqueued_at
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            self.in_flight += 1
+            try:
+                await self._handler(submission_id)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"⚠️ Analysis failed for submission {submission_id}: {e}")
+            finally:
+                self.in_flight -= 1
+                self._pending.discard(submission_id)
+                self._queue.task_done()
+
+
+analysis_queue = AnalysisQueue()
+
+
+async def _replay_enqueue(payload: dict):
+    analysis_queue.enqueue(payload["submission_id"])
+
+task_supervisor.register("analysis.enqueue", _replay_enqueue, category="analysis")
@@ -0,0 +1,127 @@
+"""
+Code fingerprinting for the AI analysis cache.
+
+Two submissions that differ only in identifier names, comments or
+whitespace get the same fingerprint. Python code is normalized on its
+AST; other languages fall back to a token-level normalization.
+"""
+
+import ast
+import builtins
+import hashlib
+import io
+import keyword
+import re
+import tokenize
+from typing import Dict
+
+_BUILTINS = frozenset(dir(builtins))
+
+_JS_KEYWORDS = frozenset("""
+    break case catch class const continue debugger default delete do else export
+    extends finally for function if import in instanceof let new return super
+    switch this throw try typeof var void while with yield async await of static
+    get set null undefined true false NaN Infinity
+    console Math JSON Object Array String Number Boolean Map Set parseInt
+    parseFloat require process length push pop shift unshift slice splice sort
+    map filter reduce forEach join split keys values entries has add
+""".split())
+
+_C_COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_TOKENS = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*|\d+(?:\.\d+)?|\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|`[^`]*`|\S")
+_IDENTIFIER = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+
+
+class _Renamer(ast.NodeTransformer):
+    """Rename user-defined identifiers to v0, v1, ... in order of appearance."""
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+
+    def _rename(self, name: str) -> str:
+        if name in _BUILTINS:
+            return name
+        if name not in self.names:
+            self.names[name] = f"v{len(self.names)}"
+        return self.names[name]
+
+    def visit_Name(self, node: ast.Name):
+        node.id = self._rename(node.id)
+        return node
+
+    def visit_arg(self, node: ast.arg):
+        node.arg = self._rename(node.arg)
+        node.annotation = None
+        return node
+
+    def _strip_docstring(self, node):
+        # Docstrings are comments as far as the fingerprint is concerned
+        if (
+            node.body
+            and isinstance(node.body[0], ast.Expr)
+            and isinstance(node.body[0].value, ast.Constant)
+            and isinstance(node.body[0].value.value, str)
+        ):
+            node.body = node.body[1:] or [ast.Pass()]
+
+    def _visit_def(self, node):
+        node.name = self._rename(node.name)
+        if hasattr(node, "returns"):
+            node.returns = None
+        self._strip_docstring(node)
+        self.generic_visit(node)
+        return node
+
+    visit_FunctionDef = _visit_def
+    visit_AsyncFunctionDef = _visit_def
+    visit_ClassDef = _visit_def
+
+    def visit_Module(self, node: ast.Module):
+        self._strip_docstring(node)
+        self.generic_visit(node)
+        return node
+
+
+def _normalize_python(code: str) -> str:
+    tree = ast.parse(code)
+    tree = _Renamer().visit(tree)
+    return ast.dump(tree, annotate_fields=False, include_attributes=False)
+
+
+def _normalize_tokens(code: str) -> str:
+    """Language-agnostic fallback: drop C-style comments and rename identifiers."""
+    names: Dict[str, str] = {}
+    out = []
+    for token in _TOKENS.findall(_C_COMMENTS.sub(" ", code)):
+        if _IDENTIFIER.fullmatch(token) and token not in _JS_KEYWORDS and not keyword.iskeyword(token):
+            token = names.setdefault(token, f"v{len(names)}")
+        out.append(token)
+    return " ".join(out)
+
+
+def _normalize_python_tokens(code: str) -> str:
+    """Used when Python code does not parse: strip comments via the tokenizer."""
+    try:
+        tokens = [
+            tok.string
+            for tok in tokenize.generate_tokens(io.StringIO(code).readline)
+            if tok.type not in (tokenize.COMMENT, tokenize.NL)
+        ]
+    except (tokenize.TokenError, IndentationError):
+        return _normalize_tokens(code)
+    return _normalize_tokens(" ".join(tokens))
+
+
+def normalize_code(code: str, language: str) -> str:
+    if language == "python":
+        try:
+            return _normalize_python(code)
+        except SyntaxError:
+            return _normalize_python_tokens(code)
+    return _normalize_tokens(code)
+
+
+def fingerprint_code(code: str, language: str) -> str:
+    """SHA-256 of the normalized code, prefixed by language so they never collide."""
+    normalized = normalize_code(code, language)
+    return hashlib.sha256(f"{language}\0{normalized}".encode()).hexdigest()
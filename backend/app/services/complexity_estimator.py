@@ -0,0 +1,503 @@
+"""
+Local static complexity estimator.
+
+Gives a millisecond time/space complexity guess from the structure of the
+code alone: loop nesting depth, halving loops, recursion, sorting and
+hash/heap structures. Python is read from its AST; JavaScript goes through
+a light token/bracket scanner. The result carries a confidence so callers
+can decide whether the LLM still needs to refine it.
+"""
+
+import ast
+import re
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+# A cost term n^p * log^l n, compared lexicographically (p first)
+Cost = Tuple[int, int]
+_ZERO: Cost = (0, 0)
+_EXPONENTIAL: Cost = (99, 0)
+
+_MEMO_DECORATORS = {"cache", "lru_cache"}
+_HASH_FACTORIES = {"dict", "set", "Counter", "defaultdict", "OrderedDict", "frozenset"}
+_LOG_CALLS = {"heappush", "heappop", "heapify", "heappushpop", "bisect", "bisect_left", "bisect_right", "insort"}
+
+
+class ComplexityEstimate(BaseModel):
+    time_complexity: str
+    space_complexity: str
+    approach_name: str
+    confidence: float  # 0-1
+    loop_depth: int
+    recursive: bool
+    uses_sorting: bool
+    uses_hashing: bool
+
+    def as_analysis(self) -> dict:
+        """Fields in the shape AIAnalysis / the LLM response use."""
+        signals = [f"loop nesting depth {self.loop_depth}"]
+        if self.recursive:
+            signals.append("recursion")
+        if self.uses_sorting:
+            signals.append("sorting")
+        if self.uses_hashing:
+            signals.append("hash-based lookups")
+        return {
+            "time_complexity": self.time_complexity,
+            "space_complexity": self.space_complexity,
+            "approach_name": self.approach_name,
+            "quality_score": None,
+            "feedback": f"Estimated by static analysis from {', '.join(signals)}.",
+        }
+
+
+def format_cost(cost: Cost) -> str:
+    if cost >= _EXPONENTIAL:
+        return "O(2^n)"
+    power, logs = cost
+    parts = []
+    if power == 1:
+        parts.append("n")
+    elif power > 1:
+        parts.append(f"n^{power}")
+    if logs == 1:
+        parts.append("log n")
+    elif logs > 1:
+        parts.append(f"log^{logs} n")
+    return f"O({' '.join(parts) or '1'})"
+
+
+def _add(a: Cost, b: Cost) -> Cost:
+    if a >= _EXPONENTIAL or b >= _EXPONENTIAL:
+        return _EXPONENTIAL
+    return (a[0] + b[0], a[1] + b[1])
+
+
+def _approach(time: Cost, loop_depth: int, recursive: bool, memoized: bool,
+              sorting: bool, hashing: bool, halving: bool, heap: bool) -> str:
+    if recursive:
+        if memoized:
+            return "Memoized Recursion"
+        return "Exhaustive Recursion" if time >= _EXPONENTIAL else "Recursion"
+    if halving and loop_depth <= 1:
+        return "Binary Search"
+    if heap:
+        return "Heap / Priority Queue"
+    if sorting:
+        return "Sorting"
+    if hashing and loop_depth <= 1:
+        return "Hash Table"
+    if loop_depth >= 2:
+        return "Nested Loops"
+    if loop_depth == 1:
+        return "Linear Scan"
+    return "Direct Computation"
+
+
+# ─── Python ────────────────────────────────────────────────────────
+
+
+def _is_halving(node: ast.AST) -> bool:
+    """A loop body that halves something (x // 2, x >> 1, x /= 2) looks like binary search."""
+    for child in ast.walk(node):
+        if isinstance(child, (ast.BinOp, ast.AugAssign)):
+            op = child.op
+            right = child.right if isinstance(child, ast.BinOp) else child.value
+            if (
+                isinstance(op, (ast.FloorDiv, ast.Div, ast.RShift))
+                and isinstance(right, ast.Constant)
+                and right.value in (1, 2)
+                and not (isinstance(op, (ast.FloorDiv, ast.Div)) and right.value == 1)
+            ):
+                return True
+    return False
+
+
+def _call_name(node: ast.Call) -> Optional[str]:
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def _container_kind(node: ast.AST) -> Optional[str]:
+    """"hash" for O(1) membership (dict/set/range), "linear" for lists/strings, None if unknown."""
+    if isinstance(node, (ast.Dict, ast.Set, ast.DictComp, ast.SetComp)):
+        return "hash"
+    if isinstance(node, (ast.List, ast.ListComp, ast.Tuple, ast.JoinedStr)):
+        return "linear"
+    if isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes)):
+        return "linear"
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult) and isinstance(node.left, ast.List):
+        return "linear"
+    if isinstance(node, ast.Call):
+        name = _call_name(node)
+        if name in _HASH_FACTORIES or name in ("range", "keys"):
+            return "hash"
+        if name in ("list", "tuple", "sorted", "str", "split", "join"):
+            return "linear"
+    return None
+
+
+def _container_names(tree: ast.AST) -> Tuple[set, set]:
+    """Names bound only to hash containers, and names bound only to linear ones."""
+    kinds = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        kind = _container_kind(value)
+        for target in targets:
+            if isinstance(target, ast.Name):
+                kinds.setdefault(target.id, set()).add(kind)
+    hashed = {name for name, seen in kinds.items() if seen == {"hash"}}
+    linear = {name for name, seen in kinds.items() if seen == {"linear"}}
+    return hashed, linear
+
+
+class _PythonAnalyzer:
+    def __init__(self, hashed: Optional[set] = None, linear: Optional[set] = None):
+        self.max_depth = 0
+        self.uncertain_loops = 0
+        self.uncertain_lookups = 0
+        self.hashed = hashed or set()
+        self.linear = linear or set()
+        self.sorting = False
+        self.hashing = False
+        self.halving = False
+        self.heap = False
+        self.recursive = False
+        self.branching_recursion = False
+        self.memoized = False
+        self.space: Cost = _ZERO
+        self._functions: List[str] = []
+
+    def cost(self, node: ast.AST, depth: int = 0) -> Cost:
+        """Cost of executing `node` once, with `depth` enclosing loops."""
+        self.max_depth = max(self.max_depth, depth)
+
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            body = self._block(node.body + node.orelse, depth + 1)
+            self._note_growth(node.body)
+            return max(_add((1, 0), body), self.cost(node.iter, depth))
+
+        if isinstance(node, ast.While):
+            if _is_halving(node):
+                self.halving = True
+                factor = (0, 1)
+            else:
+                self.uncertain_loops += 1
+                factor = (1, 0)
+            body = self._block(node.body + node.orelse, depth + 1)
+            self._note_growth(node.body)
+            return _add(factor, body)
+
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            generators = len(node.generators)
+            if isinstance(node, (ast.SetComp, ast.DictComp)):
+                self.hashing = True
+            if not isinstance(node, ast.GeneratorExp):
+                element = node.elt if not isinstance(node, ast.DictComp) else node.value
+                inner = 1 if isinstance(element, (ast.ListComp, ast.List, ast.BinOp)) else 0
+                self.space = max(self.space, (generators + inner, 0))
+            elements = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            inner_cost = max(
+                [self.cost(e, depth + generators) for e in elements]
+                + [self.cost(c, depth + generators) for g in node.generators for c in g.ifs],
+                default=_ZERO,
+            )
+            self.max_depth = max(self.max_depth, depth + generators)
+            return _add((generators, 0), inner_cost)
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return self._function(node, depth)
+
+        own = _ZERO
+        if isinstance(node, ast.Call):
+            own = self._call(node)
+        elif isinstance(node, ast.Compare):
+            own = self._membership(node)
+        elif isinstance(node, (ast.Dict, ast.Set)):
+            self.hashing = True
+        elif (
+            isinstance(node, ast.BinOp)
+            and isinstance(node.op, ast.Mult)
+            and isinstance(node.left, ast.List)
+        ):
+            # [0] * n allocates linear space
+            self.space = max(self.space, (1, 0))
+
+        return max([own] + [self.cost(child, depth) for child in ast.iter_child_nodes(node)])
+
+    def _block(self, statements: List[ast.stmt], depth: int) -> Cost:
+        return max((self.cost(s, depth) for s in statements), default=_ZERO)
+
+    def _note_growth(self, body: List[ast.stmt]):
+        """Appending/adding/assigning into a container inside a loop grows it linearly."""
+        for child in ast.walk(ast.Module(body=body, type_ignores=[])):
+            if isinstance(child, ast.Call) and _call_name(child) in ("append", "add", "appendleft", "extend", "heappush"):
+                self.space = max(self.space, (1, 0))
+            elif isinstance(child, ast.Assign) and any(isinstance(t, ast.Subscript) for t in child.targets):
+                self.space = max(self.space, (1, 0))
+
+    def _call(self, node: ast.Call) -> Cost:
+        name = _call_name(node)
+        if name in ("sorted", "sort"):
+            self.sorting = True
+            if name == "sorted":
+                self.space = max(self.space, (1, 0))
+            return (1, 1)
+        if name in _HASH_FACTORIES:
+            self.hashing = True
+        if name in _LOG_CALLS:
+            if name.startswith("heap"):
+                self.heap = True
+            return (0, 1)
+        if self._functions and name == self._functions[-1]:
+            self.recursive = True
+        return _ZERO
+
+    def _membership(self, node: ast.Compare) -> Cost:
+        """`x in container` scans the container unless it is a dict/set/range."""
+        own = _ZERO
+        for op, container in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            if isinstance(container, ast.Name):
+                kind = "hash" if container.id in self.hashed else "linear" if container.id in self.linear else None
+            elif isinstance(container, (ast.List, ast.Tuple, ast.Set, ast.Constant)):
+                kind = "hash"  # A literal has a fixed size
+            else:
+                kind = _container_kind(container)
+            if kind == "hash":
+                continue
+            if kind is None:
+                # Usually a list parameter; assume a scan but let the model check
+                self.uncertain_lookups += 1
+            own = (1, 0)
+        return own
+
+    def _function(self, node, depth: int) -> Cost:
+        memoized = any(
+            (isinstance(d, ast.Name) and d.id in _MEMO_DECORATORS)
+            or (isinstance(d, ast.Attribute) and d.attr in _MEMO_DECORATORS)
+            or (isinstance(d, ast.Call) and _call_name(d) in _MEMO_DECORATORS)
+            for d in node.decorator_list
+        )
+        self_calls = sum(
+            1 for c in ast.walk(node)
+            if isinstance(c, ast.Call) and isinstance(c.func, ast.Name) and c.func.id == node.name
+        )
+
+        self._functions.append(node.name)
+        body = self._block(node.body, depth)
+        self._functions.pop()
+
+        if not self_calls:
+            return body
+
+        self.recursive = True
+        self.memoized = self.memoized or memoized
+        if _is_halving(node):
+            # Divide and conquer: halving recursion with one branch is logarithmic
+            factor = (0, 1) if self_calls == 1 else (1, 1)
+            self.space = max(self.space, (0, 1))
+            return _add(factor, body)
+        self.space = max(self.space, (1, 0))
+        if self_calls >= 2 and not memoized:
+            self.branching_recursion = True
+            return _EXPONENTIAL
+        return _add((1, 0), body)
+
+
+def _estimate_python(code: str) -> Optional[ComplexityEstimate]:
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    analyzer = _PythonAnalyzer(*_container_names(tree))
+    time = analyzer.cost(tree)
+
+    confidence = 0.9
+    confidence -= 0.25 * min(analyzer.uncertain_loops, 2)
+    confidence -= 0.2 * min(analyzer.uncertain_lookups, 1)
+    if analyzer.recursive:
+        confidence -= 0.3
+    if analyzer.branching_recursion:
+        confidence -= 0.1
+
+    return ComplexityEstimate(
+        time_complexity=format_cost(time),
+        space_complexity=format_cost(analyzer.space),
+        approach_name=_approach(
+            time, analyzer.max_depth, analyzer.recursive, analyzer.memoized,
+            analyzer.sorting, analyzer.hashing, analyzer.halving, analyzer.heap,
+        ),
+        confidence=round(max(confidence, 0.1), 2),
+        loop_depth=analyzer.max_depth,
+        recursive=analyzer.recursive,
+        uses_sorting=analyzer.sorting,
+        uses_hashing=analyzer.hashing,
+    )
+
+
+# ─── JavaScript ────────────────────────────────────────────────────
+
+_JS_STRIP = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|`(?:\\.|[^`\\])*`",
+    re.DOTALL,
+)
+_JS_TOKENS = re.compile(r">>>?|[A-Za-z_$][A-Za-z0-9_$]*|\d+|\S")
+_JS_ITERATORS = {"forEach", "map", "filter", "reduce", "some", "every", "find", "findIndex", "flatMap"}
+_JS_SCANS = {"includes", "indexOf", "lastIndexOf"}
+_JS_FUNCTION_DECL = re.compile(
+    r"function\s+([A-Za-z_$][\w$]*)|(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:function|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)"
+)
+
+
+class _Frame:
+    def __init__(self, closer: str, factor: Cost = _ZERO, loop: bool = False, halving_check: bool = False):
+        self.closer = closer
+        self.factor = factor
+        self.loop = loop
+        self.halving_check = halving_check
+        self.body: Cost = _ZERO
+        self.tokens: List[str] = []
+
+
+def _estimate_javascript(code: str) -> Optional[ComplexityEstimate]:
+    source = _JS_STRIP.sub(" 0 ", code)
+    tokens = _JS_TOKENS.findall(source)
+    if not tokens:
+        return None
+
+    stack = [_Frame(closer="")]
+    depth = max_depth = 0
+    uncertain = 0
+    sorting = hashing = halving = heap = False
+    space: Cost = _ZERO
+    pending_loop = None  # "for" / "while" waiting for its header to close
+    header_depth = 0
+    i = 0
+
+    def pop():
+        nonlocal depth, halving, uncertain, space
+        frame = stack.pop()
+        factor = frame.factor
+        if frame.halving_check:
+            text = " ".join(frame.tokens)
+            if re.search(r">>>? 1|/ 2\b", text):
+                factor = (0, 1)
+                halving = True
+            else:
+                uncertain += 1
+        if frame.loop:
+            depth -= 1
+            if any(t in ("push", "add", "set") for t in frame.tokens):
+                space = max(space, (1, 0))
+        stack[-1].body = max(stack[-1].body, _add(factor, frame.body))
+        stack[-1].tokens.extend(frame.tokens)
+
+    while i < len(tokens):
+        tok = tokens[i]
+        stack[-1].tokens.append(tok)
+
+        if pending_loop:
+            if tok == "(":
+                header_depth += 1
+            elif tok == ")":
+                header_depth -= 1
+                if header_depth == 0:
+                    kind = pending_loop
+                    pending_loop = None
+                    depth += 1
+                    max_depth = max(max_depth, depth)
+                    nxt = tokens[i + 1] if i + 1 < len(tokens) else ""
+                    closer = "}" if nxt == "{" else ";"
+                    if nxt == "{":
+                        i += 1
+                    stack.append(_Frame(closer, (1, 0), loop=True, halving_check=(kind == "while")))
+            i += 1
+            continue
+
+        if tok in ("for", "while"):
+            pending_loop = tok
+            header_depth = 0
+        elif tok == "." and i + 2 < len(tokens) and tokens[i + 1] in _JS_ITERATORS and tokens[i + 2] == "(":
+            depth += 1
+            max_depth = max(max_depth, depth)
+            stack.append(_Frame(")", (1, 0), loop=True))
+            i += 3
+            continue
+        elif tok == "sort" and i > 0 and tokens[i - 1] == ".":
+            sorting = True
+            stack[-1].body = max(stack[-1].body, (1, 1))
+        elif tok in _JS_SCANS and i > 0 and tokens[i - 1] == "." and i + 1 < len(tokens) and tokens[i + 1] == "(":
+            # Array/string searches are linear in the searched value
+            stack[-1].body = max(stack[-1].body, (1, 0))
+        elif tok == "new" and i + 1 < len(tokens) and tokens[i + 1] in ("Map", "Set"):
+            hashing = True
+        elif tok == "=" and i + 2 < len(tokens) and tokens[i + 1] == "{" and tokens[i + 2] == "}":
+            hashing = True
+        elif tok in ("{", "(", "["):
+            stack.append(_Frame({"{": "}", "(": ")", "[": "]"}[tok]))
+        elif tok == stack[-1].closer or (tok == "}" and stack[-1].closer == ";"):
+            pop()
+            # A brace-less loop body ends with its statement; the brace also closes the parent
+            if tok == "}" and len(stack) > 1 and stack[-1].closer == "}":
+                pop()
+        elif tok in ("}", ")", "]"):
+            # Unbalanced closer: unwind to the matching frame
+            while len(stack) > 1 and stack[-1].closer != tok:
+                pop()
+            if len(stack) > 1:
+                pop()
+        i += 1
+
+    while len(stack) > 1:
+        pop()
+    time = stack[0].body
+
+    # Recursion: a declared function called more than once (one external call
+    # plus internal ones); two or more internal calls suggest branching recursion
+    recursive = branching = False
+    for match in _JS_FUNCTION_DECL.finditer(source):
+        name = match.group(1) or match.group(2)
+        calls = len(re.findall(rf"\b{re.escape(name)}\s*\(", source))
+        if match.group(1):
+            calls -= 1  # `function name(` itself matches
+        recursive = recursive or calls >= 2
+        branching = branching or calls >= 3
+    if branching:
+        time = _EXPONENTIAL
+    elif recursive:
+        time = _add(time, (1, 0))
+    if recursive:
+        space = max(space, (1, 0))
+
+    confidence = 0.75 - 0.25 * min(uncertain, 2) - (0.3 if recursive else 0.0)
+    return ComplexityEstimate(
+        time_complexity=format_cost(time),
+        space_complexity=format_cost(space),
+        approach_name=_approach(time, max_depth, recursive, False, sorting, hashing, halving, heap),
+        confidence=round(max(confidence, 0.1), 2),
+        loop_depth=max_depth,
+        recursive=recursive,
+        uses_sorting=sorting,
+        uses_hashing=hashing,
+    )
+
+
+def estimate_complexity(code: str, language: str) -> Optional[ComplexityEstimate]:
+    """Static estimate for the code, or None if the language/code can't be read."""
+    if language == "python":
+        return _estimate_python(code)
+    if language == "javascript":
+        return _estimate_javascript(code)
+    return None
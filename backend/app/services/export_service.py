@@ -0,0 +1,121 @@
+"""
+KamiCode — Export Service
+
+Streams raw table rows (submissions, rating history, AI analyses) as NDJSON
+or CSV for offline analytics. Rows are pulled through a server-side cursor
+in fixed-size partitions, so memory use does not grow with the export size.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ai_analysis import AIAnalysis
+from app.models.rating_history import RatingHistory
+from app.models.submission import Submission
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# Exportable tables and the ORM model backing each one
+EXPORT_TABLES = {
+    "submissions": Submission,
+    "rating_history": RatingHistory,
+    "ai_analyses": AIAnalysis,
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+class ExportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def build_query(
+        self,
+        table: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        problem_id: Optional[str] = None,
+    ):
+        """
+        Build a column-level SELECT for the given table. Selecting columns
+        instead of ORM entities keeps rows out of the session identity map.
+        """
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown export table '{table}'")
+
+        model = EXPORT_TABLES[table]
+        query = select(*model.__table__.columns)
+
+        if problem_id:
+            if model is Submission:
+                query = query.where(Submission.problem_id == problem_id)
+            else:
+                # rating_history and ai_analyses reach the problem through their submission
+                query = query.join(Submission, model.submission_id == Submission.id).where(
+                    Submission.problem_id == problem_id
+                )
+
+        if since:
+            query = query.where(model.created_at >= since)
+        if until:
+            query = query.where(model.created_at < until)
+
+        return query.order_by(model.created_at, model.id)
+
+    async def stream(
+        self,
+        table: str,
+        fmt: str = "ndjson",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        problem_id: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the export as text chunks, one chunk per cursor partition.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}'")
+
+        query = self.build_query(table, since, until, problem_id)
+        columns = [c.name for c in EXPORT_TABLES[table].__table__.columns]
+
+        if fmt == "csv":
+            yield self._csv_chunk([columns])
+
+        result = await self.db.stream(query.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions(chunk_size):
+            if fmt == "ndjson":
+                yield "".join(
+                    json.dumps(dict(row._mapping), default=_json_default) + "\n"
+                    for row in partition
+                )
+            else:
+                yield self._csv_chunk([_csv_value(v) for v in row] for row in partition)
+
+    def _csv_chunk(self, rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
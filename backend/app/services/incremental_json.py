@@ -0,0 +1,70 @@
+"""
+Incremental JSON parser for streamed model output.
+
+Feed it text chunks as they arrive; each top-level member of the first JSON
+object is emitted as a (key, value) pair as soon as its value is complete,
+so callers can act on early fields before the object closes. Text before
+the opening brace (prose, a ```json fence) is skipped.
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+
+class IncrementalJSONParser:
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._buf = ""
+        self._pos = 0  # Next character to scan
+        self._member_start = -1  # Start of the current top-level member
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk and return the members it completed, in order."""
+        if self.done:
+            return []
+        self._buf += chunk
+        completed = []
+        buf = self._buf
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete(buf[self._member_start:self._pos], completed)
+                    self.done = True
+                    break
+            elif ch == "," and self._depth == 1:
+                self._complete(buf[self._member_start:self._pos], completed)
+                self._member_start = self._pos + 1
+            self._pos += 1
+        return completed
+
+    def _complete(self, member: str, completed: List[Tuple[str, Any]]):
+        if not member.strip():
+            return  # "{}" or a trailing comma
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            return  # Malformed member; the final full parse reports the error
+        for key, value in parsed.items():
+            self.fields[key] = value
+            completed.append((key, value))
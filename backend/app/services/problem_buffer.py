@@ -0,0 +1,214 @@
+"""
+KamiCode — Daily Problem Buffer
+
+Keeps PROBLEM_BUFFER_SIZE validated daily problems ready ahead of time.
+Candidates are generated concurrently, each with a reference solution
+that is run through the sandbox against every test case in parallel; only
+candidates whose reference passes all of them are kept. At rollover the
+oldest validated candidate is installed from the database, with no model
+call on the critical path. Near-duplicates of the catalog or of other
+buffered candidates are rejected at refill and re-checked at install.
+"""
+
+import asyncio
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.engines.problem_similarity import ProblemSimilarityIndex, problem_index
+from app.models.problem import Problem
+from app.models.problem_candidate import ProblemCandidate
+from app.schemas.problem import ProblemCreate
+from app.services.problem_generator import ProblemGenerator
+from app.services.sandbox import get_sandbox
+
+settings = get_settings()
+
+VALIDATED = "validated"
+REJECTED = "rejected"
+INSTALLED = "installed"
+
+
+class ProblemBufferService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.generator = ProblemGenerator(db)
+        self.sandbox = get_sandbox()
+        # Caps sandbox processes across all candidates being validated at once
+        self._sandbox_slots = asyncio.Semaphore(settings.PROBLEM_VALIDATION_CONCURRENCY)
+
+    async def counts(self) -> Dict[str, int]:
+        result = await self.db.execute(
+            select(ProblemCandidate.status, func.count()).group_by(ProblemCandidate.status)
+        )
+        counts = {VALIDATED: 0, REJECTED: 0, INSTALLED: 0}
+        counts.update({status: count for status, count in result.all()})
+        return counts
+
+    async def refill(self, target: int = None, difficulty: str = None) -> int:
+        """
+        Generate and validate candidates until `target` validated problems
+        are buffered. Returns how many new candidates passed validation.
+        """
+        target = settings.PROBLEM_BUFFER_SIZE if target is None else target
+        difficulty = difficulty or settings.PROBLEM_BUFFER_DIFFICULTY
+        needed = target - (await self.counts())[VALIDATED]
+        if needed <= 0:
+            return 0
+
+        print(f"🧺 Refilling problem buffer with {needed} candidate(s)...")
+        slots = asyncio.Semaphore(settings.PROBLEM_BUFFER_CONCURRENCY)
+
+        async def build():
+            async with slots:
+                return await self._build_candidate(difficulty)
+
+        candidates = [c for c in await asyncio.gather(*(build() for _ in range(needed))) if c]
+        await self._reject_duplicates(candidates)
+        self.db.add_all(candidates)
+        await self.db.commit()
+
+        validated = sum(1 for c in candidates if c.status == VALIDATED)
+        print(f"✅ Problem buffer: {validated}/{needed} candidate(s) validated")
+        return validated
+
+    async def install_next(self, day: date) -> Optional[Problem]:
+        """Install the oldest validated candidate as the daily problem for `day`."""
+        await problem_index.ensure_loaded(self.db)
+        while True:
+            result = await self.db.execute(
+                select(ProblemCandidate)
+                .where(ProblemCandidate.status == VALIDATED)
+                .order_by(ProblemCandidate.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            candidate = result.scalar_one_or_none()
+            if not candidate:
+                return None
+
+            # The catalog may have gained a similar problem since the candidate was buffered
+            data = ProblemCreate(**candidate.payload)
+            signature = problem_index.signature_for(data.title, data.description, data.test_cases.model_dump())
+            duplicate = problem_index.find_duplicate(signature)
+            if not duplicate:
+                break
+            candidate.status = REJECTED
+            candidate.validation_error = f"Near-duplicate of '{duplicate[1]}' (similarity {duplicate[2]:.2f})"
+            await self.db.flush()
+
+        slug = data.slug
+        existing = await self.db.execute(select(Problem.id).where(Problem.slug == slug))
+        if existing.scalar_one_or_none():
+            slug = f"{slug}-{day.isoformat()}"
+
+        # Clear any existing problem for the day to avoid the UNIQUE constraint
+        await self.db.execute(update(Problem).where(Problem.daily_date == day).values(daily_date=None))
+
+        problem = Problem(
+            title=data.title,
+            slug=slug,
+            description=data.description,
+            difficulty=data.difficulty,
+            test_cases=data.test_cases.model_dump(),
+            constraints=data.constraints,
+            tags=data.tags,
+            generated_by=settings.AI_MODEL,
+            daily_date=day,
+        )
+        self.db.add(problem)
+        await self.db.flush()
+
+        candidate.status = INSTALLED
+        candidate.installed_problem_id = problem.id
+        await self.db.commit()
+        await self.db.refresh(problem)
+
+        problem_index.add(problem.id, signature, problem.slug)
+        await problem_index.save_async()
+        return problem
+
+    async def validate(self, problem: ProblemCreate, solution: Optional[str]) -> Tuple[Optional[str], int]:
+        """
+        Run the reference solution against every test case in parallel.
+        Returns (error or None, slowest case runtime in ms).
+        """
+        if not solution:
+            return "No reference solution provided", 0
+        cases = [tc.model_dump() for tc in problem.test_cases.sample + problem.test_cases.hidden]
+        if not cases:
+            return "No test cases provided", 0
+
+        async def run(case: dict):
+            async with self._sandbox_slots:
+                return await self.sandbox.execute(
+                    code=solution,
+                    language="python",
+                    test_cases=[case],
+                    timeout=settings.PROBLEM_VALIDATION_TIMEOUT,
+                )
+
+        results = await asyncio.gather(*(run(case) for case in cases))
+        runtime = max(r.runtime_ms for r in results)
+        failed: List[int] = [i for i, r in enumerate(results) if r.verdict != "accepted"]
+        if not failed:
+            return None, runtime
+
+        first = results[failed[0]]
+        case = first.results[0] if first.results else None
+        detail = case.error if case and case.error else (
+            f"expected {case.expected!r}, got {case.actual!r}" if case else first.verdict
+        )
+        return f"{len(failed)}/{len(cases)} test case(s) failed; case {failed[0]}: {first.verdict} ({detail})", runtime
+
+    async def _reject_duplicates(self, candidates: List[ProblemCandidate]):
+        """Reject new candidates that repeat the catalog, the buffer or each other."""
+        await problem_index.ensure_loaded(self.db)
+        buffered = ProblemSimilarityIndex()
+        result = await self.db.execute(select(ProblemCandidate).where(ProblemCandidate.status == VALIDATED))
+        for existing in result.scalars():
+            buffered.add(existing.id, self._signature(existing), existing.slug)
+
+        for i, candidate in enumerate(candidates):
+            if candidate.status != VALIDATED:
+                continue
+            signature = self._signature(candidate)
+            duplicate = problem_index.find_duplicate(signature) or buffered.find_duplicate(signature)
+            if duplicate:
+                candidate.status = REJECTED
+                candidate.validation_error = f"Near-duplicate of '{duplicate[1]}' (similarity {duplicate[2]:.2f})"
+                print(f"❌ Rejected problem candidate '{candidate.title}': {candidate.validation_error}")
+            else:
+                buffered.add(f"new-{i}", signature, candidate.slug)
+
+    def _signature(self, candidate: ProblemCandidate):
+        payload = candidate.payload
+        return problem_index.signature_for(payload["title"], payload["description"], payload["test_cases"])
+
+    async def _build_candidate(self, difficulty: str) -> Optional[ProblemCandidate]:
+        try:
+            data = await self.generator.request_problem(difficulty=difficulty, with_reference=True)
+            problem = self.generator.to_problem_create(data)
+        except Exception as e:
+            print(f"⚠️ Problem candidate generation failed: {e}")
+            return None
+
+        solution = data.get("reference_solution")
+        error, runtime = await self.validate(problem, solution)
+        if error:
+            print(f"❌ Rejected problem candidate '{problem.title}': {error}")
+
+        return ProblemCandidate(
+            title=problem.title,
+            slug=problem.slug,
+            difficulty=problem.difficulty,
+            payload=problem.model_dump(),
+            reference_solution=solution,
+            reference_language="python",
+            status=REJECTED if error else VALIDATED,
+            validation_error=error,
+            reference_runtime_ms=runtime,
+        )
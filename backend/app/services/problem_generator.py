@@ -1,16 +1,41 @@
 import json
 from datetime import date, timedelta
-from typing import Optional
+from typing import List, Optional
+from app.core.config import get_settings
 from app.services.ai_client import AIClient
 from app.services.problem_service import ProblemService
 from app.schemas.problem import ProblemCreate, ProblemTestCases, TestCase
 
+settings = get_settings()
+
 class ProblemGenerator:
     def __init__(self, db):
         self.ai = AIClient()
         self.problem_service = ProblemService(db)
 
     async def generate_daily_problem(self, topic: str = None, difficulty: str = "easy") -> Optional[any]:
+        avoid: List[str] = []
+        for attempt in range(settings.PROBLEM_DUPLICATE_RETRIES + 1):
+            data = await self.request_problem(topic=topic, difficulty=difficulty, avoid=avoid)
+            problem_data = self.to_problem_create(data)
+            duplicate = await self.problem_service.find_near_duplicate(problem_data)
+            if not duplicate or attempt == settings.PROBLEM_DUPLICATE_RETRIES:
+                break
+            # Regenerate, steering the model away from what it just repeated
+            print(f"♻️ '{problem_data.title}' duplicates '{duplicate[0]}' ({duplicate[1]:.2f}), regenerating...")
+            avoid.append(problem_data.title)
+
+        # create_problem rejects a duplicate that survived every retry
+        return await self.problem_service.create_problem(problem_data)
+
+    async def request_problem(
+        self, topic: str = None, difficulty: str = "easy", with_reference: bool = False, avoid: List[str] = None
+    ) -> dict:
+        """
+        Ask the model for a problem as raw JSON. With `with_reference` the
+        model also returns a Python reference solution used for validation;
+        `avoid` lists titles the new problem must differ from.
+        """
         system_prompt = (
             "You are an expert competitive programming problem setter. "
             "Generate a unique coding problem in JSON format. "
@@ -18,19 +43,27 @@ class ProblemGenerator:
             "test_cases (object with 'sample' and 'hidden' lists, each containing 'input' and 'expected'), "
             "constraints (markdown), and tags (list of strings)."
         )
-        
+        if with_reference:
+            system_prompt += (
+                " Also include reference_solution: a correct Python 3 program that reads the test "
+                "input from stdin and prints exactly the expected output."
+            )
+
         user_prompt = f"Create a {difficulty} problem"
         if topic:
             user_prompt += f" about {topic}"
         user_prompt += ". Ensure test cases are robust and handle edge cases."
+        if avoid:
+            user_prompt += f" It must be clearly different from these existing problems: {'; '.join(avoid)}."
 
         print(f"🤖 Calling AI to generate {difficulty} problem...")
         json_str = await self.ai.generate_json(system_prompt, user_prompt)
-        data = json.loads(json_str)
+        return json.loads(json_str)
 
+    def to_problem_create(self, data: dict) -> ProblemCreate:
         # Convert to ProblemCreate schema
         # (Assuming the AI follows the JSON structure closely)
-        problem_data = ProblemCreate(
+        return ProblemCreate(
             title=data["title"],
             slug=data["slug"],
             description=data["description"],
@@ -42,5 +75,3 @@ class ProblemGenerator:
             constraints=data.get("constraints"),
             tags=data.get("tags", [])
         )
-
-        return await self.problem_service.create_problem(problem_data)
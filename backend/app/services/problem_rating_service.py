@@ -0,0 +1,105 @@
+"""
+KamiCode — Problem Ratings
+
+Fits a Glicko-2 rating for every problem from its solve/fail history, so
+the opponent a submission is rated against reflects how hard the problem
+really is rather than its difficulty label. Each attempt is a game between
+the problem and the submitting user: the problem "wins" when the
+submission fails. A run takes every submission made since the problem was
+last fitted, treats them as one rating period and updates all problems at
+once with the vectorized engine, then stores the result on the problem
+row. The live rating path already joins the problem, so reading the fitted
+rating costs no extra query.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.engines.glicko2_batch import Glicko2Batch
+from app.engines.rating_epoch import current_epoch_query, effective_rating, effective_rd
+from app.models.problem import Problem
+from app.models.submission import Submission
+from app.models.user import User
+from app.services.rating_service import DEFAULT_DIFFICULTY_RATING, DIFFICULTY_RATINGS
+
+PRIOR_VOLATILITY = 0.06
+
+
+class ProblemRatingService:
+    def __init__(self, db: AsyncSession, engine: Glicko2Batch = None):
+        self.db = db
+        self.engine = engine or Glicko2Batch()
+
+    async def fit(self, now: datetime = None) -> int:
+        """Fold every attempt since each problem's last fit into its rating. Returns problems updated."""
+        now = now or datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(
+                Submission.problem_id,
+                Submission.verdict,
+                effective_rating(current_epoch_query()).label("classical_rating"),
+                effective_rd(current_epoch_query()).label("classical_rd"),
+                Problem.difficulty,
+                Problem.rating,
+                Problem.rating_rd,
+                Problem.rating_volatility,
+                Problem.rating_attempts,
+            )
+            .join(Problem, Submission.problem_id == Problem.id)
+            .join(User, Submission.user_id == User.id)
+            .where(
+                Submission.created_at < now,
+                or_(Problem.rating_fitted_at.is_(None), Submission.created_at >= Problem.rating_fitted_at),
+            )
+        )
+        games = result.all()
+        if not games:
+            return 0
+
+        problems = {}
+        for game in games:
+            if game.problem_id not in problems:
+                # Unfitted problems start from their difficulty prior
+                prior = DIFFICULTY_RATINGS.get((game.difficulty or "").lower(), DEFAULT_DIFFICULTY_RATING)
+                problems[game.problem_id] = (
+                    game.rating if game.rating is not None else prior[0],
+                    game.rating_rd if game.rating_rd is not None else prior[1],
+                    game.rating_volatility or PRIOR_VOLATILITY,
+                    game.rating_attempts or 0,
+                )
+        problem_ids = list(problems)
+        index = {problem_id: i for i, problem_id in enumerate(problem_ids)}
+        state = np.array([problems[p][:3] for p in problem_ids], dtype=float)
+        player = np.array([index[g.problem_id] for g in games], dtype=np.intp)
+
+        rating, rd, volatility = self.engine.rate(
+            state[:, 0],
+            state[:, 1],
+            state[:, 2],
+            player,
+            np.array([g.classical_rating for g in games], dtype=float),
+            np.array([g.classical_rd for g in games], dtype=float),
+            np.array([g.verdict != "accepted" for g in games], dtype=float),
+        )
+        attempts = np.bincount(player, minlength=len(problem_ids))
+
+        await self.db.execute(
+            update(Problem),
+            [
+                {
+                    "id": problem_id,
+                    "rating": float(rating[i]),
+                    "rating_rd": float(rd[i]),
+                    "rating_volatility": float(volatility[i]),
+                    "rating_attempts": problems[problem_id][3] + int(attempts[i]),
+                    "rating_fitted_at": now,
+                }
+                for i, problem_id in enumerate(problem_ids)
+            ],
+        )
+        await self.db.commit()
+        print(f"🧮 Fitted ratings for {len(problem_ids)} problem(s) from {len(games)} attempt(s)")
+        return len(problem_ids)
@@ -1,11 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import date
 
 from app.models.problem import Problem
 from app.schemas.problem import ProblemCreate, ProblemUpdate
+from app.engines.problem_similarity import problem_index
 
 class ProblemService:
     def __init__(self, db: AsyncSession):
@@ -20,6 +21,15 @@ class ProblemService:
                 detail=f"Problem with slug '{data.slug}' already exists"
             )
 
+        # Reject reworded copies of an existing problem
+        duplicate = await self.find_near_duplicate(data)
+        if duplicate:
+            slug, score = duplicate
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Problem is a near-duplicate of '{slug}' (similarity {score:.2f})"
+            )
+
         new_problem = Problem(
             title=data.title,
             slug=data.slug,
@@ -33,8 +43,24 @@ class ProblemService:
         self.db.add(new_problem)
         await self.db.commit()
         await self.db.refresh(new_problem)
+
+        problem_index.add_problem(new_problem)
+        await problem_index.save_async()
         return new_problem
 
+    async def find_near_duplicate(self, data: ProblemCreate) -> Optional[Tuple[str, float]]:
+        """
+        (slug, similarity) of the most similar existing problem at or above
+        PROBLEM_DUPLICATE_THRESHOLD, or None.
+        """
+        await problem_index.ensure_loaded(self.db)
+        signature = problem_index.signature_for(data.title, data.description, data.test_cases.model_dump())
+        match = problem_index.find_duplicate(signature)
+        if not match:
+            return None
+        _, slug, score = match
+        return slug, score
+
     async def get_problem_by_slug(self, slug: str) -> Problem:
         result = await self.db.execute(select(Problem).where(Problem.slug == slug))
         problem = result.scalar_one_or_none()
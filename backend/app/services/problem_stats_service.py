@@ -0,0 +1,145 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from typing import Optional
+
+from app.core.database import upsert
+
+from app.models.problem import Problem
+from app.models.problem_stats import ProblemStatsSketch, ProblemSolveStats, generate_uuid
+from app.models.submission import Submission
+from app.engines.quantile_sketch import KLLSketch
+from app.schemas.problem import LanguageStats, ProblemStatsResponse, QuantileSummary
+
+class ProblemStatsService:
+    """
+    Maintains per-problem, per-language quantile sketches of accepted
+    runtimes/memory and summarizes them for problem pages.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def record_accepted(self, submission: Submission):
+        """
+        Fold an accepted submission into its problem/language sketch.
+        The row is created with ON CONFLICT DO NOTHING, then locked while it
+        is rewritten, so concurrent workers merge into the same sketch
+        instead of overwriting each other or failing on the first insert.
+        The writes run in a savepoint: if they fail, only they are rolled
+        back and the caller's transaction stays usable.
+        """
+        # Plain values, so nothing below reads through the caller's instance
+        problem_id, language = submission.problem_id, submission.language
+        runtime_ms, memory_kb = submission.runtime_ms, submission.memory_kb
+
+        async with self.db.begin_nested():
+            await upsert(
+                self.db,
+                ProblemStatsSketch,
+                {"id": generate_uuid(), "problem_id": problem_id, "language": language, "sample_count": 0},
+                conflict=["problem_id", "language"],
+            )
+            row = await self._get_row(problem_id, language, lock=True)
+
+            runtime = KLLSketch.from_dict(row.runtime_sketch)
+            memory = KLLSketch.from_dict(row.memory_sketch)
+            if runtime_ms is not None:
+                runtime.update(runtime_ms)
+            if memory_kb is not None:
+                memory.update(memory_kb)
+
+            # JSON columns are only flagged dirty on reassignment
+            row.runtime_sketch = runtime.to_dict()
+            row.memory_sketch = memory.to_dict()
+            row.sample_count = (row.sample_count or 0) + 1
+        await self.db.commit()
+
+    async def record_solve(self, submission: Submission) -> bool:
+        """
+        Count an accepted submission and claim the problem's first solve if
+        it is still free, in one INSERT ... ON CONFLICT DO UPDATE on the
+        problem's row: the first write creates the row as first solver,
+        later ones bump the count and keep the existing first solver, so two
+        simultaneous first solves cannot both win (or both lose). Returns
+        True if this submission's user became the first solver. Written in
+        a savepoint, so a failure leaves the caller's transaction usable.
+        """
+        submission_id, user_id = submission.id, submission.user_id
+        problem_id, solved_at = submission.problem_id, submission.created_at
+
+        async with self.db.begin_nested():
+            result = await upsert(
+                self.db,
+                ProblemSolveStats,
+                {
+                    "problem_id": problem_id,
+                    "accepted_count": 1,
+                    "first_solver_id": user_id,
+                    "first_submission_id": submission_id,
+                    "first_solved_at": solved_at,
+                },
+                conflict=["problem_id"],
+                update={
+                    "accepted_count": ProblemSolveStats.accepted_count + 1,
+                    "first_solver_id": func.coalesce(ProblemSolveStats.first_solver_id, user_id),
+                    "first_submission_id": func.coalesce(ProblemSolveStats.first_submission_id, submission_id),
+                    "first_solved_at": func.coalesce(ProblemSolveStats.first_solved_at, solved_at),
+                },
+                returning=[ProblemSolveStats.first_submission_id],
+            )
+            first = result.scalar_one()
+        await self.db.commit()
+        return first == submission_id
+
+    async def get_stats(self, problem: Problem) -> ProblemStatsResponse:
+        result = await self.db.execute(
+            select(ProblemStatsSketch)
+            .where(ProblemStatsSketch.problem_id == problem.id)
+            .order_by(ProblemStatsSketch.language)
+        )
+        rows = result.scalars().all()
+
+        overall_runtime = KLLSketch()
+        overall_memory = KLLSketch()
+        languages = []
+        for row in rows:
+            runtime = KLLSketch.from_dict(row.runtime_sketch)
+            memory = KLLSketch.from_dict(row.memory_sketch)
+            languages.append(self._summarize(row.language, row.sample_count, runtime, memory))
+            overall_runtime.merge(runtime)
+            overall_memory.merge(memory)
+
+        overall = self._summarize(
+            "all", sum(row.sample_count for row in rows), overall_runtime, overall_memory
+        )
+        return ProblemStatsResponse(
+            problem_id=problem.id,
+            slug=problem.slug,
+            overall=overall,
+            languages=languages,
+        )
+
+    async def _get_row(self, problem_id: str, language: str, lock: bool = False) -> Optional[ProblemStatsSketch]:
+        query = select(ProblemStatsSketch).where(
+            ProblemStatsSketch.problem_id == problem_id,
+            ProblemStatsSketch.language == language,
+        )
+        if lock:
+            query = query.with_for_update()
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    def _summarize(self, language: str, count: int, runtime: KLLSketch, memory: KLLSketch) -> LanguageStats:
+        return LanguageStats(
+            language=language,
+            sample_count=count,
+            runtime_ms=self._quantiles(runtime),
+            memory_kb=self._quantiles(memory),
+        )
+
+    def _quantiles(self, sketch: KLLSketch) -> QuantileSummary:
+        return QuantileSummary(
+            p50=sketch.quantile(0.5),
+            p90=sketch.quantile(0.9),
+            p99=sketch.quantile(0.99),
+        )
@@ -0,0 +1,253 @@
+"""
+KamiCode — Rating Periods
+
+Batch mode for classical ratings (RATING_PERIOD = "hourly" or "daily").
+Submissions are not rated as they arrive; when a period closes, every
+user who submitted during it gets one multi-opponent Glicko-2 update over
+all of their results, with one bulk compare-and-swap UPDATE for users and
+one bulk INSERT for rating_history (one row per user per period).
+
+Closed periods are recorded in rating_periods, so a missed run catches up
+on the next one and two workers cannot close the same period twice.
+Submissions already rated live (they have their own history row) are
+skipped, which makes switching modes safe.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.engines.achievement_tasks import process_achievement_event_task
+from app.engines.glicko2_batch import Glicko2Batch
+from app.engines.leaderboard import leaderboard
+from app.engines.rating_epoch import current_epoch_query, soft_reset
+from app.models.problem import Problem
+from app.models.rating_history import RatingHistory, generate_uuid
+from app.models.rating_period import RatingPeriod
+from app.models.submission import Submission
+from app.models.user import User
+from app.services.rating_replay import tiers_for
+from app.services.rating_service import RatingConflictError, problem_opponent
+
+settings = get_settings()
+
+PERIOD_LENGTHS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+}
+
+
+def _aware(moment: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def period_start(moment: datetime, period: str) -> datetime:
+    """Start of the period containing `moment` (UTC boundaries)."""
+    moment = _aware(moment).astimezone(timezone.utc)
+    if period == "hourly":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class RatingPeriodService:
+    def __init__(self, db: AsyncSession, period: str = None, engine: Glicko2Batch = None):
+        self.db = db
+        self.period = period or settings.RATING_PERIOD
+        self.engine = engine or Glicko2Batch()
+
+    @property
+    def enabled(self) -> bool:
+        return self.period in PERIOD_LENGTHS
+
+    async def close_due_periods(self, now: datetime = None) -> List[RatingPeriod]:
+        """Close every complete period not closed yet, oldest first."""
+        if not self.enabled:
+            return []
+        length = PERIOD_LENGTHS[self.period]
+        current = period_start(now or datetime.now(timezone.utc), self.period)
+
+        last_end = (await self.db.execute(
+            select(func.max(RatingPeriod.ends_at)).where(RatingPeriod.context == "classical")
+        )).scalar_one_or_none()
+        # The first run only picks up the last complete period
+        start = _aware(last_end) if last_end else current - length
+
+        closed = []
+        while start + length <= current:
+            period = await self.close_period(start, start + length)
+            if period is None:
+                break
+            closed.append(period)
+            start += length
+        return closed
+
+    async def close_period(self, starts_at: datetime, ends_at: datetime) -> Optional[RatingPeriod]:
+        """
+        Rate all unrated submissions in [starts_at, ends_at) in one batch.
+        Returns None if another worker closed the period first.
+        """
+        result = await self.db.execute(
+            select(
+                Submission.user_id,
+                Submission.verdict,
+                Problem.difficulty,
+                Problem.rating,
+                Problem.rating_rd,
+                Problem.rating_attempts,
+            )
+            .join(Problem, Submission.problem_id == Problem.id)
+            .where(
+                Submission.created_at >= starts_at,
+                Submission.created_at < ends_at,
+                ~exists().where(RatingHistory.submission_id == Submission.id),
+            )
+        )
+        games = result.all()
+
+        period = RatingPeriod(context="classical", starts_at=starts_at, ends_at=ends_at, games=len(games))
+        try:
+            # Claim the period first; a concurrent close fails here on the unique constraint
+            self.db.add(period)
+            await self.db.flush()
+            history, tiers = await self._rate(games, ends_at)
+            period.users_rated = len(history)
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            return None
+
+        await leaderboard.update_many((row["user_id"], row["new_rating"]) for row in history)
+        print(f"📈 Rating period {starts_at:%Y-%m-%d %H:%M} closed: {len(games)} game(s), {len(history)} user(s)")
+        self._notify(history, tiers, period.id)
+        return period
+
+    async def _rate(self, games, ends_at: datetime) -> Tuple[List[dict], dict]:
+        """
+        Rate every user with games in the period. The user UPDATE is a
+        compare-and-swap on rating_version like every other rating write;
+        users whose rating moved underneath the batch (a settled season
+        reset, a replay) are re-read and re-rated.
+        """
+        pending = sorted({game.user_id for game in games})
+        history, tiers = [], {}
+        for attempt in range(settings.RATING_CAS_RETRIES):
+            rated, rated_tiers, pending = await self._rate_users(pending, games, ends_at)
+            history.extend(rated)
+            tiers.update(rated_tiers)
+            if not pending:
+                return history, tiers
+        raise RatingConflictError(
+            f"Rating period ending {ends_at:%Y-%m-%d %H:%M} lost {settings.RATING_CAS_RETRIES} "
+            f"compare-and-swap attempts for {len(pending)} user(s)"
+        )
+
+    async def _rate_users(self, user_ids: List[str], games, ends_at: datetime) -> Tuple[List[dict], dict, List[str]]:
+        """One read-compute-CAS round. Returns (history, tiers, users that lost the swap)."""
+        result = await self.db.execute(
+            select(
+                User.id,
+                User.classical_rating,
+                User.classical_rd,
+                User.volatility,
+                User.league_tier,
+                User.rating_version,
+                User.rating_epoch,
+                current_epoch_query().label("epoch"),
+            ).where(User.id.in_(user_ids))
+        )
+        rows = {row.id: row for row in result.all()}
+        user_ids = [user_id for user_id in user_ids if user_id in rows]
+        if not user_ids:
+            return [], {}, []
+        games = [game for game in games if game.user_id in rows]
+        index = {user_id: i for i, user_id in enumerate(user_ids)}
+
+        # Pending season soft resets are applied before the period's games
+        start = [
+            soft_reset(row.classical_rating, row.classical_rd, row.league_tier, row.epoch - row.rating_epoch)
+            for row in (rows[u] for u in user_ids)
+        ]
+        rating = np.array([r for r, _ in start], dtype=float)
+        rd = np.array([d for _, d in start], dtype=float)
+        volatility = np.array([rows[u].volatility for u in user_ids], dtype=float)
+
+        opponents = [problem_opponent(g.difficulty, g.rating, g.rating_rd, g.rating_attempts) for g in games]
+        new_rating, new_rd, new_volatility = self.engine.rate(
+            rating,
+            rd,
+            volatility,
+            np.array([index[g.user_id] for g in games], dtype=np.intp),
+            np.array([o[0] for o in opponents], dtype=float),
+            np.array([o[1] for o in opponents], dtype=float),
+            np.array([g.verdict == "accepted" for g in games], dtype=float),
+        )
+        tiers = dict(zip(user_ids, tiers_for(new_rating)))
+
+        updates = [
+            {
+                "b_id": user_id,
+                "b_version": rows[user_id].rating_version,
+                "classical_rating": float(new_rating[i]),
+                "classical_rd": float(new_rd[i]),
+                "volatility": float(new_volatility[i]),
+                "league_tier": tiers[user_id],
+                "rating_version": rows[user_id].rating_version + 1,
+                "rating_epoch": max(rows[user_id].epoch, rows[user_id].rating_epoch),
+            }
+            for i, user_id in enumerate(user_ids)
+        ]
+        users = User.__table__
+        swapped = await self.db.execute(
+            update(users).where(users.c.id == bindparam("b_id"), users.c.rating_version == bindparam("b_version")),
+            updates,
+        )
+        lost = set()
+        if swapped.rowcount != len(updates):
+            # Some drivers report -1 for executemany; the rows we won hold our values until commit
+            written = await self.db.execute(
+                select(User.id, User.rating_version, User.classical_rating).where(User.id.in_(user_ids))
+            )
+            ours = {row["b_id"]: (row["rating_version"], row["classical_rating"]) for row in updates}
+            lost = {row.id for row in written.all() if (row.rating_version, row.classical_rating) != ours[row.id]}
+        if lost:
+            print(f"🔁 {len(lost)} user(s) changed during the rating period close; re-rating them")
+
+        history = [
+            {
+                "id": generate_uuid(),
+                "user_id": user_id,
+                "submission_id": None,
+                "old_rating": float(rating[i]),
+                "new_rating": float(new_rating[i]),
+                "rating_change": float(new_rating[i] - rating[i]),
+                "old_deviation": float(rd[i]),
+                "new_deviation": float(new_rd[i]),
+                "context": "classical",
+                "created_at": ends_at,
+                "updated_at": ends_at,
+            }
+            for i, user_id in enumerate(user_ids)
+            if user_id not in lost
+        ]
+        if history:
+            await self.db.execute(insert(RatingHistory), history)
+        won = {row["user_id"] for row in history}
+        return history, {u: tier for u, tier in tiers.items() if u in won}, sorted(lost)
+
+    def _notify(self, history: List[dict], tiers: dict, period_id: str):
+        for row in history:
+            try:
+                process_achievement_event_task.delay("rating.updated", {
+                    "user_id": row["user_id"],
+                    "trigger_id": period_id,
+                    "new_rating": row["new_rating"],
+                    "tier": tiers[row["user_id"]],
+                })
+            except Exception as e:
+                print(f"⚠️ Failed to enqueue rating achievement: {e}")
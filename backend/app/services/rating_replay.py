@@ -0,0 +1,204 @@
+"""
+KamiCode — Rating Replay
+
+Recomputes every user's classical rating from scratch by replaying all
+submissions in time order through the vectorized Glicko-2 engine, then
+rewrites `users` and the classical `rating_history` in bulk. Used after a
+change to the rating formula.
+
+Submissions are streamed through a server-side cursor in partitions. Each
+partition is split into waves holding at most one submission per user, so
+every user's submissions are still applied one at a time and in order,
+exactly as the live per-submission update does, while a wave updates all
+of its users in a single array operation.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.engines.glicko2_batch import Glicko2Batch
+from app.engines.leaderboard import leaderboard
+from app.engines.league_engine import TIER_THRESHOLDS, TIERS_ORDER
+from app.engines.rating_epoch import current_epoch_query
+from app.models.problem import Problem
+from app.models.rating_history import RatingHistory, generate_uuid
+from app.models.submission import Submission
+from app.models.user import User
+from app.services.rating_service import problem_opponent
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+_TIER_FLOORS = np.array([TIER_THRESHOLDS[tier] for tier in TIERS_ORDER])
+
+
+@dataclass
+class ReplayStats:
+    users: int = 0
+    events: int = 0
+    waves: int = 0
+    seconds: float = 0.0
+
+    @property
+    def events_per_minute(self) -> float:
+        return self.events / self.seconds * 60 if self.seconds else 0.0
+
+
+def occurrence_rank(player: np.ndarray) -> np.ndarray:
+    """For each game, how many earlier games in the array belong to the same player."""
+    order = np.argsort(player, kind="stable")
+    sorted_player = player[order]
+    starts = np.r_[True, sorted_player[1:] != sorted_player[:-1]]
+    group_start = np.maximum.accumulate(np.where(starts, np.arange(len(player)), 0))
+    rank = np.empty(len(player), dtype=np.intp)
+    rank[order] = np.arange(len(player)) - group_start
+    return rank
+
+
+def tiers_for(ratings: np.ndarray) -> List[str]:
+    """Vectorized LeagueEngine.determine_target_tier."""
+    index = np.clip(np.searchsorted(_TIER_FLOORS, ratings, side="right") - 1, 0, len(TIERS_ORDER) - 1)
+    return [TIERS_ORDER[i] for i in index]
+
+
+class RatingReplayService:
+    def __init__(self, db: AsyncSession, engine: Glicko2Batch = None):
+        self.db = db
+        self.engine = engine or Glicko2Batch()
+
+    async def replay(self, chunk_size: int = DEFAULT_CHUNK_SIZE, dry_run: bool = False) -> ReplayStats:
+        """
+        Rebuild classical ratings and rating history from all submissions.
+        With `dry_run` everything is computed but the transaction is rolled back.
+        """
+        stats = ReplayStats()
+        started = time.perf_counter()
+
+        users = (await self.db.execute(select(User.id, User.rating_version).order_by(User.id))).all()
+        user_ids = [user.id for user in users]
+        index: Dict[str, int] = {user_id: i for i, user_id in enumerate(user_ids)}
+        stats.users = len(user_ids)
+
+        # Replayed ratings are the current state; no season reset is pending on them
+        epoch = (await self.db.execute(select(current_epoch_query()))).scalar_one()
+
+        columns = User.__table__.c
+        rating = np.full(len(user_ids), columns.classical_rating.default.arg, dtype=float)
+        rd = np.full(len(user_ids), columns.classical_rd.default.arg, dtype=float)
+        volatility = np.full(len(user_ids), columns.volatility.default.arg, dtype=float)
+
+        await self.db.execute(delete(RatingHistory).where(RatingHistory.context == "classical"))
+
+        query = (
+            select(
+                Submission.id,
+                Submission.user_id,
+                Submission.verdict,
+                Submission.created_at,
+                Problem.difficulty,
+                Problem.rating,
+                Problem.rating_rd,
+                Problem.rating_attempts,
+            )
+            .join(Problem, Submission.problem_id == Problem.id)
+            .order_by(Submission.created_at, Submission.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.db.stream(query)
+        async for partition in result.partitions(chunk_size):
+            history = self._replay_partition(partition, index, rating, rd, volatility, stats)
+            if history:
+                await self.db.execute(insert(RatingHistory), history)
+            stats.events += len(partition)
+
+        if user_ids:
+            await self.db.execute(
+                update(User),
+                [
+                    {
+                        "id": user_id,
+                        "classical_rating": float(rating[i]),
+                        "classical_rd": float(rd[i]),
+                        "volatility": float(volatility[i]),
+                        "league_tier": tier,
+                        "rating_version": users[i].rating_version + 1,
+                        "rating_epoch": epoch,
+                    }
+                    for i, (user_id, tier) in enumerate(zip(user_ids, tiers_for(rating)))
+                ],
+            )
+
+        if dry_run:
+            await self.db.rollback()
+        else:
+            await self.db.commit()
+            await leaderboard.update_many(zip(user_ids, rating))
+
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def _replay_partition(
+        self,
+        rows,
+        index: Dict[str, int],
+        rating: np.ndarray,
+        rd: np.ndarray,
+        volatility: np.ndarray,
+        stats: ReplayStats,
+    ) -> List[dict]:
+        """Apply one partition of time-ordered submissions; returns its history rows."""
+        rows = [row for row in rows if row.user_id in index]
+        if not rows:
+            return []
+
+        player = np.fromiter((index[row.user_id] for row in rows), dtype=np.intp, count=len(rows))
+        opponents = [problem_opponent(row.difficulty, row.rating, row.rating_rd, row.rating_attempts) for row in rows]
+        opp_rating = np.array([o[0] for o in opponents], dtype=float)
+        opp_rd = np.array([o[1] for o in opponents], dtype=float)
+        score = np.fromiter((row.verdict == "accepted" for row in rows), dtype=float, count=len(rows))
+
+        old_rating = np.empty(len(rows))
+        old_rd = np.empty(len(rows))
+        new_rating = np.empty(len(rows))
+        new_rd = np.empty(len(rows))
+
+        # Waves of at most one game per user, in order of each user's games
+        rank = occurrence_rank(player)
+        order = np.argsort(rank, kind="stable")
+        bounds = np.flatnonzero(np.diff(rank[order])) + 1
+        for wave in np.split(order, bounds):
+            players = player[wave]
+            old_rating[wave], old_rd[wave] = rating[players], rd[players]
+            r, d, v = self.engine.rate(
+                rating[players],
+                rd[players],
+                volatility[players],
+                np.arange(len(wave)),
+                opp_rating[wave],
+                opp_rd[wave],
+                score[wave],
+            )
+            rating[players], rd[players], volatility[players] = r, d, v
+            new_rating[wave], new_rd[wave] = r, d
+            stats.waves += 1
+
+        return [
+            {
+                "id": generate_uuid(),
+                "user_id": row.user_id,
+                "submission_id": row.id,
+                "old_rating": float(old_rating[i]),
+                "new_rating": float(new_rating[i]),
+                "rating_change": float(new_rating[i] - old_rating[i]),
+                "old_deviation": float(old_rd[i]),
+                "new_deviation": float(new_rd[i]),
+                "context": "classical",
+                "created_at": row.created_at,
+                "updated_at": row.created_at,
+            }
+            for i, row in enumerate(rows)
+        ]
@@ -1,6 +1,11 @@
+import asyncio
+import random
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import select, update
+from typing import Optional, Tuple
+
+from app.core.config import get_settings
 
 from app.models.user import User
 from app.models.problem import Problem
@@ -8,8 +13,32 @@ from app.models.submission import Submission
 from app.models.rating_history import RatingHistory
 from app.engines.glicko2 import Glicko2
 from app.engines.league_engine import LeagueEngine
+from app.engines.leaderboard import leaderboard
+from app.engines.rating_epoch import current_epoch_query, soft_reset
 from app.engines.achievement_tasks import process_achievement_event_task
 
+settings = get_settings()
+
+# Prior "opponent" (rating, RD) per difficulty, until a problem has a fitted rating
+DIFFICULTY_RATINGS = {
+    "easy": (1000, 200),
+    "medium": (1500, 150),
+    "hard": (2000, 100)
+}
+DEFAULT_DIFFICULTY_RATING = (1200, 200)
+
+def problem_opponent(
+    difficulty: Optional[str], rating: Optional[float] = None, rd: Optional[float] = None, attempts: int = 0
+) -> Tuple[float, float]:
+    """(rating, RD) a problem plays with: its fitted rating once it has enough attempts, else the prior."""
+    if rating is not None and rd is not None and (attempts or 0) >= settings.PROBLEM_RATING_MIN_ATTEMPTS:
+        return rating, rd
+    return DIFFICULTY_RATINGS.get((difficulty or "").lower(), DEFAULT_DIFFICULTY_RATING)
+
+class RatingConflictError(Exception):
+    """Raised when a rating update keeps losing the compare-and-swap race."""
+
+
 class RatingEngine:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -19,10 +48,43 @@ class RatingEngine:
     async def update_user_rating(self, user_id: str, submission_id: str) -> Optional[RatingHistory]:
         """
         Process a submission and update the user's rating based on difficulty and performance.
+
+        The write is a compare-and-swap on users.rating_version: if another
+        worker updated the rating between our read and our write, nothing is
+        written and the update is recomputed from fresh state, so concurrent
+        submissions from one user never overwrite each other.
         """
-        # 1. Fetch data
+        for attempt in range(settings.RATING_CAS_RETRIES):
+            history = await self._try_update(user_id, submission_id)
+            if history is not False:
+                return history
+            await self.db.rollback()
+            # Jittered backoff so colliding workers spread out
+            await asyncio.sleep(random.uniform(0, 0.005 * 2 ** min(attempt, 6)))
+
+        raise RatingConflictError(
+            f"Rating update for user {user_id} (submission {submission_id}) lost "
+            f"{settings.RATING_CAS_RETRIES} compare-and-swap attempts"
+        )
+
+    async def _try_update(self, user_id: str, submission_id: str):
+        """One read-compute-CAS round. Returns False when the version moved underneath us."""
+        # 1. Fetch data (plain columns, so a retry never sees a stale identity-map copy)
         result = await self.db.execute(
-            select(User, Submission, Problem)
+            select(
+                User.classical_rating,
+                User.classical_rd,
+                User.volatility,
+                User.league_tier,
+                User.rating_version,
+                User.rating_epoch,
+                current_epoch_query().label("epoch"),
+                Submission.verdict,
+                Problem.difficulty,
+                Problem.rating.label("problem_rating"),
+                Problem.rating_rd.label("problem_rd"),
+                Problem.rating_attempts.label("problem_attempts"),
+            )
             .join(Submission, User.id == Submission.user_id)
             .join(Problem, Submission.problem_id == Problem.id)
             .where(Submission.id == submission_id, User.id == user_id)
@@ -30,45 +92,58 @@ class RatingEngine:
         data = result.one_or_none()
         if not data:
             return None
-        
-        user, submission, problem = data
 
-        # 2. Determine Problem "Rating" and "RD" based on difficulty
-        # In this simplified model, each difficulty has a baseline rating.
-        difficulty_mapping = {
-            "easy": (1000, 200),
-            "medium": (1500, 150),
-            "hard": (2000, 100)
-        }
-        opp_rating, opp_rd = difficulty_mapping.get(problem.difficulty.lower(), (1200, 200))
+        # A replayed task must not rate the same submission twice
+        existing = await self.db.execute(
+            select(RatingHistory).where(
+                RatingHistory.submission_id == submission_id, RatingHistory.context == "classical"
+            )
+        )
+        history = existing.scalar_one_or_none()
+        if history:
+            return history
+
+        # 2. Determine Problem "Rating" and "RD": fitted per problem, cached on its row
+        opp_rating, opp_rd = problem_opponent(data.difficulty, data.problem_rating, data.problem_rd, data.problem_attempts)
 
         # 3. Determine actual score
-        actual_score = 1.0 if submission.verdict == "accepted" else 0.0
+        actual_score = 1.0 if data.verdict == "accepted" else 0.0
 
         # 4. Use Glicko-2 to calculate new parameters
         # Select appropriate rating/rd based on context (default to classical for now)
-        old_rating = user.classical_rating
-        old_rd = user.classical_rd
-        
+        # A rating from before the last season close takes its pending soft reset first
+        old_rating, old_rd = soft_reset(
+            data.classical_rating, data.classical_rd, data.league_tier, data.epoch - data.rating_epoch
+        )
+
         new_rating, new_rd, new_vol = self.glicko.calculate_new_rating(
             rating=old_rating,
             rd=old_rd,
-            volatility=user.volatility,
+            volatility=data.volatility,
             opponent_rating=opp_rating,
             opponent_rd=opp_rd,
             actual_score=actual_score
         )
 
-        # 5. Update User
+        # 5. Update User only if nobody else has since (Promotion/Demotion included)
         change = new_rating - old_rating
-        user.classical_rating = new_rating
-        user.classical_rd = new_rd
-        user.volatility = new_vol
-
-        # 6. Process Tier Change (Promotion/Demotion)
-        self.league.process_tier_change(user, new_rating)
+        tier = self.league.determine_target_tier(new_rating)
+        swapped = await self.db.execute(
+            update(User)
+            .where(User.id == user_id, User.rating_version == data.rating_version)
+            .values(
+                classical_rating=new_rating,
+                classical_rd=new_rd,
+                volatility=new_vol,
+                league_tier=tier,
+                rating_version=data.rating_version + 1,
+                rating_epoch=max(data.epoch, data.rating_epoch),
+            )
+        )
+        if swapped.rowcount != 1:
+            return False
 
-        # 7. Create Rating History record
+        # 6. Create Rating History record
         history = RatingHistory(
             user_id=user_id,
             submission_id=submission_id,
@@ -83,14 +158,15 @@ class RatingEngine:
         
         await self.db.commit()
         await self.db.refresh(history)
+        await leaderboard.update(user_id, new_rating)
         
-        # 8. Trigger Achievement: rating.updated
+        # 7. Trigger Achievement: rating.updated
         try:
             process_achievement_event_task.delay("rating.updated", {
                 "user_id": user_id,
                 "submission_id": submission_id,
                 "new_rating": new_rating,
-                "tier": user.league_tier
+                "tier": tier
             })
         except Exception as e:
             print(f"⚠️ Failed to enqueue rating achievement: {e}")
@@ -0,0 +1,108 @@
+"""
+KamiCode — Daily Streaks
+
+Keeps each user's daily challenge streak (current, longest, last active
+day) in user_streaks. An accepted daily submission moves the streak with
+one INSERT ... ON CONFLICT DO UPDATE: same day, no change; the day after
+the last active day, +1; any later day, back to 1. A day is a calendar day in
+STREAK_TIMEZONE. `backfill` rebuilds every row from submissions in one
+streaming pass, for existing data or after changing the timezone.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, case, delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import upsert
+from app.models.submission import Submission
+from app.models.user_streak import UserStreak
+
+settings = get_settings()
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+class StreakService:
+    def __init__(self, db: AsyncSession, zone: str = None):
+        self.db = db
+        self.zone = ZoneInfo(zone or settings.STREAK_TIMEZONE)
+
+    def day_of(self, moment: datetime) -> date:
+        # SQLite hands timezone-aware columns back naive
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.astimezone(self.zone).date()
+
+    async def record_accepted(self, submission: Submission):
+        """Count an accepted daily submission towards its user's streak."""
+        if submission.verdict != "accepted" or not submission.is_daily:
+            return
+        user_id = submission.user_id
+        day = self.day_of(submission.created_at or datetime.now(timezone.utc))
+        continued = UserStreak.last_active_day == day - timedelta(days=1)
+
+        # The first solve creates the row; only a later day moves an existing
+        # streak, so repeats and late arrivals are no-ops. The savepoint keeps
+        # a failure here from aborting the caller's transaction.
+        async with self.db.begin_nested():
+            await upsert(
+                self.db,
+                UserStreak,
+                {"user_id": user_id, "current_streak": 1, "longest_streak": 1, "last_active_day": day},
+                conflict=["user_id"],
+                update={
+                    "current_streak": case((continued, UserStreak.current_streak + 1), else_=1),
+                    "longest_streak": case(
+                        (and_(continued, UserStreak.current_streak + 1 > UserStreak.longest_streak),
+                         UserStreak.current_streak + 1),
+                        (UserStreak.longest_streak < 1, 1),
+                        else_=UserStreak.longest_streak,
+                    ),
+                    "last_active_day": day,
+                },
+                where=or_(UserStreak.last_active_day.is_(None), UserStreak.last_active_day < day),
+            )
+        await self.db.commit()
+
+    async def backfill(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Rebuild every user's streak from accepted daily submissions. Returns users written."""
+        await self.db.execute(delete(UserStreak))
+
+        result = await self.db.stream(
+            select(Submission.user_id, Submission.created_at)
+            .where(Submission.verdict == "accepted", Submission.is_daily == True)
+            .order_by(Submission.user_id, Submission.created_at)
+            .execution_options(yield_per=chunk_size)
+        )
+        rows: List[dict] = []
+        users = 0
+        state: Optional[dict] = None
+        async for partition in result.partitions(chunk_size):
+            for user_id, created_at in partition:
+                day = self.day_of(created_at)
+                if state is None or state["user_id"] != user_id:
+                    if state is not None:
+                        rows.append(state)
+                    state = {"user_id": user_id, "current_streak": 0, "longest_streak": 0, "last_active_day": None}
+                last = state["last_active_day"]
+                if last == day:
+                    continue
+                state["current_streak"] = state["current_streak"] + 1 if last == day - timedelta(days=1) else 1
+                state["longest_streak"] = max(state["longest_streak"], state["current_streak"])
+                state["last_active_day"] = day
+            if len(rows) >= chunk_size:
+                await self.db.execute(insert(UserStreak), rows)
+                users += len(rows)
+                rows = []
+        if state is not None:
+            rows.append(state)
+        if rows:
+            await self.db.execute(insert(UserStreak), rows)
+            users += len(rows)
+
+        await self.db.commit()
+        return users
@@ -1,4 +1,5 @@
-import asyncio
+import logging
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from fastapi import HTTPException, status
@@ -9,9 +10,18 @@ from app.models.submission import Submission
 from app.schemas.submission import SubmissionCreate
 from app.services.sandbox import get_sandbox
 from app.services.ai_analysis_service import AIAnalysisService
+from app.services.problem_stats_service import ProblemStatsService
+from app.services.streak_service import StreakService
+from app.services.analysis_queue import analysis_queue
 from app.engines.rating_tasks import update_user_rating_task
 from app.engines.achievement_tasks import process_achievement_event_task
+from app.engines.runtime_distribution import runtime_distributions
 from app.core.websocket import manager
+from app.core.task_supervisor import task_supervisor
+from app.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 class SubmissionService:
     def __init__(self, db: AsyncSession):
@@ -56,16 +66,35 @@ class SubmissionService:
         await self.db.commit()
         await self.db.refresh(new_submission)
         
-        # 5. Trigger AI Analysis if accepted (runs as asyncio background task within uvicorn's loop)
+        # 5. Trigger AI Analysis if accepted (local estimate now, model via the bounded analysis queue)
         if new_submission.verdict == "accepted":
-            async def _run_analysis(sub_id: str):
-                from app.core.database import async_session_maker
-                from app.services.ai_analysis_service import AIAnalysisService
-                async with async_session_maker() as analysis_db:
-                    service = AIAnalysisService(analysis_db)
-                    await service.analyze_submission(sub_id)
+            runtime_distributions.record(
+                new_submission.problem_id, new_submission.language,
+                new_submission.id, new_submission.runtime_ms,
+            )
+            # Each step writes in its own savepoint, so one failing leaves the session usable for the rest
+            try:
+                await ProblemStatsService(self.db).record_accepted(new_submission)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to update problem stats sketch: {e}")
+            try:
+                await ProblemStatsService(self.db).record_solve(new_submission)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to record solve: {e}")
+            # Before the achievement event, so first-solver and streak rules see this solve
+            try:
+                await StreakService(self.db).record_accepted(new_submission)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to update daily streak: {e}")
 
-            asyncio.create_task(_run_analysis(new_submission.id))
+            # A local static estimate is stored right away; the model adds the quality review
+            try:
+                needs_model = await AIAnalysisService(self.db).record_local_estimate(new_submission)
+            except Exception as e:
+                logger.warning(f"⚠️ Local complexity estimate failed: {e}")
+                needs_model = True
+            if needs_model:
+                analysis_queue.enqueue(new_submission.id)
 
             try:
                 # Achievement: submission.accepted
@@ -75,17 +104,18 @@ class SubmissionService:
                     "problem_id": new_submission.problem_id
                 })
             except Exception as e:
-                print(f"⚠️ Failed to enqueue achievement: {e}")
+                logger.warning(f"⚠️ Failed to enqueue achievement: {e}")
         
-        # 6. Trigger Rating Update
-        try:
-            update_user_rating_task.delay(new_submission.user_id, new_submission.id)
-        except Exception as e:
-            print(f"⚠️ Failed to enqueue rating update: {e}")
+        # 6. Trigger Rating Update (in period mode the submission is rated when its period closes)
+        if settings.RATING_PERIOD == "submission":
+            try:
+                update_user_rating_task.delay(new_submission.user_id, new_submission.id)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to enqueue rating update: {e}")
         
         # 7. Broadcast Solve Event
         if new_submission.verdict == "accepted":
-            asyncio.create_task(manager.broadcast({
+            task_supervisor.spawn("broadcast", manager.broadcast({
                 "type": "ACTIVITY_SOLVE",
                 "data": {
                     "username": "User", # In a real app, fetch the username
@@ -93,7 +123,7 @@ class SubmissionService:
                     "accuracy": f"{int((new_submission.passed_count / new_submission.total_count) * 100)}%",
                     "timestamp": "Just now"
                 }
-            }))
+            }), name="activity-solve")
 
         return new_submission
 
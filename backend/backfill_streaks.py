@@ -0,0 +1,24 @@
+"""
+Rebuild every user's daily streak from accepted daily submissions.
+
+    python backfill_streaks.py
+    python backfill_streaks.py --chunk-size 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.database import async_session_maker
+from app.services.streak_service import StreakService, DEFAULT_CHUNK_SIZE
+
+async def backfill(args):
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        users = await StreakService(session).backfill(chunk_size=args.chunk_size)
+    print(f"✅ Rebuilt streaks for {users:,} users in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild daily streaks from submissions")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    asyncio.run(backfill(parser.parse_args()))
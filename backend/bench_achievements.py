@@ -0,0 +1,83 @@
+"""
+Microbenchmark: achievement event evaluation with the compiled rule index.
+
+Times rule lookup per event the old way (read and parse
+achievement_definitions.yaml, then filter every rule by trigger) against
+the cached trigger index, then runs AchievementEngine.process_event end to
+end on an in-memory SQLite database for a mix of events.
+
+    python bench_achievements.py --events 2000
+"""
+
+import argparse
+import asyncio
+import time
+
+import yaml
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.engines import achievement_engine
+from app.engines.achievement_engine import AchievementEngine
+from app.engines.achievement_rules import DEFINITIONS_PATH, achievement_rules
+from app.models import Base
+from app.models.user import User
+
+TRIGGERS = ["submission.accepted", "rating.updated", "rush.completed", "submission.analyzed"]
+
+
+def _parse_per_event(events: int) -> float:
+    start = time.perf_counter()
+    for i in range(events):
+        with open(DEFINITIONS_PATH, "r") as f:
+            definitions = yaml.safe_load(f)
+        trigger = TRIGGERS[i % len(TRIGGERS)]
+        [rule for rule in definitions.get("achievements", []) if rule.get("trigger") == trigger]
+    return time.perf_counter() - start
+
+
+def _cached_index(events: int) -> float:
+    start = time.perf_counter()
+    for i in range(events):
+        achievement_rules.get().for_trigger(TRIGGERS[i % len(TRIGGERS)])
+    return time.perf_counter() - start
+
+
+async def _process_events(events: int) -> float:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as db:
+        await db.execute(insert(User).values(id="u1", username="u1", email="u1@example.com"))
+        await db.commit()
+
+    start = time.perf_counter()
+    async with session_maker() as db:
+        for i in range(events):
+            # Below every threshold, so each event evaluates its rules without awarding
+            await AchievementEngine(db).process_event("rush.completed", {"user_id": "u1", "streak": i % 10})
+            await AchievementEngine(db).process_event("rating.updated", {"user_id": "u1", "tier": "bronze"})
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed
+
+
+async def main(events: int):
+    achievement_engine.print = lambda *args, **kwargs: None
+    achievement_rules.get()
+
+    parsed = _parse_per_event(events)
+    cached = _cached_index(events)
+    processed = await _process_events(events)
+
+    print(f"events:               {events}")
+    print(f"parse YAML per event  {parsed / events * 1e6:.1f} µs/event")
+    print(f"cached rule index     {cached / events * 1e6:.1f} µs/event")
+    print(f"process_event         {2 * events / processed:.0f} events/s (SQLite in memory)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().events))
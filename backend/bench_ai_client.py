@@ -0,0 +1,98 @@
+"""
+Microbenchmark: per-call httpx.AsyncClient vs the shared pooled AIClient connection.
+
+Starts a local OpenAI-compatible stub on 127.0.0.1 and times N sequential
+generate_json calls each way. The stub is plain HTTP, so the saving shown
+here is the TCP handshake and client setup only; against the real HTTPS
+endpoint the TLS handshake is saved as well.
+
+    python bench_ai_client.py --calls 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.services import ai_client as ai_client_module
+from app.services.ai_client import AIClient, close_http_client
+
+_BODY = json.dumps({
+    "choices": [{"message": {"content": json.dumps({"time_complexity": "O(n)"})}}]
+}).encode()
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal keep-alive HTTP/1.1 responder for POST /chat/completions."""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: " + str(len(_BODY)).encode() + b"\r\n\r\n" + _BODY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+def _stub_client(url: str) -> AIClient:
+    client = AIClient()
+    client.client = True
+    client._url = url
+    client._headers = {"Authorization": "Bearer bench", "Content-Type": "application/json"}
+    return client
+
+
+async def _per_call(client: AIClient, calls: int) -> float:
+    payload = {"model": "bench", "messages": [{"role": "user", "content": "hi"}]}
+    start = time.perf_counter()
+    for _ in range(calls):
+        async with httpx.AsyncClient(timeout=ai_client_module._TIMEOUT) as http:
+            response = await http.post(client._url, headers=client._headers, json=payload)
+            response.raise_for_status()
+        client._extract_json(response.json()["choices"][0]["message"]["content"])
+    return time.perf_counter() - start
+
+
+async def _pooled(client: AIClient, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        await client.generate_json("system", "hi")
+    return time.perf_counter() - start
+
+
+async def main(calls: int):
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    client = _stub_client(f"http://127.0.0.1:{port}/chat/completions")
+
+    async with server:
+        # Warm both paths once so imports and first-connection costs are excluded
+        await _per_call(client, 1)
+        await _pooled(client, 1)
+
+        per_call = await _per_call(client, calls)
+        pooled = await _pooled(client, calls)
+        await close_http_client()
+
+    print(f"calls:              {calls}")
+    print(f"new client per call {per_call / calls * 1000:.3f} ms/call")
+    print(f"shared pooled       {pooled / calls * 1000:.3f} ms/call")
+    print(f"saved per call      {(per_call - pooled) / calls * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    asyncio.run(main(parser.parse_args().calls))
@@ -0,0 +1,42 @@
+"""
+Dump submissions, rating_history or ai_analyses as NDJSON/CSV for offline analytics.
+
+    python export_data.py submissions --format csv --since 2026-01-01 -o submissions.csv
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from app.core.database import async_session_maker
+from app.services.export_service import ExportService, EXPORT_FORMATS, EXPORT_TABLES, DEFAULT_CHUNK_SIZE
+
+async def export(args):
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        async with async_session_maker() as session:
+            service = ExportService(session)
+            async for chunk in service.stream(
+                args.table,
+                args.format,
+                since=args.since,
+                until=args.until,
+                problem_id=args.problem_id,
+                chunk_size=args.chunk_size,
+            ):
+                out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream a KamiCode table export")
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--problem-id")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("-o", "--output", help="Write to a file instead of stdout")
+    asyncio.run(export(parser.parse_args()))
@@ -0,0 +1,31 @@
+"""
+Grant (or revoke) access to the /admin routes.
+
+    python grant_admin.py devuser
+    python grant_admin.py devuser --revoke
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import update
+
+from app.core.database import async_session_maker
+from app.models.user import User
+
+async def grant(args):
+    async with async_session_maker() as session:
+        result = await session.execute(
+            update(User).where(User.username == args.username).values(is_admin=not args.revoke)
+        )
+        await session.commit()
+    if result.rowcount == 0:
+        print(f"❌ No user named '{args.username}'")
+    else:
+        print(f"✅ {args.username} is {'no longer' if args.revoke else 'now'} an admin")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grant or revoke admin access")
+    parser.add_argument("username")
+    parser.add_argument("--revoke", action="store_true")
+    asyncio.run(grant(parser.parse_args()))
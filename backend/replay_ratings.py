@@ -0,0 +1,28 @@
+"""
+Recompute every user's classical rating and rating_history from all submissions.
+
+    python replay_ratings.py --dry-run
+    python replay_ratings.py --chunk-size 100000
+"""
+
+import argparse
+import asyncio
+
+from app.core.database import async_session_maker
+from app.services.rating_replay import RatingReplayService, DEFAULT_CHUNK_SIZE
+
+async def replay(args):
+    async with async_session_maker() as session:
+        stats = await RatingReplayService(session).replay(chunk_size=args.chunk_size, dry_run=args.dry_run)
+
+    action = "Computed (dry run, nothing written)" if args.dry_run else "Replayed"
+    print(
+        f"✅ {action} {stats.events:,} submissions for {stats.users:,} users "
+        f"in {stats.seconds:.1f}s ({stats.events_per_minute:,.0f} events/min, {stats.waves:,} waves)"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay all submissions through Glicko-2")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Compute everything, then roll back")
+    asyncio.run(replay(parser.parse_args()))
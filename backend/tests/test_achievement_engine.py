@@ -0,0 +1,100 @@
+"""
+KamiCode — Achievement Engine Tests
+"""
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.engines import achievement_tasks
+from app.engines.achievement_engine import AchievementEngine
+from app.models import Base
+from app.models.achievement import UserAchievement
+from app.models.ai_analysis import AIAnalysis
+from app.models.problem import Problem
+from app.models.submission import Submission
+from app.models.user import User
+from app.services.problem_stats_service import ProblemStatsService
+
+
+@pytest.fixture
+async def session_maker(tmp_path, monkeypatch):
+    monkeypatch.setattr(achievement_tasks.mint_achievement_nft_task, "delay", lambda *args: None)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'achievements.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as db:
+        await db.execute(insert(User).values(id="u1", username="u1", email="u1@example.com", league_tier="Gold"))
+        await db.execute(insert(Problem).values(
+            id="p1", title="Easy", slug="easy", description="-", difficulty="easy", test_cases={},
+        ))
+        await db.execute(insert(Submission).values(
+            id="s1", user_id="u1", problem_id="p1", code="-", language="python", verdict="accepted",
+        ))
+        await db.commit()
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session_maker.statements = statements
+    yield session_maker
+    await engine.dispose()
+
+
+async def _earned(db):
+    return sorted((await db.execute(select(UserAchievement.achievement_type))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_event_costs_one_prefetch_and_one_insert(session_maker):
+    async with session_maker() as db:
+        session_maker.statements.clear()
+        await AchievementEngine(db).process_event("rating.updated", {"user_id": "u1", "tier": "gold"})
+        selects = [s for s in session_maker.statements if s.lstrip().upper().startswith("SELECT")]
+        inserts = [s for s in session_maker.statements if s.lstrip().upper().startswith("INSERT")]
+        assert len(selects) == 1 and len(inserts) == 1
+        assert await _earned(db) == ["GOLD_PROMO"]
+
+        # Already earned: just the prefetch
+        session_maker.statements.clear()
+        await AchievementEngine(db).process_event("rating.updated", {"user_id": "u1", "tier": "gold"})
+        assert len(session_maker.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_conditions_read_the_prefetched_snapshot(session_maker):
+    async with session_maker() as db:
+        # 100 scored solutions: s1 has the best quality score, s2 the second best.
+        # Runtime percentiles point the other way, and must not matter.
+        await db.execute(insert(Submission), [
+            {"id": f"s{i}", "user_id": "u1", "problem_id": "p1", "code": "-", "language": "python",
+             "verdict": "accepted"}
+            for i in range(2, 101)
+        ])
+        await db.execute(insert(AIAnalysis), [
+            {"id": f"a{i}", "submission_id": f"s{i}", "quality_score": 101 - i,
+             "quality_percentile": float(100 - i), "percentile_rank": float(i)}
+            for i in range(1, 101)
+        ])
+        await db.commit()
+        engine = AchievementEngine(db)
+
+        await engine.process_event("submission.analyzed", {"user_id": "u1", "analysis_id": "a2"})
+        assert "TOP_1_PCT" not in await _earned(db)
+        await engine.process_event("submission.analyzed", {"user_id": "u1", "analysis_id": "a1"})
+        assert "TOP_1_PCT" in await _earned(db)
+
+        # No solve recorded for p1 yet, so nobody is its first solver
+        await engine.process_event("submission.accepted", {"user_id": "u1", "submission_id": "s2", "problem_id": "p1"})
+        assert "FIRST_SOLVER" not in await _earned(db)
+        await ProblemStatsService(db).record_solve(await db.get(Submission, "s1"))
+        await engine.process_event("submission.accepted", {"user_id": "u1", "submission_id": "s1", "problem_id": "p1"})
+        assert "FIRST_SOLVER" in await _earned(db)
+
+        await engine.process_event("rush.completed", {"user_id": "u1", "streak": 9})
+        assert "RUSH_10" not in await _earned(db)
+        await engine.process_event("rush.completed", {"user_id": "u1", "streak": 12})
+        assert "RUSH_10" in await _earned(db) and "RUSH_50" not in await _earned(db)
+
+        # Unknown users are ignored
+        await engine.process_event("rush.completed", {"user_id": "nobody", "streak": 60})
+        assert (await db.execute(select(UserAchievement).where(UserAchievement.user_id == "nobody"))).first() is None
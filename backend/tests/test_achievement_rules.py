@@ -0,0 +1,78 @@
+"""
+KamiCode — Achievement Rule Index Tests
+"""
+
+import os
+
+import pytest
+
+from app.engines.achievement_rules import (
+    DEFINITIONS_PATH,
+    AchievementDefinitionError,
+    AchievementRuleCache,
+    compile_rules,
+)
+
+RULES = """
+achievements:
+  - id: RUSH_10
+    name: "Speed Demon"
+    description: "Reach a streak of 10 in Rush mode."
+    trigger: rush.completed
+    conditions:
+      - type: rush_streak_reaches
+        value: "10"
+"""
+
+
+def _write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_shipped_definitions_compile_and_index_by_trigger():
+    index = AchievementRuleCache(DEFINITIONS_PATH).get()
+    assert [rule.id for rule in index.for_trigger("rating.updated")] == [
+        "SILVER_PROMO", "GOLD_PROMO", "DIAMOND_PROMO", "GRANDMASTER_PROMO",
+    ]
+    assert index.for_trigger("unknown.event") == []
+    genesis = index.for_trigger("season.ended")[0]
+    assert genesis.conditions[0].params == {"season_slug": "season-1-genesis"}
+
+
+def test_condition_values_are_parsed_up_front():
+    rule = compile_rules({"achievements": [{
+        "id": "GOLD", "name": "Gold", "description": "-", "trigger": "rating.updated",
+        "conditions": [{"type": "tier_reaches", "value": "Gold"}, {"type": "streak_reaches", "value": "7"}],
+    }]}).rules[0]
+    assert [c.value for c in rule.conditions] == ["gold", 7]
+
+
+@pytest.mark.parametrize("condition", [
+    {"type": "no_such_condition"},
+    {"type": "streak_reaches"},
+    {"type": "quality_percentile", "value": "high"},
+])
+def test_invalid_conditions_are_rejected(condition):
+    with pytest.raises(AchievementDefinitionError):
+        compile_rules({"achievements": [{
+            "id": "X", "name": "X", "description": "-", "trigger": "t", "conditions": [condition],
+        }]})
+
+
+def test_cache_reloads_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "rules.yaml"
+    _write(path, RULES, 1_000)
+    cache = AchievementRuleCache(str(path))
+    first = cache.get()
+    assert cache.get() is first
+    assert first.for_trigger("rush.completed")[0].conditions[0].value == 10
+
+    _write(path, RULES.replace('"10"', "25"), 2_000)
+    second = cache.get()
+    assert second is not first
+    assert second.for_trigger("rush.completed")[0].conditions[0].value == 25
+
+    # A broken edit keeps the last good rules
+    _write(path, RULES.replace("rush_streak_reaches", "bogus"), 3_000)
+    assert cache.get() is second
@@ -0,0 +1,102 @@
+"""
+KamiCode — AI Analysis Tests
+"""
+
+import json
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.ai_analysis import AIAnalysis, QualityScoreCount
+from app.models.problem import Problem
+from app.models.submission import Submission
+from app.models.user import User
+from app.services import ai_analysis_service
+from app.services.ai_analysis_service import AIAnalysisService, REVIEW_MODEL
+
+TWO_SUM = """
+def two_sum(nums, t):
+    seen = {}
+    for i, x in enumerate(nums):
+        if t - x in seen:
+            return [seen[t - x], i]
+        seen[x] = i
+"""
+
+
+class FakeModel:
+    client = True
+
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_json(self, system_prompt, user_prompt, deadline=None):
+        self.prompts.append(system_prompt)
+        return json.dumps({"approach_name": "Hash Map", "quality_score": 92, "feedback": "Clean."})
+
+    async def generate_json_stream(self, system_prompt, user_prompt, on_field, deadline=None):
+        return await self.generate_json(system_prompt, user_prompt, deadline)
+
+
+@pytest.mark.asyncio
+async def test_confident_estimate_still_gets_a_quality_review(tmp_path, monkeypatch):
+    """The estimate settles the complexity; the model still scores quality."""
+    events = []
+    monkeypatch.setattr(ai_analysis_service.process_achievement_event_task, "delay", lambda *a: events.append(a))
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'analysis.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as db:
+        await db.execute(insert(User).values(id="u1", username="u1", email="u1@example.com"))
+        await db.execute(insert(Problem).values(
+            id="p1", title="Two Sum", slug="two-sum", description="-", difficulty="easy", test_cases={},
+        ))
+        submission = Submission(
+            id="s1", user_id="u1", problem_id="p1", code=TWO_SUM, language="python",
+            verdict="accepted", runtime_ms=12,
+        )
+        db.add(submission)
+        await db.commit()
+
+        model = FakeModel()
+        service = AIAnalysisService(db)
+        service.ai_client = model
+        assert await service.record_local_estimate(submission)
+        assert events == []  # Not final yet: no quality score
+
+        analysis = await service.analyze_submission("s1")
+
+    async with session_maker() as db:
+        rows = (await db.execute(select(AIAnalysis))).scalars().all()
+    await engine.dispose()
+
+    assert len(model.prompts) == 1 and "O(n) time" in model.prompts[0]
+    assert (analysis.time_complexity, analysis.space_complexity) == ("O(n)", "O(n)")
+    assert (analysis.quality_score, analysis.model_used) == (92, REVIEW_MODEL)
+    assert analysis.quality_percentile == 0.0  # The only scored analysis
+    assert len(rows) == 1  # The local estimate row was refined in place
+    assert events[0][1]["quality_score"] == 92
+
+
+@pytest.mark.asyncio
+async def test_quality_percentile_is_ranked_against_the_histogram(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'analysis.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as db:
+        service = AIAnalysisService(db)
+        percentiles = [await service.record_quality_score(score) for score in [50, 70, 70, 90, 10]]
+        await db.commit()
+        counts = dict((await db.execute(select(QualityScoreCount.score, QualityScoreCount.count))).all())
+    await engine.dispose()
+
+    # Each score is ranked against the scores recorded up to and including it
+    assert percentiles == [0.0, 50.0, 1 / 3 * 100.0, 75.0, 0.0]
+    assert counts == {10: 1, 50: 1, 70: 2, 90: 1}
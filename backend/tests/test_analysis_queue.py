@@ -0,0 +1,82 @@
+"""
+KamiCode — AI Analysis Queue Tests
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import ai_client as ai_client_module
+from app.services.ai_client import AIClient
+from app.services.analysis_queue import AnalysisQueue
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_and_duplicates_coalesce():
+    """No more than `concurrency` analyses run at once; repeated ids run once."""
+    running, peak, seen = 0, 0, []
+
+    async def handler(submission_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        seen.append(submission_id)
+        running -= 1
+
+    queue = AnalysisQueue(concurrency=2, maxsize=100, handler=handler)
+    for i in range(10):
+        queue.enqueue(f"s{i}")
+        queue.enqueue(f"s{i}")
+    await queue.stop()
+
+    assert peak == 2
+    assert sorted(seen) == sorted(f"s{i}" for i in range(10))
+    assert queue.stats()["coalesced"] == 10
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_and_failures_are_counted():
+    """Overflow is rejected instead of growing unbounded; handler errors are recorded."""
+    release = asyncio.Event()
+
+    async def handler(submission_id):
+        await release.wait()
+        raise RuntimeError("boom")
+
+    queue = AnalysisQueue(concurrency=1, maxsize=1, handler=handler)
+    assert queue.enqueue("a")
+    await asyncio.sleep(0)  # Worker takes "a", freeing the slot
+    assert queue.enqueue("b")
+    assert not queue.enqueue("c")
+
+    release.set()
+    await queue.stop()
+    stats = queue.stats()
+    assert stats["dropped"] == 1
+    assert stats["failed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ai_client_retries_rate_limits(monkeypatch):
+    """A 429 is retried with backoff before the call succeeds."""
+    statuses = [429, 503, 200]
+
+    def respond(request):
+        code = statuses.pop(0)
+        if code != 200:
+            return httpx.Response(code, headers={"retry-after": "0"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"ok": true}'}}]})
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    monkeypatch.setattr(ai_client_module, "get_http_client", lambda: http)
+
+    client = AIClient()
+    client.client = True
+    client._url = "http://stub/chat/completions"
+    client._headers = {}
+
+    assert await client.generate_json("system", "user") == '{"ok": true}'
+    assert statuses == []
+    await http.aclose()
@@ -0,0 +1,101 @@
+"""
+KamiCode — Circuit Breaker Tests
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.core.rate_limit import TokenBucket
+from app.services import ai_client as ai_client_module
+from app.services.ai_client import AIClient
+
+
+def test_opens_on_failure_rate_and_recovers_through_probe():
+    breaker = CircuitBreaker("test", failure_rate=0.5, window=4, min_calls=4, open_seconds=0.05)
+    breaker.record_success(0.1)
+    breaker.record_failure("boom")
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED  # Too few calls to judge
+    breaker.record_failure("boom")
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    breaker._opened_at -= 1  # Let the open period lapse
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # One probe at a time
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, slow_call_seconds=1.0)
+    breaker.record_success(2.0)
+    breaker.record_success(3.0)
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_ai_client_deadline_and_fail_fast(monkeypatch):
+    """A hung provider trips the breaker; later calls fail fast without a request."""
+    requests = 0
+
+    async def respond(request):
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(10)
+
+    breaker = CircuitBreaker("test", window=2, min_calls=2, open_seconds=60)
+    http = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    monkeypatch.setattr(ai_client_module, "get_http_client", lambda: http)
+    monkeypatch.setattr(ai_client_module, "ai_breaker", breaker)
+    monkeypatch.setattr(ai_client_module, "ai_rate_limiter", TokenBucket(rate=0))
+
+    client = AIClient()
+    client.client = True
+    client._url = "http://stub/chat/completions"
+    client._headers = {}
+
+    for _ in range(2):
+        with pytest.raises(asyncio.TimeoutError):
+            await client.generate_json("system", "user", deadline=0.05)
+    with pytest.raises(CircuitOpenError):
+        await client.generate_json("system", "user", deadline=0.05)
+
+    assert requests == 2
+    assert breaker.snapshot()["rejected"] == 1
+    await http.aclose()
+
+
+@pytest.mark.asyncio
+async def test_ai_client_pacing_waits_are_off_the_clock(monkeypatch):
+    """Token-bucket and Retry-After waits count towards neither the deadline nor call latency."""
+    statuses = [429, 200]
+
+    def respond(request):
+        if statuses.pop(0) == 429:
+            return httpx.Response(429, headers={"retry-after": "0.2"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": '{"ok": true}'}}]})
+
+    class SlowBucket:
+        async def acquire(self):
+            await asyncio.sleep(0.2)
+
+    breaker = CircuitBreaker("test", window=1, min_calls=1, slow_call_seconds=0.15)
+    http = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    monkeypatch.setattr(ai_client_module, "get_http_client", lambda: http)
+    monkeypatch.setattr(ai_client_module, "ai_breaker", breaker)
+    monkeypatch.setattr(ai_client_module, "ai_rate_limiter", SlowBucket())
+
+    client = AIClient()
+    client.client = True
+    client._url = "http://stub/chat/completions"
+    client._headers = {}
+
+    assert await client.generate_json("system", "user", deadline=0.15) == '{"ok": true}'
+    assert statuses == []
+    assert breaker.state == CLOSED  # 0.6s of waiting, but the calls themselves were fast
+    await http.aclose()
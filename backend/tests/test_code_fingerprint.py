@@ -0,0 +1,49 @@
+"""
+KamiCode — Code Fingerprint Tests
+"""
+
+from app.services.code_fingerprint import fingerprint_code
+
+TWO_SUM = '''
+def two_sum(nums, target):
+    """Classic hash map solution."""
+    seen = {}  # value -> index
+    for i, n in enumerate(nums):
+        if target - n in seen:
+            return [seen[target - n], i]
+        seen[n] = i
+'''
+
+TWO_SUM_RENAMED = '''
+def solve(arr, t):
+  m = {}
+  for idx, x in enumerate(arr):
+    if t - x in m: return [m[t - x], idx]
+    m[x] = idx
+'''
+
+
+def test_python_ignores_names_comments_and_whitespace():
+    """Renamed identifiers, comments and docstrings do not change the fingerprint."""
+    assert fingerprint_code(TWO_SUM, "python") == fingerprint_code(TWO_SUM_RENAMED, "python")
+
+
+def test_python_keeps_builtins_and_logic():
+    """Swapping a builtin or changing an operator is a different solution."""
+    changed = TWO_SUM_RENAMED.replace("enumerate", "reversed")
+    assert fingerprint_code(TWO_SUM_RENAMED, "python") != fingerprint_code(changed, "python")
+
+
+def test_javascript_token_normalization():
+    """JS falls back to comment stripping and identifier renaming."""
+    a = "function f(a) { // add one\n  return a + 1;\n}"
+    b = "function g(b){ /* x */ return b+1; }"
+    assert fingerprint_code(a, "javascript") == fingerprint_code(b, "javascript")
+
+
+def test_language_is_part_of_the_key():
+    assert fingerprint_code("x = 1", "python") != fingerprint_code("x = 1", "javascript")
+
+
+def test_unparsable_python_still_fingerprints():
+    assert len(fingerprint_code("def f(:\n  pass", "python")) == 64
@@ -0,0 +1,123 @@
+"""
+KamiCode — Complexity Estimator Tests
+"""
+
+import pytest
+
+from app.services.complexity_estimator import estimate_complexity
+
+NESTED = """
+for i in range(n):
+    for j in range(n):
+        if a[i] + a[j] == t:
+            print(i, j)
+"""
+
+BINARY_SEARCH = """
+lo, hi = 0, n - 1
+while lo <= hi:
+    mid = (lo + hi) // 2
+    if a[mid] < t:
+        lo = mid + 1
+    else:
+        hi = mid - 1
+"""
+
+TWO_SUM = """
+def two_sum(nums, t):
+    seen = {}
+    for i, x in enumerate(nums):
+        if t - x in seen:
+            return [seen[t - x], i]
+        seen[x] = i
+"""
+
+FIB = """
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+"""
+
+MEMO_FIB = """
+from functools import lru_cache
+
+@lru_cache(None)
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+"""
+
+
+@pytest.mark.parametrize("code, time, space", [
+    ("a, b = map(int, input().split())\nprint(a + b)", "O(1)", "O(1)"),
+    (NESTED, "O(n^2)", "O(1)"),
+    (BINARY_SEARCH, "O(log n)", "O(1)"),
+    (TWO_SUM, "O(n)", "O(n)"),
+    ("a = sorted(arr)\nfor x in a:\n    print(x)", "O(n log n)", "O(n)"),
+    (MEMO_FIB, "O(n)", "O(n)"),
+])
+def test_python_estimates(code, time, space):
+    estimate = estimate_complexity(code, "python")
+    assert (estimate.time_complexity, estimate.space_complexity) == (time, space)
+
+
+def test_plain_loops_are_confident_and_recursion_is_not():
+    """Recursion is where the static pass defers to the model."""
+    assert estimate_complexity(NESTED, "python").confidence >= 0.9
+    fib = estimate_complexity(FIB, "python")
+    assert fib.time_complexity == "O(2^n)"
+    assert fib.recursive and fib.confidence < 0.9
+
+
+@pytest.mark.parametrize("code, time", [
+    ("for (let i = 0; i < n; i++) {\n  for (let j = 0; j < n; j++) c++;\n}", "O(n^2)"),
+    ("let lo = 0, hi = n - 1;\nwhile (lo <= hi) { const mid = (lo + hi) >> 1; if (a[mid] < t) lo = mid + 1; else hi = mid - 1; }", "O(log n)"),
+    ("arr.sort((a, b) => a - b);\nfor (const x of arr) console.log(x);", "O(n log n)"),
+])
+def test_javascript_estimates(code, time):
+    assert estimate_complexity(code, "javascript").time_complexity == time
+
+
+def test_as_analysis_matches_analysis_fields():
+    data = estimate_complexity(TWO_SUM, "python").as_analysis()
+    assert data["approach_name"] == "Hash Table"
+    assert data["quality_score"] is None
+    assert data["feedback"].startswith("Estimated by static analysis")
+
+
+LIST_INTERSECTION = """
+def common(a, b):
+    out = []
+    for x in a:
+        if x in b:
+            out.append(x)
+    return out
+"""
+
+DEDUPE_WITH_LIST = """
+seen = []
+for x in a:
+    if x not in seen:
+        seen.append(x)
+"""
+
+DEDUPE_WITH_SET = """
+seen = set()
+for x in a:
+    if x not in seen:
+        seen.add(x)
+"""
+
+
+def test_membership_scans_inside_loops():
+    """`x in list` is a linear scan; `x in set` is not."""
+    assert estimate_complexity(DEDUPE_WITH_LIST, "python").time_complexity == "O(n^2)"
+    assert estimate_complexity(DEDUPE_WITH_SET, "python").time_complexity == "O(n)"
+    assert estimate_complexity('for c in s:\n    if c in "aeiou":\n        n += 1', "python").time_complexity == "O(n)"
+    # An unknown container (a parameter) is assumed to be a list, with less confidence
+    unknown = estimate_complexity(LIST_INTERSECTION, "python")
+    assert unknown.time_complexity == "O(n^2)"
+    assert unknown.confidence < 0.9
+    assert estimate_complexity("for (const x of a) { if (b.includes(x)) c++; }", "javascript").time_complexity == "O(n^2)"
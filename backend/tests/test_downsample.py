@@ -0,0 +1,29 @@
+"""
+KamiCode — Series Downsampling Tests
+"""
+
+import numpy as np
+
+from app.engines.downsample import lttb_indices
+
+
+def test_short_series_is_returned_whole():
+    assert lttb_indices(np.arange(10), np.arange(10), 500).tolist() == list(range(10))
+
+
+def test_long_series_is_reduced_to_threshold_keeping_ends():
+    x = np.arange(20_000, dtype=float)
+    y = np.sin(x / 500) * 300 + 1500
+    keep = lttb_indices(x, y, 300)
+    assert len(keep) == 300
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_spikes_survive_downsampling():
+    """A one-point peak and dip in a flat series are kept."""
+    x = np.arange(10_000, dtype=float)
+    y = np.full(len(x), 1500.0)
+    y[3_217], y[7_801] = 2400.0, 600.0
+    keep = lttb_indices(x, y, 100)
+    assert 3_217 in keep and 7_801 in keep
@@ -0,0 +1,135 @@
+"""
+KamiCode — First Solver Tests
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.problem import Problem
+from app.models.problem_stats import ProblemSolveStats, ProblemStatsSketch
+from app.models.submission import Submission
+from app.models.user import User
+from app.services import problem_stats_service
+from app.services.problem_stats_service import ProblemStatsService
+
+SOLVERS = 8
+
+
+@pytest.mark.asyncio
+async def test_simultaneous_first_solves_have_exactly_one_winner(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'solves.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com"} for i in range(SOLVERS)
+        ])
+        await db.execute(insert(Problem).values(
+            id="p1", title="Daily", slug="daily", description="-", difficulty="medium", test_cases={},
+        ))
+        await db.execute(insert(Submission), [
+            {"id": f"s{i}", "user_id": f"u{i}", "problem_id": "p1", "code": "-", "language": "python",
+             "verdict": "accepted"}
+            for i in range(SOLVERS)
+        ])
+        await db.commit()
+        submissions = (await db.execute(select(Submission))).scalars().all()
+
+    async def solve(submission):
+        async with session_maker() as db:
+            return await ProblemStatsService(db).record_solve(submission)
+
+    won = await asyncio.gather(*(solve(s) for s in submissions))
+
+    async with session_maker() as db:
+        stats = (await db.execute(select(ProblemSolveStats))).scalar_one()
+    await engine.dispose()
+
+    assert won.count(True) == 1
+    winner = submissions[won.index(True)]
+    assert (stats.first_solver_id, stats.first_submission_id) == (winner.user_id, winner.id)
+    assert stats.accepted_count == SOLVERS
+
+
+@pytest.mark.asyncio
+async def test_solve_through_the_session_holding_the_submission(tmp_path):
+    """As in SubmissionService: the writing session still holds the new submission."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'solves.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com"} for i in range(SOLVERS)
+        ])
+        await db.execute(insert(Problem).values(
+            id="p1", title="Daily", slug="daily", description="-", difficulty="medium", test_cases={},
+        ))
+        await db.commit()
+
+    async def solve(i: int):
+        async with session_maker() as db:
+            submission = Submission(
+                id=f"s{i}", user_id=f"u{i}", problem_id="p1", code="-", language="python", verdict="accepted",
+            )
+            db.add(submission)
+            await db.commit()
+            won = await ProblemStatsService(db).record_solve(submission)
+            # Still loaded: the caller goes on to read it
+            return won, submission.problem_id
+
+    results = await asyncio.gather(*(solve(i) for i in range(SOLVERS)))
+
+    async with session_maker() as db:
+        stats = (await db.execute(select(ProblemSolveStats))).scalar_one()
+    await engine.dispose()
+
+    assert [won for won, _ in results].count(True) == 1
+    assert {problem_id for _, problem_id in results} == {"p1"}
+    assert stats.accepted_count == SOLVERS
+    assert stats.first_submission_id == f"s{[won for won, _ in results].index(True)}"
+
+
+@pytest.mark.asyncio
+async def test_failed_solve_count_is_rolled_back_alone(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'solves.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    upsert = problem_stats_service.upsert
+
+    async def failing_upsert(db, model, *args, **kwargs):
+        result = await upsert(db, model, *args, **kwargs)
+        if model is ProblemSolveStats:
+            raise RuntimeError("solve count failed")
+        return result
+
+    monkeypatch.setattr(problem_stats_service, "upsert", failing_upsert)
+    async with session_maker() as db:
+        await db.execute(insert(User).values(id="u1", username="u1", email="u1@example.com"))
+        await db.execute(insert(Problem).values(
+            id="p1", title="Daily", slug="daily", description="-", difficulty="medium", test_cases={},
+        ))
+        submission = Submission(
+            id="s1", user_id="u1", problem_id="p1", code="-", language="python", verdict="accepted",
+        )
+        db.add(submission)
+        await db.commit()
+        with pytest.raises(RuntimeError):
+            await ProblemStatsService(db).record_solve(submission)
+        # The following step still commits through the same session
+        await ProblemStatsService(db).record_accepted(submission)
+
+    async with session_maker() as db:
+        solves = (await db.execute(select(ProblemSolveStats))).first()
+        sketch = (await db.execute(select(ProblemStatsSketch))).scalar_one()
+    await engine.dispose()
+
+    assert solves is None
+    assert sketch.sample_count == 1
@@ -0,0 +1,64 @@
+"""
+KamiCode — Vectorized Glicko-2 Tests
+"""
+
+import numpy as np
+import pytest
+
+from app.engines.glicko2 import Glicko2
+from app.engines.glicko2_batch import Glicko2Batch
+from app.services.rating_replay import occurrence_rank, tiers_for
+
+
+def test_glickman_worked_example():
+    """Three games in one period reproduce the example from Glickman's paper."""
+    rating, rd, vol = Glicko2Batch().rate(
+        np.array([1500.0]), np.array([200.0]), np.array([0.06]),
+        player=np.array([0, 0, 0]),
+        opponent_rating=np.array([1400.0, 1550.0, 1700.0]),
+        opponent_rd=np.array([30.0, 100.0, 300.0]),
+        score=np.array([1.0, 0.0, 0.0]),
+    )
+    assert rating[0] == pytest.approx(1464.06, abs=0.01)
+    assert rd[0] == pytest.approx(151.52, abs=0.01)
+    assert vol[0] == pytest.approx(0.05999, abs=1e-5)
+
+
+def test_batch_matches_scalar_engine():
+    """One game per player gives the same result as the scalar update."""
+    rng = np.random.default_rng(3)
+    n = 500
+    rating, rd, vol = rng.uniform(800, 2400, n), rng.uniform(30, 350, n), rng.uniform(0.04, 0.09, n)
+    opp_rating, opp_rd = rng.uniform(800, 2400, n), rng.uniform(30, 350, n)
+    score = rng.integers(0, 2, n).astype(float)
+
+    batch = Glicko2Batch().rate(rating, rd, vol, np.arange(n), opp_rating, opp_rd, score)
+    scalar = Glicko2()
+    for i in range(n):
+        expected = scalar.calculate_new_rating(rating[i], rd[i], vol[i], opp_rating[i], opp_rd[i], score[i])
+        assert [batch[0][i], batch[1][i], batch[2][i]] == pytest.approx(expected, rel=1e-9)
+
+
+def test_volatility_responds_to_surprising_results():
+    """An upset moves volatility up, unlike the old constant-volatility stub."""
+    _, _, vol = Glicko2().calculate_new_rating(1200, 50, 0.06, 2400, 30, 1.0)
+    assert vol > 0.06
+
+
+def test_players_without_games_are_unchanged():
+    rating, rd, vol = Glicko2Batch().rate(
+        np.array([1500.0, 1300.0]), np.array([200.0, 80.0]), np.array([0.06, 0.05]),
+        player=np.array([0]), opponent_rating=np.array([1500.0]), opponent_rd=np.array([150.0]), score=np.array([1.0]),
+    )
+    assert (rating[1], rd[1], vol[1]) == (1300.0, 80.0, 0.05)
+    assert rating[0] > 1500.0
+
+
+def test_occurrence_rank_orders_each_players_games():
+    assert occurrence_rank(np.array([2, 0, 2, 2, 0, 1])).tolist() == [0, 0, 1, 2, 1, 0]
+
+
+def test_tiers_match_league_thresholds():
+    assert tiers_for(np.array([-50.0, 1199.9, 1200.0, 1800.0, 2500.0])) == [
+        "bronze", "bronze", "silver", "diamond", "grandmaster",
+    ]
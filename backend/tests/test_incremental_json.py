@@ -0,0 +1,63 @@
+"""
+KamiCode — Incremental JSON / Streaming Tests
+"""
+
+import json
+
+import httpx
+import pytest
+
+from app.services import ai_client as ai_client_module
+from app.services.ai_client import AIClient
+from app.services.incremental_json import IncrementalJSONParser
+
+ANALYSIS = '```json\n{"time_complexity": "O(n)", "space_complexity": "O(1)", "approach_name": "Two {pointers}, \\"fast\\"", "tags": ["a", {"b": 1}], "quality_score": 90}\n```'
+
+
+def test_fields_are_emitted_as_soon_as_they_complete():
+    """Each member is reported once its value closes, regardless of chunk boundaries."""
+    parser = IncrementalJSONParser()
+    seen = []
+    for i in range(0, len(ANALYSIS), 3):
+        for key, _ in parser.feed(ANALYSIS[i:i + 3]):
+            seen.append((key, ANALYSIS.index(ANALYSIS[i:i + 3], i)))
+
+    assert [key for key, _ in seen] == [
+        "time_complexity", "space_complexity", "approach_name", "tags", "quality_score"
+    ]
+    # time_complexity is available long before the object closes
+    assert seen[0][1] < len(ANALYSIS) // 4
+    assert parser.done
+    assert parser.fields["approach_name"] == 'Two {pointers}, "fast"'
+    assert parser.fields["tags"] == ["a", {"b": 1}]
+
+
+@pytest.mark.asyncio
+async def test_generate_json_stream_reads_sse(monkeypatch):
+    content = '{"time_complexity": "O(n log n)", "quality_score": 70}'
+    events = [
+        json.dumps({"choices": [{"delta": {"content": content[i:i + 7]}}]})
+        for i in range(0, len(content), 7)
+    ]
+    body = "".join(f"data: {event}\n\n" for event in events) + "data: [DONE]\n\n"
+
+    def respond(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    monkeypatch.setattr(ai_client_module, "get_http_client", lambda: http)
+
+    client = AIClient()
+    client.client = True
+    client._url = "http://stub/chat/completions"
+    client._headers = {}
+
+    fields = []
+
+    async def on_field(key, value):
+        fields.append((key, value))
+
+    assert await client.generate_json_stream("system", "user", on_field) == content
+    assert fields == [("time_complexity", "O(n log n)"), ("quality_score", 70)]
+    await http.aclose()
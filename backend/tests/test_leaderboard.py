@@ -0,0 +1,130 @@
+"""
+KamiCode — Leaderboard Tests
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.engines import leaderboard as leaderboard_module
+from app.engines.leaderboard import Leaderboard, LocalLeaderboard, RankedSet
+from app.models import Base
+from app.models.season import Season
+from app.models.user import User
+
+
+def test_ranked_set_matches_a_sorted_list():
+    """Random inserts and removals keep rank and slices identical to a sorted list."""
+    rng = random.Random(11)
+    ranked, reference = RankedSet(seed=3), []
+    for _ in range(3000):
+        if reference and rng.random() < 0.4:
+            key = reference.pop(rng.randrange(len(reference)))
+            ranked.remove(key)
+        else:
+            key = (rng.randint(0, 500), rng.random())
+            ranked.add(key)
+            reference.append(key)
+        reference.sort()
+
+    assert len(ranked) == len(reference)
+    for probe in rng.sample(reference, 50):
+        assert ranked.rank(probe) == reference.index(probe)
+    assert ranked.slice(0, len(reference)) == reference
+    assert ranked.slice(17, 40) == reference[17:40]
+    with pytest.raises(KeyError):
+        ranked.remove((-1, 0.0))
+
+
+@pytest.mark.asyncio
+async def test_local_board_ranks_and_moves_users():
+    board = LocalLeaderboard()
+    await board.load([("a", 1500.0), ("b", 1800.0), ("c", 1200.0)])
+    assert (await board.rank("a")).rank == 2
+
+    await board.update([("c", 1900.0)])
+    assert [e.user_id for e in await board.range(0, 10)] == ["c", "b", "a"]
+    assert (await board.rank("a")).rank == 3
+    assert await board.count_at_least(1800.0) == 2
+    assert await board.rank("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_tier_slices_and_neighbours(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'board.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    ratings = [900.0, 1250.0, 1300.0, 1499.0, 1500.0, 1650.0, 2200.0]
+    async with async_sessionmaker(engine)() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com", "classical_rating": rating}
+            for i, rating in enumerate(ratings)
+        ])
+        await db.commit()
+
+        board = Leaderboard(LocalLeaderboard())
+        total, silver = await board.tier(db, "silver", limit=10)
+        assert total == 3
+        assert [(e.rank, e.user_id) for e in silver] == [(4, "u3"), (5, "u2"), (6, "u1")]
+
+        around = await board.around(db, "u4", radius=1)
+        assert [e.user_id for e in around] == ["u5", "u4", "u3"]
+
+        # Writes after the load move the user immediately
+        await board.update("u0", 2500.0)
+        assert (await board.rank(db, "u0")).rank == 1
+        assert (await board.top(db, 2))[1].user_id == "u6"
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_local_board_reloads_after_another_process_writes(tmp_path, monkeypatch):
+    """A rating written by a worker process reaches the API's local board on its next check."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'board.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    clock = [1000.0]
+    monkeypatch.setattr(leaderboard_module.time, "monotonic", lambda: clock[0])
+
+    async with async_sessionmaker(engine)() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com", "classical_rating": 1200.0 + i}
+            for i in range(3)
+        ])
+        await db.commit()
+        board = Leaderboard(LocalLeaderboard(), refresh_seconds=30.0)
+        assert (await board.rank(db, "u0")).rank == 3
+
+        # A rating period closed in a Celery worker: the API process never saw update()
+        await db.execute(
+            update(User).where(User.id == "u0").values(classical_rating=2000.0, rating_version=User.rating_version + 1)
+        )
+        await db.commit()
+        assert (await board.rank(db, "u0")).rank == 3  # Not checked again yet
+        loaded = board.backend
+        clock[0] += 31
+        assert (await board.rank(db, "u0")).rank == 1
+        assert board.backend is loaded  # Applied as a delta, not a reload
+
+        # A deactivated user leaves the board
+        await db.execute(update(User).where(User.id == "u2").values(is_active=False))
+        await db.commit()
+        clock[0] += 31
+        assert await board.size(db) == 2 and await board.rank(db, "u2") is None
+
+        # A season reset reloads the board in the background
+        await db.execute(insert(Season).values(
+            id="s1", name="S1", slug="s1", start_date=datetime(2026, 1, 1), end_date=datetime(2026, 4, 1),
+            reset_epoch=1,
+        ))
+        await db.commit()
+        clock[0] += 31
+        await board.top(db, 10)
+        assert board.backend is loaded  # Still serving the old board
+        await board._reload
+        assert board.backend is not loaded and board._epoch == 1
+        assert (await board.rank(db, "u0")).rating < 2000.0
+    await engine.dispose()
@@ -0,0 +1,37 @@
+"""
+KamiCode — Daily Problem Buffer Tests
+"""
+
+import pytest
+
+from app.schemas.problem import ProblemCreate
+from app.services.problem_buffer import ProblemBufferService
+
+PROBLEM = ProblemCreate(
+    title="Sum Two",
+    slug="sum-two",
+    description="Print a + b.",
+    difficulty="easy",
+    test_cases={
+        "sample": [{"input": "1 2", "expected": "3"}],
+        "hidden": [{"input": "10 -4", "expected": "6"}, {"input": "0 0", "expected": "0"}],
+    },
+)
+
+
+@pytest.mark.asyncio
+async def test_reference_solution_passing_every_case_validates():
+    service = ProblemBufferService(db=None)
+    error, runtime = await service.validate(PROBLEM, "a, b = map(int, input().split())\nprint(a + b)")
+    assert error is None
+    assert runtime >= 0
+
+
+@pytest.mark.asyncio
+async def test_wrong_or_missing_reference_is_rejected():
+    service = ProblemBufferService(db=None)
+    error, _ = await service.validate(PROBLEM, "a, b = map(int, input().split())\nprint(a - b if a else 0)")
+    assert error.startswith("2/3 test case(s) failed")
+
+    error, _ = await service.validate(PROBLEM, None)
+    assert error == "No reference solution provided"
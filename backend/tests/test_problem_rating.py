@@ -0,0 +1,59 @@
+"""
+KamiCode — Problem Rating Tests
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.problem import Problem
+from app.models.submission import Submission
+from app.models.user import User
+from app.services.problem_rating_service import ProblemRatingService
+from app.services.rating_service import problem_opponent
+
+
+def test_unfitted_or_thin_problems_use_the_difficulty_prior():
+    assert problem_opponent("Hard") == (2000, 100)
+    assert problem_opponent("easy", 1700.0, 80.0, attempts=3) == (1000, 200)
+    assert problem_opponent("easy", 1700.0, 80.0, attempts=500) == (1700.0, 80.0)
+
+
+@pytest.mark.asyncio
+async def test_fit_moves_mislabelled_problems_and_is_incremental(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'problems.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    now = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+    async with session_maker() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com", "classical_rating": 1500.0, "classical_rd": 80.0}
+            for i in range(30)
+        ])
+        await db.execute(insert(Problem), [
+            {"id": "trap", "title": "Trap", "slug": "trap", "description": "-", "difficulty": "easy", "test_cases": {}},
+            {"id": "gift", "title": "Gift", "slug": "gift", "description": "-", "difficulty": "hard", "test_cases": {}},
+        ])
+        await db.execute(insert(Submission), [
+            {"id": f"{problem}-{i}", "user_id": f"u{i}", "problem_id": problem, "code": "-", "language": "python",
+             "verdict": verdict, "created_at": now - timedelta(hours=1)}
+            for problem, verdict in (("trap", "wrong_answer"), ("gift", "accepted"))
+            for i in range(30)
+        ])
+        await db.commit()
+
+        assert await ProblemRatingService(db).fit(now) == 2
+        # Nothing new since the last fit
+        assert await ProblemRatingService(db).fit(now) == 0
+
+        problems = {p.id: p for p in (await db.execute(select(Problem))).scalars()}
+    await engine.dispose()
+
+    assert problems["trap"].rating > 1000 and problems["trap"].rating_attempts == 30
+    assert problems["gift"].rating < 2000
+    assert problems["trap"].rating_rd < 200
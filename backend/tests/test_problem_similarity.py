@@ -0,0 +1,75 @@
+"""
+KamiCode — Problem Similarity Index Tests
+"""
+
+from app.engines.problem_similarity import ProblemSimilarityIndex
+
+TWO_SUM = (
+    "Two Sum",
+    "Given an array of integers nums and an integer target, return the indices of the two "
+    "numbers such that they add up to target. You may assume that each input has exactly one "
+    "solution, and you may not use the same element twice.",
+    {"sample": [{"input": "2 7 11 15\n9", "expected": "0 1"}], "hidden": [{"input": "3 2 4\n6", "expected": "1 2"}]},
+)
+
+TWO_SUM_REWORDED = (
+    "Pair With Target Sum",
+    "Given an array of integers nums and an integer target, return the indices of the two "
+    "numbers such that they add up to target. You can assume each input has exactly one "
+    "solution, and you may not use the same element twice.",
+    {"sample": [{"input": "2 7 11 15\n9", "expected": "0 1"}], "hidden": [{"input": "3 3\n6", "expected": "0 1"}]},
+)
+
+REVERSE = (
+    "Reverse Words",
+    "Read a line of text and print its words in reverse order, separated by single spaces.",
+    {"sample": [{"input": "hello big world", "expected": "world big hello"}], "hidden": []},
+)
+
+
+def test_reworded_copy_is_flagged_and_unrelated_is_not():
+    index = ProblemSimilarityIndex()
+    index.add("p1", index.signature_for(*TWO_SUM), "two-sum")
+    index.add("p2", index.signature_for(*REVERSE), "reverse-words")
+
+    duplicate = index.find_duplicate(index.signature_for(*TWO_SUM_REWORDED), threshold=0.6)
+    assert duplicate[:2] == ("p1", "two-sum")
+    assert index.find_duplicate(index.signature_for("Matrix Spiral", "Print a matrix in spiral order.", {}), 0.6) is None
+
+
+def test_remove_drops_problem_from_buckets():
+    index = ProblemSimilarityIndex()
+    signature = index.signature_for(*TWO_SUM)
+    index.add("p1", signature, "two-sum")
+    index.remove("p1")
+    assert len(index) == 0
+    assert index.query(signature, threshold=0.0) == []
+
+
+def test_persisted_index_round_trips(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = ProblemSimilarityIndex(path=path)
+    index.add("p1", index.signature_for(*TWO_SUM), "two-sum")
+    index.save()
+
+    loaded = ProblemSimilarityIndex(path=path)
+    assert loaded.load()
+    assert loaded.find_duplicate(loaded.signature_for(*TWO_SUM), threshold=0.99)[1] == "two-sum"
+
+
+def test_saves_from_two_processes_keep_both_problems(tmp_path):
+    """A save that finds the file rewritten since its load merges instead of overwriting."""
+    path = str(tmp_path / "index.json")
+    first, second = ProblemSimilarityIndex(path=path), ProblemSimilarityIndex(path=path)
+
+    first.add("p1", first.signature_for(*TWO_SUM), "two-sum")
+    first.save()
+    second.add("p2", second.signature_for(*REVERSE), "reverse-words")
+    second.save()  # Loaded before first's save: must not drop p1
+    second.add("p3", second.signature_for("Matrix Spiral", "Print a matrix in spiral order.", {}), "spiral")
+    second.save()
+
+    reloaded = ProblemSimilarityIndex(path=path)
+    assert reloaded.load()
+    assert len(reloaded) == 3
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,100 @@
+"""
+KamiCode — Problem Stats Tests
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.problem import Problem
+from app.models.problem_stats import ProblemSolveStats, ProblemStatsSketch
+from app.models.submission import Submission
+from app.models.user import User
+from app.services.problem_stats_service import ProblemStatsService
+
+WRITERS = 6
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as db:
+        await db.execute(insert(User).values(id="u1", username="u1", email="u1@example.com"))
+        await db.execute(insert(Problem).values(
+            id="p1", title="Daily", slug="daily", description="-", difficulty="medium", test_cases={},
+        ))
+        await db.commit()
+    yield session_maker
+    await engine.dispose()
+
+
+def _submission(i: int) -> Submission:
+    return Submission(
+        id=f"s{i}", user_id="u1", problem_id="p1", code="-", language="python",
+        verdict="accepted", runtime_ms=10 + i, memory_kb=1000,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_samples_all_land_in_one_sketch(session_maker):
+    async def record(i: int):
+        # As in SubmissionService: the session that committed the submission records it
+        async with session_maker() as db:
+            submission = _submission(i)
+            db.add(submission)
+            await db.commit()
+            await ProblemStatsService(db).record_accepted(submission)
+            return submission.problem_id
+
+    assert await asyncio.gather(*(record(i) for i in range(WRITERS))) == ["p1"] * WRITERS
+
+    async with session_maker() as db:
+        row = (await db.execute(select(ProblemStatsSketch))).scalar_one()
+    assert row.sample_count == WRITERS
+    assert row.runtime_sketch["n"] == WRITERS
+
+
+@pytest.mark.asyncio
+async def test_caller_submission_stays_loaded_when_the_row_already_exists(session_maker):
+    async with session_maker() as other:
+        other.add(_submission(0))
+        await other.commit()
+        await ProblemStatsService(other).record_accepted(await other.get(Submission, "s0"))
+
+    async with session_maker() as db:
+        submission = _submission(1)
+        db.add(submission)
+        await db.commit()
+        await ProblemStatsService(db).record_accepted(submission)
+        # Still readable without a lazy load
+        assert submission.id == "s1" and submission.language == "python"
+        row = (await db.execute(select(ProblemStatsSketch))).scalar_one()
+    assert row.sample_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_sketch_update_leaves_the_session_usable(session_maker, monkeypatch):
+    def fail(self, value):
+        raise RuntimeError("sketch update failed")
+
+    monkeypatch.setattr("app.services.problem_stats_service.KLLSketch.update", fail)
+    async with session_maker() as db:
+        submission = _submission(0)
+        db.add(submission)
+        await db.commit()
+        with pytest.raises(RuntimeError):
+            await ProblemStatsService(db).record_accepted(submission)
+        # The next step of create_submission still writes through the same session
+        assert await ProblemStatsService(db).record_solve(submission) is True
+        assert submission.problem_id == "p1"
+
+    async with session_maker() as db:
+        # The sketch insert was rolled back with the failed update
+        assert (await db.execute(select(ProblemStatsSketch))).first() is None
+        assert (await db.execute(select(ProblemSolveStats))).scalar_one().first_submission_id == "s0"
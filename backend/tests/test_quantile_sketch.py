@@ -0,0 +1,51 @@
+"""
+KamiCode — Quantile Sketch Tests
+"""
+
+import random
+
+from app.engines.quantile_sketch import KLLSketch
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def test_empty_sketch_has_no_quantiles():
+    """An empty sketch reports None instead of a made-up value."""
+    assert KLLSketch().quantile(0.5) is None
+
+
+def test_small_stream_is_exact():
+    """Below capacity no compaction happens, so quantiles are exact."""
+    sketch = KLLSketch()
+    sketch.extend(range(1, 101))
+    assert sketch.quantile(0.5) == 50
+    assert sketch.quantile(0.99) == 99
+
+
+def test_large_stream_stays_compact_and_accurate():
+    """Size stays bounded while estimates stay within a small rank error."""
+    rng = random.Random(7)
+    values = [rng.randint(0, 10_000) for _ in range(50_000)]
+    sketch = KLLSketch(rng=random.Random(1))
+    sketch.extend(values)
+
+    assert sketch.n == len(values)
+    assert sketch.size < 1_000
+    for q in (0.5, 0.9, 0.99):
+        assert abs(sketch.quantile(q) - _exact(values, q)) < 300
+
+
+def test_merge_and_round_trip():
+    """Sketches built on separate workers merge and survive serialization."""
+    rng = random.Random(3)
+    values = [rng.random() for _ in range(20_000)]
+    left, right = KLLSketch(rng=random.Random(1)), KLLSketch(rng=random.Random(2))
+    left.extend(values[:10_000])
+    right.extend(values[10_000:])
+
+    merged = KLLSketch.from_dict(left.to_dict()).merge(KLLSketch.from_dict(right.to_dict()))
+    assert merged.n == len(values)
+    assert abs(merged.quantile(0.5) - _exact(values, 0.5)) < 0.03
@@ -0,0 +1,63 @@
+"""
+KamiCode — Concurrent Rating Update Tests
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.problem import Problem
+from app.models.rating_history import RatingHistory
+from app.models.submission import Submission
+from app.models.user import User
+from app.services import rating_service
+from app.services.rating_service import RatingEngine
+
+SUBMISSIONS = 8
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_for_one_user_are_not_lost(tmp_path, monkeypatch):
+    """Every concurrent update lands, each one starting from the previous one's result."""
+    monkeypatch.setattr(rating_service.process_achievement_event_task, "delay", lambda *args, **kwargs: None)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ratings.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as db:
+        await db.execute(insert(User).values(id="u1", username="u1", email="u1@example.com"))
+        await db.execute(insert(Problem).values(
+            id="p1", title="Easy", slug="easy", description="-", difficulty="easy", test_cases={},
+        ))
+        await db.execute(insert(Submission), [
+            {"id": f"s{i}", "user_id": "u1", "problem_id": "p1", "code": "-", "language": "python",
+             "verdict": "accepted" if i % 3 else "wrong_answer"}
+            for i in range(SUBMISSIONS)
+        ])
+        await db.commit()
+
+    async def rate(submission_id: str):
+        async with session_maker() as db:
+            return await RatingEngine(db).update_user_rating("u1", submission_id)
+
+    await asyncio.gather(*(rate(f"s{i}") for i in range(SUBMISSIONS)))
+
+    async with session_maker() as db:
+        user = (await db.execute(select(User).where(User.id == "u1"))).scalar_one()
+        history = (await db.execute(select(RatingHistory))).scalars().all()
+    await engine.dispose()
+
+    assert len(history) == SUBMISSIONS
+    assert user.rating_version == SUBMISSIONS
+    # The updates form a single chain from the default rating to the stored one
+    by_old = {row.old_rating: row for row in history}
+    rating, steps = 1200.0, 0
+    while rating in by_old:
+        rating = by_old[rating].new_rating
+        steps += 1
+    assert steps == SUBMISSIONS
+    assert user.classical_rating == pytest.approx(rating)
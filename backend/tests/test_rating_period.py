@@ -0,0 +1,186 @@
+"""
+KamiCode — Rating Period Tests
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.engines.glicko2 import Glicko2
+from app.models import Base
+from app.models.problem import Problem
+from app.models.rating_history import RatingHistory
+from app.models.rating_period import RatingPeriod
+from app.models.submission import Submission
+from app.models.user import User
+from app.services import rating_period
+from app.services.rating_period import RatingPeriodService, period_start
+
+settings = get_settings()
+
+START = datetime(2026, 3, 9, 12, tzinfo=timezone.utc)
+END = START + timedelta(hours=1)
+
+# Problems with fitted ratings, so they play as the opponents of Glickman's example
+PROBLEMS = [("p1", 1400.0, 30.0), ("p2", 1550.0, 100.0), ("p3", 1700.0, 300.0)]
+
+
+def test_period_boundaries_are_utc():
+    moment = datetime(2026, 3, 9, 17, 42, 5, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+    assert period_start(moment, "hourly") == datetime(2026, 3, 9, 12, 0, tzinfo=timezone.utc)
+    assert period_start(moment, "daily") == datetime(2026, 3, 9, tzinfo=timezone.utc)
+
+
+def test_naive_timestamps_are_treated_as_utc():
+    assert period_start(datetime(2026, 3, 9, 23, 59), "hourly") == datetime(2026, 3, 9, 23, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_per_submission_mode_closes_nothing():
+    service = RatingPeriodService(db=None, period="submission")
+    assert not service.enabled
+    assert await service.close_due_periods() == []
+
+
+@pytest.fixture
+async def session_maker(tmp_path, monkeypatch):
+    monkeypatch.setattr(rating_period.process_achievement_event_task, "delay", lambda *a: None)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'periods.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_maker() as db:
+        await db.execute(insert(User), [
+            {"id": "alice", "username": "alice", "email": "alice@example.com",
+             "classical_rating": 1500.0, "classical_rd": 200.0, "volatility": 0.06},
+            {"id": "bob", "username": "bob", "email": "bob@example.com",
+             "classical_rating": 1300.0, "classical_rd": 120.0, "volatility": 0.05},
+        ])
+        await db.execute(insert(Problem), [
+            {"id": p, "title": p, "slug": p, "description": "-", "difficulty": "medium", "test_cases": {},
+             "rating": rating, "rating_rd": rd, "rating_attempts": settings.PROBLEM_RATING_MIN_ATTEMPTS}
+            for p, rating, rd in PROBLEMS
+        ])
+        # alice beats p1 and loses to p2 and p3; bob beats p2; one of bob's games is outside the period
+        await db.execute(insert(Submission), [
+            {"id": f"s{i}", "user_id": user, "problem_id": problem, "code": "-", "language": "python",
+             "verdict": verdict, "created_at": START + timedelta(minutes=minutes)}
+            for i, (user, problem, verdict, minutes) in enumerate([
+                ("alice", "p1", "accepted", 5),
+                ("alice", "p2", "wrong_answer", 10),
+                ("alice", "p3", "wrong_answer", 59),
+                ("bob", "p2", "accepted", 30),
+                ("bob", "p3", "accepted", 60),
+            ])
+        ])
+        await db.commit()
+
+    yield session_maker
+    await engine.dispose()
+
+
+async def _ratings(session_maker):
+    async with session_maker() as db:
+        rows = (await db.execute(select(User.id, User.classical_rating, User.classical_rd, User.rating_version))).all()
+    return {row.id: row for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_close_period_applies_one_multi_opponent_update(session_maker):
+    async with session_maker() as db:
+        period = await RatingPeriodService(db, period="hourly").close_period(START, END)
+    assert (period.games, period.users_rated) == (4, 2)
+
+    users = await _ratings(session_maker)
+    # Three games in one period: Glickman's worked example
+    assert users["alice"].classical_rating == pytest.approx(1464.06, abs=0.01)
+    assert users["alice"].classical_rd == pytest.approx(151.52, abs=0.01)
+    # A single game matches the scalar engine
+    rating, rd, _ = Glicko2().calculate_new_rating(1300.0, 120.0, 0.05, 1550.0, 100.0, 1.0)
+    assert (users["bob"].classical_rating, users["bob"].classical_rd) == pytest.approx((rating, rd), rel=1e-9)
+    assert users["alice"].rating_version == users["bob"].rating_version == 1
+
+
+@pytest.mark.asyncio
+async def test_close_period_writes_one_history_row_per_user(session_maker):
+    async with session_maker() as db:
+        await RatingPeriodService(db, period="hourly").close_period(START, END)
+        history = (await db.execute(select(RatingHistory).order_by(RatingHistory.user_id))).scalars().all()
+
+    assert [row.user_id for row in history] == ["alice", "bob"]
+    alice = history[0]
+    assert alice.submission_id is None and alice.context == "classical"
+    assert (alice.old_rating, alice.old_deviation) == (1500.0, 200.0)
+    assert alice.new_rating == pytest.approx(1464.06, abs=0.01)
+    assert alice.rating_change == pytest.approx(alice.new_rating - 1500.0)
+    assert alice.created_at.replace(tzinfo=timezone.utc) == END
+
+
+@pytest.mark.asyncio
+async def test_closing_a_closed_period_again_is_a_no_op(session_maker):
+    async with session_maker() as db:
+        assert await RatingPeriodService(db, period="hourly").close_period(START, END) is not None
+    before = await _ratings(session_maker)
+
+    async with session_maker() as db:
+        assert await RatingPeriodService(db, period="hourly").close_period(START, END) is None
+        # The catch-up loop starts after the last closed period
+        assert await RatingPeriodService(db, period="hourly").close_due_periods(now=END + timedelta(minutes=5)) == []
+        periods = (await db.execute(select(func.count()).select_from(RatingPeriod))).scalar_one()
+        history = (await db.execute(select(func.count()).select_from(RatingHistory))).scalar_one()
+
+    assert await _ratings(session_maker) == before
+    assert (periods, history) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_submissions_rated_live_are_skipped(session_maker):
+    """A submission with its own history row (rated before a mode switch) is not rated twice."""
+    async with session_maker() as db:
+        await db.execute(insert(RatingHistory).values(
+            user_id="bob", submission_id="s3", old_rating=1200.0, new_rating=1300.0, rating_change=100.0,
+            old_deviation=130.0, new_deviation=120.0, context="classical",
+        ))
+        await db.commit()
+        period = await RatingPeriodService(db, period="hourly").close_period(START, END)
+
+    assert (period.games, period.users_rated) == (3, 1)
+    users = await _ratings(session_maker)
+    assert users["bob"].classical_rating == 1300.0 and users["bob"].rating_version == 0
+    assert users["alice"].classical_rating == pytest.approx(1464.06, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_users_changed_during_the_close_are_re_rated(session_maker, monkeypatch):
+    """The user UPDATE is a compare-and-swap; a user whose version moved is re-read and re-rated."""
+    async with session_maker() as db:
+        execute, raced = db.execute, []
+
+        async def racing_execute(statement, *args, **kwargs):
+            if args and getattr(statement, "table", None) is User.__table__ and not raced:
+                raced.append(True)
+                # Bob's pending season reset is settled between the batch's read and its write
+                await execute(update(User).where(User.id == "bob").values(
+                    classical_rating=1250.0, classical_rd=150.0, rating_version=User.rating_version + 1,
+                ))
+            return await execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(db, "execute", racing_execute)
+        period = await RatingPeriodService(db, period="hourly").close_period(START, END)
+        monkeypatch.undo()
+        history = {
+            row.user_id: row for row in (await db.execute(select(RatingHistory))).scalars().all()
+        }
+
+    assert raced and period.users_rated == 2
+    users = await _ratings(session_maker)
+    rating, rd, _ = Glicko2().calculate_new_rating(1250.0, 150.0, 0.05, 1550.0, 100.0, 1.0)
+    assert (users["bob"].classical_rating, users["bob"].classical_rd) == pytest.approx((rating, rd), rel=1e-9)
+    assert users["bob"].rating_version == 2
+    assert history["bob"].old_rating == 1250.0
+    assert users["alice"].classical_rating == pytest.approx(1464.06, abs=0.01)
+    assert users["alice"].rating_version == 1
@@ -0,0 +1,121 @@
+"""
+KamiCode — Runtime Distribution Tests
+"""
+
+import asyncio
+
+import pytest
+
+from app.engines import runtime_distribution
+from app.engines.runtime_distribution import RuntimeDistribution, RuntimeDistributionRegistry
+
+
+def test_single_solution_is_top():
+    """A lone accepted solution is reported as 100th percentile."""
+    assert RuntimeDistribution([42]).percentile(42) == 100.0
+
+
+def test_percentile_counts_strictly_slower():
+    """Percentile is the share of runtimes strictly greater than the query."""
+    dist = RuntimeDistribution([10, 20, 20, 30, 40])
+    assert dist.count_slower(20) == 2
+    assert dist.percentile(20) == 40.0
+    assert dist.percentile(5) == 100.0
+    assert dist.percentile(40) == 0.0
+
+
+def test_add_keeps_order():
+    """Incremental inserts behave like a rebuilt distribution."""
+    dist = RuntimeDistribution()
+    for runtime in [30, 10, 40, 20, 20]:
+        dist.add(runtime)
+    assert dist.percentile(20) == RuntimeDistribution([10, 20, 20, 30, 40]).percentile(20)
+
+
+def test_record_skips_unloaded_keys():
+    """Recording into a problem that was never loaded is a no-op."""
+    registry = RuntimeDistributionRegistry()
+    registry.record("p1", "python", "s1", 10)
+    assert registry._distributions == {}
+
+    registry._distributions[("p1", None)] = RuntimeDistribution([5])
+    registry._distributions[("p1", "python")] = RuntimeDistribution([5])
+    registry._distributions[("p1", "cpp")] = RuntimeDistribution([1])
+    registry.record("p1", "python", "s2", 10)
+    assert len(registry._distributions[("p1", None)]) == 2
+    assert len(registry._distributions[("p1", "python")]) == 2
+    assert len(registry._distributions[("p1", "cpp")]) == 1
+
+
+class StubRegistry(RuntimeDistributionRegistry):
+    """Loads from a list standing in for the submissions table."""
+
+    def __init__(self, rows, ttl=0.0):
+        super().__init__(ttl=ttl)
+        self.rows = rows
+        self.loads = 0
+        self.gate = None
+
+    async def _load(self, db, problem_id, language):
+        self.loads += 1
+        rows = [(submission_id, runtime) for submission_id, runtime, lang in self.rows
+                if language in (None, lang)]
+        if self.gate:
+            await self.gate.wait()
+        return rows
+
+
+@pytest.mark.asyncio
+async def test_record_during_a_load_is_not_lost():
+    """A verdict recorded while the first load awaits the DB lands in the loaded distribution."""
+    registry = StubRegistry([("s1", 10, "python"), ("s2", 20, "python")])
+    registry.gate = asyncio.Event()
+    load = asyncio.create_task(registry.get(None, "p1", "python"))
+    await asyncio.sleep(0)
+
+    registry.rows.append(("s3", 30, "python"))  # Committed after the load's SELECT ran
+    registry.record("p1", "python", "s3", 30)
+    registry.gate.set()
+
+    assert len(await load) == 3
+    assert registry._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_record_already_read_by_the_load_is_not_counted_twice():
+    registry = StubRegistry([("s1", 10, "python")])
+    registry.gate = asyncio.Event()
+    load = asyncio.create_task(registry.get(None, "p1"))
+    await asyncio.sleep(0)
+
+    registry.record("p1", "python", "s1", 10)  # The SELECT already saw s1
+    registry.gate.set()
+    assert len(await load) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_distribution_is_reloaded(monkeypatch):
+    """Verdicts recorded by other processes show up once the TTL lapses."""
+    clock = [1000.0]
+    monkeypatch.setattr(runtime_distribution.time, "monotonic", lambda: clock[0])
+    registry = StubRegistry([("s1", 10, "python")], ttl=60.0)
+    assert len(await registry.get(None, "p1")) == 1
+
+    registry.rows.append(("s2", 20, "python"))  # Accepted in another worker
+    clock[0] += 30
+    assert len(await registry.get(None, "p1")) == 1
+    clock[0] += 31
+    assert len(await registry.get(None, "p1")) == 2
+    assert registry.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_percentiles_are_per_language():
+    """A C++ runtime is not ranked against Python solutions."""
+    registry = StubRegistry([("s1", 5, "cpp"), ("s2", 8, "cpp"), ("s3", 100, "python"), ("s4", 200, "python")])
+    assert await registry.percentile(None, "p1", 100, "python") == 50.0
+    assert await registry.percentile(None, "p1", 100) == 25.0
+    assert await registry.percentile(None, "p1", 5, "cpp") == 50.0
+
+    registry.invalidate("p1")
+    assert registry._distributions == {}
@@ -0,0 +1,104 @@
+"""
+KamiCode — Season Achievement Tests
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.engines import achievement_tasks, season_engine
+from app.engines.achievement_engine import AchievementEngine
+from app.engines.season_engine import SeasonEngine
+from app.models import Base
+from app.models.achievement import UserAchievement
+from app.models.season import Season, SeasonParticipant
+from app.models.user import User
+
+USERS = 7
+
+
+async def _setup(tmp_path, slug="season-1-genesis"):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'achievements.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com",
+             "wallet_address": "0xabc" if i == 4 else None}
+            for i in range(USERS)
+        ])
+        await db.execute(insert(Season).values(
+            id="s1", name="Genesis", slug=slug, status="active", is_active=True,
+            start_date=datetime(2026, 1, 1, tzinfo=timezone.utc), end_date=datetime(2026, 4, 1, tzinfo=timezone.utc),
+        ))
+        await db.commit()
+    return engine, session_maker
+
+
+@pytest.fixture
+def events(monkeypatch):
+    sent = {"events": [], "mints": []}
+    monkeypatch.setattr(get_settings(), "SEASON_CLOSE_CHUNK_SIZE", 3)
+    monkeypatch.setattr(
+        season_engine.process_achievement_event_task, "delay", lambda *args: sent["events"].append(args)
+    )
+    monkeypatch.setattr(
+        achievement_tasks.mint_achievement_nft_task, "delay", lambda *args: sent["mints"].append(args)
+    )
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_season_end_sends_one_event_with_participant_ranges(tmp_path, events):
+    engine, session_maker = await _setup(tmp_path)
+    async with session_maker() as db:
+        await SeasonEngine(db).end_season("s1")
+    await engine.dispose()
+
+    assert len(events["events"]) == 1
+    event_type, data = events["events"][0]
+    assert event_type == "season.ended" and data["season_id"] == "s1"
+    assert data["user_ranges"] == [[None, "u2"], ["u2", "u5"], ["u5", None]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_event_awards_every_participant_once(tmp_path, events):
+    engine, session_maker = await _setup(tmp_path)
+    async with session_maker() as db:
+        await SeasonEngine(db).end_season("s1")
+        event_type, data = events["events"][0]
+        assert await AchievementEngine(db).process_bulk_event(event_type, data) == USERS
+        # A redelivered event awards nothing new
+        assert await AchievementEngine(db).process_event(event_type, data) is None
+        awarded = (await db.execute(select(UserAchievement))).scalars().all()
+    await engine.dispose()
+
+    assert sorted(a.user_id for a in awarded) == [f"u{i}" for i in range(USERS)]
+    assert {(a.achievement_type, a.season_id) for a in awarded} == {("SEASON_GENESIS", "s1")}
+    # Only the user with a wallet gets a mint
+    assert [mint for (mint,) in events["mints"]] == [a.id for a in awarded if a.user_id == "u4"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_event_respects_ranges_and_season_slug(tmp_path, events):
+    engine, session_maker = await _setup(tmp_path)
+    async with session_maker() as db:
+        await db.execute(insert(SeasonParticipant), [
+            {"id": f"p{i}", "season_id": "s1", "user_id": f"u{i}", "final_rating": 1200.0,
+             "final_rd": 350.0, "final_tier": "bronze"}
+            for i in range(USERS)
+        ])
+        await db.commit()
+        achievements = AchievementEngine(db)
+        partial = {"season_id": "s1", "season_slug": "season-1-genesis", "user_ranges": [["u2", "u5"]]}
+        assert await achievements.process_bulk_event("season.ended", partial) == 3
+        other = {"season_id": "s1", "season_slug": "season-2", "user_ranges": [[None, None]]}
+        assert await achievements.process_bulk_event("season.ended", other) == 0
+        awarded = (await db.execute(select(UserAchievement.user_id))).scalars().all()
+    await engine.dispose()
+
+    assert sorted(awarded) == ["u3", "u4", "u5"]
@@ -0,0 +1,199 @@
+"""
+KamiCode — Season Close Tests
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.engines import season_engine
+from app.engines.rating_epoch import settle_rating
+from app.engines.season_engine import SeasonEngine
+from app.models import Base
+from app.models.problem import Problem
+from app.models.season import Season, SeasonParticipant
+from app.models.submission import Submission
+from app.models.user import User
+from app.services import rating_service
+from app.services.rating_service import RatingEngine
+
+RATINGS = [1000.0, 1300.0, 1300.0, 1650.0, 1900.0, 2300.0, 1250.0]
+TIERS = ["bronze", "silver", "silver", "gold", "diamond", "grandmaster", "silver"]
+
+
+async def _setup(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'season.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com",
+             "classical_rating": rating, "classical_rd": 60.0, "league_tier": tier}
+            for i, (rating, tier) in enumerate(zip(RATINGS, TIERS))
+        ])
+        await db.execute(insert(Season).values(
+            id="s1", name="S1", slug="s1", status="active", is_active=True,
+            start_date=datetime(2026, 1, 1, tzinfo=timezone.utc), end_date=datetime(2026, 4, 1, tzinfo=timezone.utc),
+        ))
+        await db.commit()
+    return engine, session_maker
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(get_settings(), "SEASON_CLOSE_CHUNK_SIZE", 3)
+    monkeypatch.setattr(season_engine.process_achievement_event_task, "delay", lambda *args, **kwargs: None)
+    monkeypatch.setattr(rating_service.process_achievement_event_task, "delay", lambda *args, **kwargs: None)
+
+
+def _reset(rating, tier, seasons=1):
+    floor = {"bronze": 0, "silver": 1200, "gold": 1500, "diamond": 1800, "grandmaster": 2100}[tier]
+    return floor + (rating - floor) * 0.6 ** seasons
+
+
+@pytest.mark.asyncio
+async def test_close_archives_ranks_and_defers_the_reset(tmp_path):
+    engine, session_maker = await _setup(tmp_path)
+    async with session_maker() as db:
+        await SeasonEngine(db).end_season("s1")
+        season = (await db.execute(select(Season))).scalar_one()
+        participants = {p.user_id: p for p in (await db.execute(select(SeasonParticipant))).scalars()}
+        users = {u.id: u for u in (await db.execute(select(User))).scalars()}
+    await engine.dispose()
+
+    assert season.status == "completed" and season.close_phase is None
+    assert season.reset_epoch == 1
+    assert len(participants) == len(RATINGS)
+    # RANK() gives ties the same rank and skips the next one
+    assert [participants[f"u{i}"].final_rank for i in range(len(RATINGS))] == [7, 4, 4, 3, 2, 1, 6]
+    assert participants["u3"].final_rating == 1650.0
+    # Closing does not touch users; their ratings are reset when next accessed
+    assert users["u3"].classical_rating == 1650.0
+    assert users["u3"].rating_epoch == 0 and users["u3"].rating_version == 0
+
+
+@pytest.mark.asyncio
+async def test_pending_reset_is_settled_on_read(tmp_path):
+    engine, session_maker = await _setup(tmp_path)
+    async with session_maker() as db:
+        await SeasonEngine(db).end_season("s1")
+        user = (await db.execute(select(User).where(User.id == "u3"))).scalar_one()
+        assert await settle_rating(db, user, 1)
+        assert not await settle_rating(db, user, 1)
+        await db.commit()
+        stored = (await db.execute(
+            select(User.classical_rating, User.classical_rd, User.rating_epoch, User.rating_version).where(User.id == "u3")
+        )).one()
+    await engine.dispose()
+
+    assert user.classical_rating == pytest.approx(1500 + 150 * 0.6)
+    assert tuple(stored) == (pytest.approx(1590.0), 350.0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_next_rating_update_starts_from_the_reset_rating(tmp_path):
+    engine, session_maker = await _setup(tmp_path)
+    async with session_maker() as db:
+        await SeasonEngine(db).end_season("s1")
+        await db.execute(insert(Problem).values(
+            id="p1", title="Easy", slug="easy", description="-", difficulty="easy", test_cases={},
+        ))
+        await db.execute(insert(Submission).values(
+            id="sub1", user_id="u3", problem_id="p1", code="-", language="python", verdict="accepted",
+        ))
+        await db.commit()
+        history = await RatingEngine(db).update_user_rating("u3", "sub1")
+        user = (await db.execute(select(User).where(User.id == "u3"))).scalar_one()
+    await engine.dispose()
+
+    assert history.old_rating == pytest.approx(1590.0) and history.old_deviation == 350.0
+    assert user.classical_rating == pytest.approx(history.new_rating)
+    assert user.rating_epoch == 1
+
+
+@pytest.mark.asyncio
+async def test_sweeper_matches_lazy_reset_across_missed_seasons(tmp_path):
+    engine, session_maker = await _setup(tmp_path)
+    async with session_maker() as db:
+        await SeasonEngine(db).end_season("s1")
+        await db.execute(insert(Season).values(
+            id="s2", name="S2", slug="s2", status="active", is_active=True,
+            start_date=datetime(2026, 4, 1, tzinfo=timezone.utc), end_date=datetime(2026, 7, 1, tzinfo=timezone.utc),
+        ))
+        await db.commit()
+        await SeasonEngine(db).end_season("s2")
+        s2 = {p.user_id: p for p in (await db.execute(
+            select(SeasonParticipant).where(SeasonParticipant.season_id == "s2")
+        )).scalars()}
+        assert await SeasonEngine(db).sweep_pending_resets() == len(RATINGS)
+        assert await SeasonEngine(db).sweep_pending_resets() == 0
+        users = {u.id: u for u in (await db.execute(select(User))).scalars()}
+    await engine.dispose()
+
+    for i, (rating, tier) in enumerate(zip(RATINGS, TIERS)):
+        # The second season's snapshot already saw the first reset
+        assert s2[f"u{i}"].final_rating == pytest.approx(_reset(rating, tier))
+        assert s2[f"u{i}"].final_rd == 350.0
+        assert users[f"u{i}"].classical_rating == pytest.approx(_reset(rating, tier, 2))
+        assert users[f"u{i}"].rating_epoch == 2 and users[f"u{i}"].rating_version == 1
+
+
+@pytest.mark.asyncio
+async def test_close_resumes_after_a_crash_without_double_archiving(tmp_path, monkeypatch):
+    engine, session_maker = await _setup(tmp_path)
+    original = SeasonEngine._archive_chunk
+    calls = 0
+
+    async def crash_on_second_chunk(self, season, lower, upper):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("worker died")
+        await original(self, season, lower, upper)
+
+    monkeypatch.setattr(SeasonEngine, "_archive_chunk", crash_on_second_chunk)
+    async with session_maker() as db:
+        with pytest.raises(RuntimeError):
+            await SeasonEngine(db).end_season("s1")
+    async with session_maker() as db:
+        assert (await db.execute(select(Season.close_phase))).scalar_one() == "participants"
+        await SeasonEngine(db).end_season("s1")
+        await SeasonEngine(db).end_season("s1")
+        season = (await db.execute(select(Season))).scalar_one()
+        count = len((await db.execute(select(SeasonParticipant.id))).all())
+    await engine.dispose()
+
+    assert count == len(RATINGS)
+    assert season.status == "completed" and season.reset_epoch == 1
+
+
+@pytest.mark.asyncio
+async def test_rank_phase_resumes_inside_a_tie(tmp_path, monkeypatch):
+    """Chunks of 2 split the 1300 tie; the resumed chunk still gives it rank 4."""
+    monkeypatch.setattr(get_settings(), "SEASON_CLOSE_CHUNK_SIZE", 2)
+    engine, session_maker = await _setup(tmp_path)
+    original = SeasonEngine._rank_chunk
+    calls = 0
+
+    async def crash_on_third_chunk(self, season, chunk_size, last):
+        nonlocal calls
+        calls += 1
+        if calls == 3:
+            raise RuntimeError("worker died")
+        return await original(self, season, chunk_size, last)
+
+    monkeypatch.setattr(SeasonEngine, "_rank_chunk", crash_on_third_chunk)
+    async with session_maker() as db:
+        with pytest.raises(RuntimeError):
+            await SeasonEngine(db).end_season("s1")
+    async with session_maker() as db:
+        assert (await db.execute(select(Season.close_phase))).scalar_one() == "rank"
+        await SeasonEngine(db).end_season("s1")
+        participants = {p.user_id: p for p in (await db.execute(select(SeasonParticipant))).scalars()}
+    await engine.dispose()
+
+    assert [participants[f"u{i}"].final_rank for i in range(len(RATINGS))] == [7, 4, 4, 3, 2, 1, 6]
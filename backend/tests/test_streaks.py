@@ -0,0 +1,147 @@
+"""
+KamiCode — Daily Streak Tests
+"""
+
+import asyncio
+import random
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.engines import achievement_tasks
+from app.engines.achievement_engine import AchievementEngine
+from app.models import Base
+from app.models.achievement import UserAchievement
+from app.models.problem import Problem
+from app.models.problem_stats import ProblemSolveStats
+from app.models.submission import Submission
+from app.models.user import User
+from app.models.user_streak import UserStreak
+from app.services import streak_service
+from app.services.problem_stats_service import ProblemStatsService
+from app.services.streak_service import StreakService
+
+START = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'streaks.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as db:
+        await db.execute(insert(User), [
+            {"id": f"u{i}", "username": f"u{i}", "email": f"u{i}@example.com"} for i in range(3)
+        ])
+        await db.execute(insert(Problem).values(
+            id="p1", title="Daily", slug="daily", description="-", difficulty="medium", test_cases={},
+        ))
+        await db.commit()
+    yield session_maker
+    await engine.dispose()
+
+
+async def _submit(db, user_id, created_at, verdict="accepted", is_daily=True):
+    submission = Submission(
+        user_id=user_id, problem_id="p1", code="-", language="python",
+        verdict=verdict, is_daily=is_daily, created_at=created_at,
+    )
+    db.add(submission)
+    await db.commit()
+    await StreakService(db).record_accepted(submission)
+
+
+async def _streaks(db):
+    rows = (await db.execute(select(UserStreak))).scalars().all()
+    return {row.user_id: (row.current_streak, row.longest_streak, row.last_active_day) for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_streak_moves_once_per_local_day(session_maker):
+    async with session_maker() as db:
+        for days in [0, 0, 1, 2]:
+            await _submit(db, "u0", START + timedelta(days=days))
+        # 20:00 UTC is already the next day in IST
+        await _submit(db, "u0", datetime(2026, 3, 3, 20, 0, tzinfo=timezone.utc))
+        assert (await _streaks(db))["u0"] == (4, 4, date(2026, 3, 4))
+
+        await _submit(db, "u0", START + timedelta(days=6))
+        # A late arrival for an earlier day, a failure and a non-daily solve change nothing
+        await _submit(db, "u0", START + timedelta(days=5))
+        await _submit(db, "u0", START + timedelta(days=7), verdict="wrong_answer")
+        await _submit(db, "u0", START + timedelta(days=7), is_daily=False)
+        assert (await _streaks(db))["u0"] == (1, 4, date(2026, 3, 7))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_solves_keep_the_caller_submission_loaded(session_maker):
+    async def solve(i: int):
+        async with session_maker() as db:
+            submission = Submission(
+                user_id="u2", problem_id="p1", code="-", language="python",
+                verdict="accepted", is_daily=True, created_at=START + timedelta(minutes=i),
+            )
+            db.add(submission)
+            await db.commit()
+            await StreakService(db).record_accepted(submission)
+            return submission.problem_id
+
+    assert await asyncio.gather(*(solve(i) for i in range(5))) == ["p1"] * 5
+    async with session_maker() as db:
+        assert (await _streaks(db))["u2"] == (1, 1, date(2026, 3, 1))
+
+
+
+@pytest.mark.asyncio
+async def test_failed_streak_update_leaves_the_session_usable(session_maker, monkeypatch):
+    upsert = streak_service.upsert
+
+    async def failing_upsert(*args, **kwargs):
+        await upsert(*args, **kwargs)
+        raise RuntimeError("streak update failed")
+
+    monkeypatch.setattr(streak_service, "upsert", failing_upsert)
+    async with session_maker() as db:
+        submission = Submission(
+            id="s1", user_id="u0", problem_id="p1", code="-", language="python",
+            verdict="accepted", is_daily=True, created_at=START,
+        )
+        db.add(submission)
+        await db.commit()
+        with pytest.raises(RuntimeError):
+            await StreakService(db).record_accepted(submission)
+        # As in create_submission, the next step writes through the same session
+        assert await ProblemStatsService(db).record_solve(submission) is True
+
+    async with session_maker() as db:
+        assert await _streaks(db) == {}
+        assert (await db.execute(select(ProblemSolveStats))).scalar_one().first_submission_id == "s1"
+
+@pytest.mark.asyncio
+async def test_backfill_matches_incremental_updates(session_maker):
+    rng = random.Random(7)
+    async with session_maker() as db:
+        moment = START
+        for _ in range(120):
+            moment += timedelta(hours=rng.choice([1, 4, 12, 30]))
+            await _submit(db, f"u{rng.randrange(3)}", moment)
+        incremental = await _streaks(db)
+
+        assert await StreakService(db).backfill(chunk_size=2) == len(incremental)
+        assert await _streaks(db) == incremental
+
+
+@pytest.mark.asyncio
+async def test_streak_rules_read_the_counter(session_maker, monkeypatch):
+    monkeypatch.setattr(achievement_tasks.mint_achievement_nft_task, "delay", lambda *args: None)
+    async with session_maker() as db:
+        engine = AchievementEngine(db)
+        for day in range(7):
+            await _submit(db, "u1", START + timedelta(days=day))
+            await engine.process_event("submission.accepted", {"user_id": "u1", "problem_id": "p1"})
+            earned = set((await db.execute(select(UserAchievement.achievement_type))).scalars())
+            assert ("STREAK_7" in earned) == (day == 6)
+        assert "STREAK_30" not in earned
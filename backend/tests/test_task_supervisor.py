@@ -0,0 +1,69 @@
+"""
+KamiCode — Task Supervisor Tests
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.task_supervisor import TaskSupervisor, parse_limits
+
+
+def test_parse_limits():
+    assert parse_limits("broadcast=32, rating=4,") == {"broadcast": 32, "rating": 4}
+
+
+@pytest.mark.asyncio
+async def test_category_limit_and_failures_are_recorded():
+    """A category never exceeds its limit; exceptions are counted, not lost."""
+    supervisor = TaskSupervisor(limits={"work": 2}, default_limit=8)
+    running, peak = 0, 0
+
+    async def job(fail: bool):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if fail:
+            raise ValueError("boom")
+
+    for i in range(6):
+        supervisor.spawn("work", job(i == 3), name=f"job-{i}")
+    assert await supervisor.drain(timeout=5) == 0
+
+    stats = supervisor.stats()["categories"]["work"]
+    assert peak == 2
+    assert (stats["completed"], stats["failed"]) == (5, 1)
+    assert stats["recent_errors"][0]["task"] == "job-3"
+    assert stats["max_duration_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_unfinished_journaled_work_is_replayed(tmp_path):
+    """Work cancelled at shutdown stays in the journal and runs after a restart."""
+    journal = str(tmp_path / "tasks.jsonl")
+    done = []
+
+    async def slow(payload):
+        await asyncio.sleep(10)
+
+    async def fast(payload):
+        done.append(payload["n"])
+
+    first = TaskSupervisor(limits={}, default_limit=4, journal_path=journal)
+    first.register("job", slow)
+    first.submit("job", {"n": 1})
+    first.persist("job", {"n": 2})
+    assert await first.drain(timeout=0.05) == 1
+
+    second = TaskSupervisor(limits={}, default_limit=4, journal_path=journal)
+    second.register("job", fast)
+    assert await second.replay() == 2
+    await second.drain(timeout=5)
+    assert sorted(done) == [1, 2]
+
+    # Finished work is not replayed again
+    third = TaskSupervisor(limits={}, default_limit=4, journal_path=journal)
+    third.register("job", fast)
+    assert await third.replay() == 0